@@ -0,0 +1,123 @@
+"""Converte estimated_hours/actual_hours de texto para NUMERIC
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19
+
+"""
+from decimal import Decimal, InvalidOperation
+from typing import Any, Optional, Sequence, Union
+import re
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 1000
+
+# Copia congelada do parser de horas (app.services.effort): a revisao nao deve
+# depender do codigo atual da aplicacao
+_HOURS_PATTERN = re.compile(r"\s*(\d+(?:[.,]\d+)*)\s*(?:h|hs|hr|hrs|hora|horas)?\s*", re.IGNORECASE)
+_HOURS_QUANTUM = Decimal("0.01")
+_HOURS_MAX = Decimal("99999999.99")
+
+def parse_hours(value: Any) -> Optional[Decimal]:
+    """Texto livre de horas para Decimal; None para valores invalidos ou fora de NUMERIC(10, 2)"""
+    if value is None:
+        return None
+
+    match = _HOURS_PATTERN.fullmatch(str(value))
+    if not match:
+        return None
+
+    text = match.group(1)
+    last_dot, last_comma = text.rfind("."), text.rfind(",")
+    if last_dot >= 0 and last_comma >= 0:
+        # O ultimo separador e o decimal, os demais sao de milhar
+        decimal_sep = "." if last_dot > last_comma else ","
+        thousands_sep = "," if decimal_sep == "." else "."
+        text = text.replace(thousands_sep, "").replace(decimal_sep, ".")
+    elif text.count(",") == 1:
+        text = text.replace(",", ".")
+    elif text.count(",") > 1 or text.count(".") > 1:
+        text = text.replace(",", "").replace(".", "")
+
+    try:
+        number = Decimal(text).quantize(_HOURS_QUANTUM)
+    except InvalidOperation:
+        return None
+    return number if number <= _HOURS_MAX else None
+
+def _backfill(bind) -> None:
+    """Copia os valores antigos para as colunas numericas em lotes por id"""
+    requirements = sa.table(
+        "requirements",
+        sa.column("id", sa.String),
+        sa.column("estimated_hours", sa.String),
+        sa.column("actual_hours", sa.String),
+    )
+    update = sa.text(
+        "UPDATE requirements SET estimated_hours_num = :estimated, actual_hours_num = :actual "
+        "WHERE id = :id"
+    ).bindparams(
+        sa.bindparam("estimated", type_=sa.Numeric(10, 2)),
+        sa.bindparam("actual", type_=sa.Numeric(10, 2)),
+    )
+
+    last_id = None
+    while True:
+        query = (
+            sa.select(requirements.c.id, requirements.c.estimated_hours, requirements.c.actual_hours)
+            .where(sa.or_(requirements.c.estimated_hours.isnot(None), requirements.c.actual_hours.isnot(None)))
+            .order_by(requirements.c.id)
+            .limit(BATCH_SIZE)
+        )
+        if last_id is not None:
+            query = query.where(requirements.c.id > last_id)
+
+        rows = bind.execute(query).fetchall()
+        if not rows:
+            break
+
+        bind.execute(update, [
+            {
+                "id": row.id,
+                "estimated": parse_hours(row.estimated_hours),
+                "actual": parse_hours(row.actual_hours),
+            }
+            for row in rows
+        ])
+        last_id = rows[-1].id
+
+def upgrade() -> None:
+    op.add_column("requirements", sa.Column("estimated_hours_num", sa.Numeric(10, 2), nullable=True))
+    op.add_column("requirements", sa.Column("actual_hours_num", sa.Numeric(10, 2), nullable=True))
+
+    _backfill(op.get_bind())
+
+    with op.batch_alter_table("requirements") as batch_op:
+        batch_op.drop_column("estimated_hours")
+        batch_op.drop_column("actual_hours")
+        batch_op.alter_column("estimated_hours_num", new_column_name="estimated_hours")
+        batch_op.alter_column("actual_hours_num", new_column_name="actual_hours")
+
+def downgrade() -> None:
+    op.add_column("requirements", sa.Column("estimated_hours_text", sa.String(50), nullable=True))
+    op.add_column("requirements", sa.Column("actual_hours_text", sa.String(50), nullable=True))
+
+    op.execute(
+        "UPDATE requirements SET "
+        "estimated_hours_text = CAST(estimated_hours AS VARCHAR(50)), "
+        "actual_hours_text = CAST(actual_hours AS VARCHAR(50))"
+    )
+
+    with op.batch_alter_table("requirements") as batch_op:
+        batch_op.drop_column("estimated_hours")
+        batch_op.drop_column("actual_hours")
+        batch_op.alter_column("estimated_hours_text", new_column_name="estimated_hours")
+        batch_op.alter_column("actual_hours_text", new_column_name="actual_hours")
@@ -0,0 +1,106 @@
+"""Converte chaves primarias e estrangeiras de VARCHAR(36) para UUID nativo
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Colunas de identificacao por tabela (chave primaria primeiro)
+KEY_COLUMNS = {
+    "users": ["id"],
+    "projects": ["id", "created_by"],
+    "requirements": ["id", "project_id", "assigned_to", "created_by"],
+    "dynamic_field_definitions": ["id"],
+}
+
+# Tabelas filhas primeiro, para que as FKs sejam removidas antes das PKs referenciadas
+FK_TABLES = ["requirements", "projects"]
+
+def _drop_foreign_keys(inspector):
+    """Remove as FKs entre as tabelas convertidas e retorna as definicoes para recriacao"""
+    dropped = []
+    for table in FK_TABLES:
+        for fk in inspector.get_foreign_keys(table):
+            op.drop_constraint(fk["name"], table, type_="foreignkey")
+            dropped.append((table, fk))
+    return dropped
+
+def _create_foreign_keys(dropped) -> None:
+    for table, fk in dropped:
+        op.create_foreign_key(
+            fk["name"],
+            table,
+            fk["referred_table"],
+            fk["constrained_columns"],
+            fk["referred_columns"],
+            ondelete=(fk.get("options") or {}).get("ondelete"),
+        )
+
+def _convert_postgresql(to_uuid: bool) -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+
+    pending = []
+    for table, columns in KEY_COLUMNS.items():
+        current = {column["name"]: column["type"] for column in inspector.get_columns(table)}
+        for column in columns:
+            is_uuid = isinstance(current[column], (postgresql.UUID, sa.Uuid))
+            if is_uuid != to_uuid:
+                pending.append((table, column))
+
+    # Bancos criados pelo init.sql ja usam UUID
+    if not pending:
+        return
+
+    dropped = _drop_foreign_keys(inspector)
+    for table, column in pending:
+        if to_uuid:
+            op.alter_column(table, column, type_=postgresql.UUID(), postgresql_using=f"{column}::uuid")
+        else:
+            op.alter_column(table, column, type_=sa.String(36), postgresql_using=f"{column}::text")
+    _create_foreign_keys(dropped)
+
+def _hyphenated(column: str) -> str:
+    return (
+        f"CASE WHEN length({column}) = 32 THEN lower(substr({column}, 1, 8) || '-' || "
+        f"substr({column}, 9, 4) || '-' || substr({column}, 13, 4) || '-' || "
+        f"substr({column}, 17, 4) || '-' || substr({column}, 21, 12)) ELSE {column} END"
+    )
+
+def _convert_generic(to_uuid: bool) -> None:
+    """Bancos sem UUID nativo (SQLite) guardam o UUID como 32 caracteres hexadecimais"""
+    for table, columns in KEY_COLUMNS.items():
+        assignments = ", ".join(
+            f"{column} = replace(lower({column}), '-', '')" if to_uuid
+            else f"{column} = {_hyphenated(column)}"
+            for column in columns
+        )
+        op.execute(f"UPDATE {table} SET {assignments}")
+
+        with op.batch_alter_table(table) as batch_op:
+            for column in columns:
+                batch_op.alter_column(column, type_=sa.Uuid(as_uuid=False) if to_uuid else sa.String(36))
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        _convert_postgresql(to_uuid=True)
+    else:
+        _convert_generic(to_uuid=True)
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        _convert_postgresql(to_uuid=False)
+    else:
+        _convert_generic(to_uuid=False)
@@ -0,0 +1,75 @@
+"""Converte status, prioridade, tipo e complexidade para colunas enum
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.models.enums import RequirementType, RequirementStatus, ProjectStatus, Priority, Complexity, db_enum
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (tabela, coluna, enum, valor padrao usado para valores fora do registro)
+ENUM_COLUMNS = [
+    ("requirements", "type", RequirementType, RequirementType.FUNCIONAL),
+    ("requirements", "priority", Priority, Priority.MEDIA),
+    ("requirements", "status", RequirementStatus, RequirementStatus.PENDENTE),
+    ("requirements", "complexity", Complexity, None),
+    ("projects", "status", ProjectStatus, ProjectStatus.EM_ANDAMENTO),
+    ("projects", "priority", Priority, Priority.MEDIA),
+]
+
+def _normalize_values() -> None:
+    """Corrige valores digitados livremente ("Media", "Em Andamento") e descarta os invalidos"""
+    for table, column, enum_cls, default in ENUM_COLUMNS:
+        op.execute(
+            f"UPDATE {table} SET {column} = lower(replace(trim({column}), ' ', '_')) "
+            f"WHERE {column} IS NOT NULL"
+        )
+        allowed = ", ".join(f"'{member.value}'" for member in enum_cls)
+        replacement = f"'{default.value}'" if default is not None else "NULL"
+        op.execute(
+            f"UPDATE {table} SET {column} = {replacement} "
+            f"WHERE {column} IS NOT NULL AND {column} NOT IN ({allowed})"
+        )
+
+def upgrade() -> None:
+    _normalize_values()
+
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        # Sem enum nativo a coluna continua VARCHAR; a validacao fica no ORM e nos schemas
+        return
+
+    for enum_cls in {enum_cls for _, _, enum_cls, _ in ENUM_COLUMNS}:
+        db_enum(enum_cls).create(bind, checkfirst=True)
+
+    for table, column, enum_cls, default in ENUM_COLUMNS:
+        type_name = db_enum(enum_cls).name
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} DROP DEFAULT")
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} TYPE {type_name} USING {column}::{type_name}")
+        if default is not None:
+            op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} SET DEFAULT '{default.value}'")
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+
+    for table, column, enum_cls, default in ENUM_COLUMNS:
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} DROP DEFAULT")
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} TYPE VARCHAR(50) USING {column}::text")
+        if default is not None:
+            op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} SET DEFAULT '{default.value}'")
+
+    for enum_cls in {enum_cls for _, _, enum_cls, _ in ENUM_COLUMNS}:
+        db_enum(enum_cls).drop(bind, checkfirst=True)
@@ -0,0 +1,31 @@
+"""Cria indice parcial de prazo para requisitos em aberto
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.models.requirement import OPEN_DUE_DATE_PREDICATE
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: Union[str, None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+def upgrade() -> None:
+    op.create_index(
+        "idx_requirements_open_due_date",
+        "requirements",
+        ["due_date"],
+        postgresql_where=sa.text(OPEN_DUE_DATE_PREDICATE),
+        sqlite_where=sa.text(OPEN_DUE_DATE_PREDICATE),
+    )
+
+def downgrade() -> None:
+    op.drop_index("idx_requirements_open_due_date", table_name="requirements")
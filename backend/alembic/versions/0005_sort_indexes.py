@@ -0,0 +1,34 @@
+"""Cria indices de ordenacao para paginacao por cursor
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+from app.models.requirement import REQUIREMENT_SORT_COLUMNS
+from app.models.project import PROJECT_SORT_COLUMNS
+
+# revision identifiers, used by Alembic.
+revision: str = "0005"
+down_revision: Union[str, None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+def _sort_indexes():
+    for name in REQUIREMENT_SORT_COLUMNS:
+        yield f"idx_requirements_sort_{name}", "requirements", [name, "id"]
+        yield f"idx_requirements_project_sort_{name}", "requirements", ["project_id", name, "id"]
+    for name in PROJECT_SORT_COLUMNS:
+        yield f"idx_projects_sort_{name}", "projects", [name, "id"]
+
+def upgrade() -> None:
+    for index_name, table, columns in _sort_indexes():
+        op.create_index(index_name, table, columns)
+
+def downgrade() -> None:
+    for index_name, table, _ in _sort_indexes():
+        op.drop_index(index_name, table_name=table)
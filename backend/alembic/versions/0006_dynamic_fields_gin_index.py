@@ -0,0 +1,45 @@
+"""Garante JSONB em requirements.dynamic_fields e cria indice GIN jsonb_path_ops
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "0006"
+down_revision: Union[str, None] = "0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        # Sem JSONB os filtros df.<campo> comparam o valor extraido, sem indice
+        return
+
+    # Bancos criados pelo create_all antigo tem a coluna como JSON
+    columns = {column["name"]: column["type"] for column in sa.inspect(bind).get_columns("requirements")}
+    if not isinstance(columns["dynamic_fields"], postgresql.JSONB):
+        op.execute("ALTER TABLE requirements ALTER COLUMN dynamic_fields DROP DEFAULT")
+        op.execute("ALTER TABLE requirements ALTER COLUMN dynamic_fields TYPE JSONB USING dynamic_fields::jsonb")
+        op.execute("ALTER TABLE requirements ALTER COLUMN dynamic_fields SET DEFAULT '{}'")
+
+    op.create_index(
+        "idx_requirements_dynamic_fields",
+        "requirements",
+        ["dynamic_fields"],
+        postgresql_using="gin",
+        postgresql_ops={"dynamic_fields": "jsonb_path_ops"},
+    )
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    op.drop_index("idx_requirements_dynamic_fields", table_name="requirements")
@@ -0,0 +1,34 @@
+"""Registra a coluna gerada de campos dinamicos promovidos
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.services.field_promotion import promoted_index_name
+
+# revision identifiers, used by Alembic.
+revision: str = "0007"
+down_revision: Union[str, None] = "0006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+def upgrade() -> None:
+    op.add_column("dynamic_field_definitions", sa.Column("promoted_column", sa.String(100), nullable=True))
+
+def downgrade() -> None:
+    # Rebaixa os campos promovidos antes de perder o registro das colunas geradas
+    promoted = op.get_bind().execute(sa.text(
+        "SELECT promoted_column FROM dynamic_field_definitions WHERE promoted_column IS NOT NULL"
+    )).scalars().all()
+    for column_name in promoted:
+        op.execute(f"DROP INDEX IF EXISTS {promoted_index_name(column_name)}")
+        op.execute(f"ALTER TABLE requirements DROP COLUMN IF EXISTS {column_name}")
+
+    with op.batch_alter_table("dynamic_field_definitions") as batch_op:
+        batch_op.drop_column("promoted_column")
@@ -0,0 +1,48 @@
+"""Cria a tabela de jobs de backfill de campos dinamicos
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.database import GUID
+from app.models.enums import BackfillOperation, BackfillStatus, db_enum
+
+# revision identifiers, used by Alembic.
+revision: str = "0008"
+down_revision: Union[str, None] = "0007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+def upgrade() -> None:
+    op.create_table(
+        "dynamic_field_backfills",
+        sa.Column("id", GUID, primary_key=True),
+        sa.Column("field_id", GUID, sa.ForeignKey("dynamic_field_definitions.id", ondelete="SET NULL"), nullable=True),
+        sa.Column("operation", db_enum(BackfillOperation), nullable=False),
+        sa.Column("params", sa.JSON, nullable=False),
+        sa.Column("status", db_enum(BackfillStatus), nullable=False),
+        sa.Column("last_id", GUID, nullable=True),
+        sa.Column("total_rows", sa.Integer, nullable=True),
+        sa.Column("processed_rows", sa.Integer, nullable=False, server_default="0"),
+        sa.Column("updated_rows", sa.Integer, nullable=False, server_default="0"),
+        sa.Column("error", sa.Text, nullable=True),
+        sa.Column("created_by", GUID, sa.ForeignKey("users.id"), nullable=True),
+        sa.Column("started_at", sa.DateTime, nullable=True),
+        sa.Column("finished_at", sa.DateTime, nullable=True),
+        sa.Column("created_at", sa.DateTime, server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime, server_default=sa.func.now()),
+    )
+
+def downgrade() -> None:
+    op.drop_table("dynamic_field_backfills")
+
+    bind = op.get_bind()
+    if bind.dialect.name == "postgresql":
+        db_enum(BackfillStatus).drop(bind, checkfirst=True)
+        db_enum(BackfillOperation).drop(bind, checkfirst=True)
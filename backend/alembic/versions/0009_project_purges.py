@@ -0,0 +1,74 @@
+"""Cascade de requisitos no banco e tabela de jobs de expurgo de projetos
+
+A exclusao de projetos passa a depender do ON DELETE CASCADE da FK
+requirements.project_id (ja presente no init.sql); bancos criados pelo
+create_all recebem a FK recriada com o cascade.
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.database import GUID
+from app.models.enums import PurgeStatus, db_enum
+
+# revision identifiers, used by Alembic.
+revision: str = "0009"
+down_revision: Union[str, None] = "0008"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+def _recreate_project_fk(ondelete: Union[str, None]) -> None:
+    """Recria a FK requirements.project_id com a acao de exclusao informada (PostgreSQL)"""
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        # SQLite exigiria recriar a tabela; bancos de desenvolvimento vem do create_all
+        return
+
+    for fk in sa.inspect(bind).get_foreign_keys("requirements"):
+        if fk["constrained_columns"] == ["project_id"]:
+            op.drop_constraint(fk["name"], "requirements", type_="foreignkey")
+
+    op.create_foreign_key(
+        "requirements_project_id_fkey",
+        "requirements",
+        "projects",
+        ["project_id"],
+        ["id"],
+        ondelete=ondelete,
+    )
+
+def upgrade() -> None:
+    _recreate_project_fk("CASCADE")
+
+    op.create_table(
+        "project_purges",
+        sa.Column("id", GUID, primary_key=True),
+        sa.Column("project_id", GUID, nullable=False),
+        sa.Column("project_name", sa.String(200), nullable=False),
+        sa.Column("status", db_enum(PurgeStatus), nullable=False),
+        sa.Column("total_rows", sa.Integer, nullable=True),
+        sa.Column("deleted_rows", sa.Integer, nullable=False, server_default="0"),
+        sa.Column("error", sa.Text, nullable=True),
+        sa.Column("created_by", GUID, sa.ForeignKey("users.id"), nullable=True),
+        sa.Column("started_at", sa.DateTime, nullable=True),
+        sa.Column("finished_at", sa.DateTime, nullable=True),
+        sa.Column("created_at", sa.DateTime, server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime, server_default=sa.func.now()),
+    )
+    op.create_index("ix_project_purges_project_id", "project_purges", ["project_id"])
+
+def downgrade() -> None:
+    op.drop_index("ix_project_purges_project_id", table_name="project_purges")
+    op.drop_table("project_purges")
+
+    bind = op.get_bind()
+    if bind.dialect.name == "postgresql":
+        db_enum(PurgeStatus).drop(bind, checkfirst=True)
+
+    _recreate_project_fk(None)
@@ -0,0 +1,47 @@
+"""Cria a tabela de jobs de clonagem de projetos
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.database import GUID
+from app.models.enums import CloneStatus, db_enum
+
+# revision identifiers, used by Alembic.
+revision: str = "0010"
+down_revision: Union[str, None] = "0009"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+def upgrade() -> None:
+    op.create_table(
+        "project_clones",
+        sa.Column("id", GUID, primary_key=True),
+        sa.Column("source_project_id", GUID, sa.ForeignKey("projects.id", ondelete="SET NULL"), nullable=True),
+        sa.Column("project_id", GUID, sa.ForeignKey("projects.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("options", sa.JSON, nullable=False),
+        sa.Column("status", db_enum(CloneStatus), nullable=False),
+        sa.Column("total_rows", sa.Integer, nullable=True),
+        sa.Column("copied_rows", sa.Integer, nullable=False, server_default="0"),
+        sa.Column("error", sa.Text, nullable=True),
+        sa.Column("created_by", GUID, sa.ForeignKey("users.id"), nullable=True),
+        sa.Column("started_at", sa.DateTime, nullable=True),
+        sa.Column("finished_at", sa.DateTime, nullable=True),
+        sa.Column("created_at", sa.DateTime, server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime, server_default=sa.func.now()),
+    )
+    op.create_index("ix_project_clones_project_id", "project_clones", ["project_id"])
+
+def downgrade() -> None:
+    op.drop_index("ix_project_clones_project_id", table_name="project_clones")
+    op.drop_table("project_clones")
+
+    bind = op.get_bind()
+    if bind.dialect.name == "postgresql":
+        db_enum(CloneStatus).drop(bind, checkfirst=True)
@@ -0,0 +1,41 @@
+"""Cria os contadores de escrita por tabela (ETags) e os triggers que os incrementam
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.models.table_version import VERSIONED_TABLES, install_table_version_triggers
+
+# revision identifiers, used by Alembic.
+revision: str = "0011"
+down_revision: Union[str, None] = "0010"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+def upgrade() -> None:
+    op.create_table(
+        "table_versions",
+        sa.Column("table_name", sa.String(64), primary_key=True),
+        sa.Column("shard", sa.SmallInteger, primary_key=True, server_default="0"),
+        sa.Column("version", sa.BigInteger, nullable=False, server_default="0"),
+    )
+    install_table_version_triggers(op.get_bind())
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    for table in VERSIONED_TABLES:
+        if bind.dialect.name == "postgresql":
+            op.execute(f"DROP TRIGGER IF EXISTS {table}_table_version ON {table}")
+        else:
+            for operation in ("insert", "update", "delete"):
+                op.execute(f"DROP TRIGGER IF EXISTS {table}_table_version_{operation}")
+    if bind.dialect.name == "postgresql":
+        op.execute("DROP FUNCTION IF EXISTS bump_table_version()")
+
+    op.drop_table("table_versions")
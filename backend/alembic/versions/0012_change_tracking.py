@@ -0,0 +1,58 @@
+"""Sequencia de mudancas (change_seq) e tombstones para a sincronizacao incremental
+
+Revision ID: 0012
+Revises: 0011
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.database import GUID
+from app.models.change_tracking import SYNC_TABLES, drop_change_tracking_ddl, install_change_tracking_triggers
+from app.models.table_version import install_table_version_triggers
+
+# revision identifiers, used by Alembic.
+revision: str = "0012"
+down_revision: Union[str, None] = "0011"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+def upgrade() -> None:
+    # Linhas existentes ficam com change_seq 0: entram apenas na carga completa
+    for table in SYNC_TABLES:
+        op.add_column(table, sa.Column("change_seq", sa.BigInteger, nullable=False, server_default="0"))
+        op.create_index(f"idx_{table}_change_seq", table, ["change_seq", "id"])
+
+    op.create_table(
+        "deleted_records",
+        sa.Column("id", sa.BigInteger().with_variant(sa.Integer, "sqlite"), primary_key=True, autoincrement=True),
+        sa.Column("table_name", sa.String(64), nullable=False),
+        sa.Column("record_id", GUID, nullable=False),
+        sa.Column("change_seq", sa.BigInteger, nullable=False),
+        sa.Column("deleted_at", sa.DateTime, nullable=False, server_default=sa.func.now()),
+    )
+    op.create_index("idx_deleted_records_table_seq", "deleted_records", ["table_name", "change_seq", "id"])
+    op.create_index("ix_deleted_records_deleted_at", "deleted_records", ["deleted_at"])
+
+    install_change_tracking_triggers(op.get_bind())
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    for statement in drop_change_tracking_ddl(bind.dialect.name):
+        op.execute(statement)
+
+    op.drop_index("ix_deleted_records_deleted_at", table_name="deleted_records")
+    op.drop_index("idx_deleted_records_table_seq", table_name="deleted_records")
+    op.drop_table("deleted_records")
+
+    for table in SYNC_TABLES:
+        op.drop_index(f"idx_{table}_change_seq", table_name=table)
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_column("change_seq")
+
+    if bind.dialect.name == "sqlite":
+        # Recriar a tabela (batch) descarta os triggers dos contadores de escrita
+        install_table_version_triggers(bind)
@@ -1,6 +1,6 @@
 from fastapi import APIRouter
 
-from app.api.v1.endpoints import auth, users, projects, requirements, dynamic_fields, reports
+from app.api.v1.endpoints import auth, users, projects, requirements, dynamic_fields, reports, events, sync
 
 api_router = APIRouter()
 
@@ -21,3 +21,9 @@ api_router.include_router(dynamic_fields.router, prefix="/dynamic-fields", tags=
 
 # Incluir rotas de relatorios
 api_router.include_router(reports.router, prefix="/reports", tags=["relatorios"])
+
+# Incluir feed de mudancas (Server-Sent Events)
+api_router.include_router(events.router, prefix="/events", tags=["eventos"])
+
+# Incluir sincronizacao incremental (tokens de mudanca e tombstones)
+api_router.include_router(sync.router, prefix="/sync", tags=["sincronizacao"])
@@ -44,7 +44,6 @@ async def register(user_data: UserCreate, db: Session = Depends(get_db)):
         
         db.add(user)
         db.commit()
-        db.refresh(user)
         
         logger.info(f"Novo usuario registrado: {user.username}")
         return user
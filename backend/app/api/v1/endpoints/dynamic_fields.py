@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
 from typing import List, Optional
 import logging
@@ -7,7 +7,16 @@ from app.core.database import get_db
 from app.core.security import get_current_active_user, require_permissions
 from app.models.user import User
 from app.models.dynamic_field import DynamicFieldDefinition
+from app.models.backfill import DynamicFieldBackfill
+from app.models.enums import BackfillStatus
 from app.schemas.dynamic_field import DynamicFieldCreate, DynamicFieldUpdate, DynamicFieldResponse
+from app.services.dynamic_field_schema import DynamicFieldDefinitionError, check_dynamic_field_definition
+from app.services.etags import conditional_entity, conditional_list, dynamic_field_state
+from app.services.field_promotion import FieldPromotionError, promote_field, demote_field
+from app.services.job_leases import is_stale
+from app.services.backfill import (
+    STARTABLE_STATUSES, BackfillStateError, create_backfill_jobs, pause_backfill, run_backfill
+)
 
 router = APIRouter()
 
@@ -18,6 +27,7 @@ async def get_dynamic_fields(
     applies_to: Optional[str] = None,
     is_active: Optional[bool] = None,
     current_user: User = Depends(require_permissions(["dynamic_field:read"])),
+    etag: str = Depends(conditional_list("dynamic_field_definitions")),
     db: Session = Depends(get_db)
 ):
     """Lista todos os campos dinamicos com filtros"""
@@ -45,13 +55,147 @@ async def get_dynamic_fields(
             detail="Erro interno do servidor"
         )
 
+@router.get("/backfills")
+async def get_backfills(
+    field_id: Optional[str] = None,
+    status_filter: Optional[BackfillStatus] = Query(None, alias="status"),
+    limit: int = Query(50, ge=1, le=200),
+    current_user: User = Depends(require_permissions(["dynamic_field:read"])),
+    db: Session = Depends(get_db)
+):
+    """Lista os jobs de backfill de campos dinamicos (mais recentes primeiro)"""
+    try:
+        query = db.query(DynamicFieldBackfill)
+        
+        if field_id:
+            query = query.filter(DynamicFieldBackfill.field_id == field_id)
+        
+        if status_filter:
+            query = query.filter(DynamicFieldBackfill.status == status_filter)
+        
+        jobs = query.order_by(DynamicFieldBackfill.created_at.desc()).limit(limit).all()
+        
+        return [job.to_dict() for job in jobs]
+        
+    except Exception as e:
+        logger.error(f"Erro ao listar backfills: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Erro interno do servidor"
+        )
+
+@router.get("/backfills/{job_id}")
+async def get_backfill(
+    job_id: str,
+    current_user: User = Depends(require_permissions(["dynamic_field:read"])),
+    db: Session = Depends(get_db)
+):
+    """Obtem o progresso de um job de backfill"""
+    try:
+        job = db.query(DynamicFieldBackfill).filter(DynamicFieldBackfill.id == job_id).first()
+        
+        if not job:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Backfill nao encontrado"
+            )
+        
+        return job.to_dict()
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Erro ao obter backfill: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Erro interno do servidor"
+        )
+
+@router.post("/backfills/{job_id}/pause")
+async def pause_backfill_job(
+    job_id: str,
+    current_user: User = Depends(require_permissions(["dynamic_field:update"])),
+    db: Session = Depends(get_db)
+):
+    """Pausa um job de backfill ao fim do lote corrente"""
+    try:
+        job = db.query(DynamicFieldBackfill).filter(DynamicFieldBackfill.id == job_id).first()
+        
+        if not job:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Backfill nao encontrado"
+            )
+        
+        pause_backfill(db, job)
+        db.commit()
+        
+        logger.info(f"Backfill pausado por {current_user.username}: {job.id}")
+        return job.to_dict()
+        
+    except BackfillStateError as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Erro ao pausar backfill: {e}")
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Erro interno do servidor"
+        )
+
+@router.post("/backfills/{job_id}/resume")
+async def resume_backfill_job(
+    job_id: str,
+    background_tasks: BackgroundTasks,
+    current_user: User = Depends(require_permissions(["dynamic_field:update"])),
+    db: Session = Depends(get_db)
+):
+    """Retoma um job pausado, com falha ou sem worker (lease vencido) a partir do ultimo lote confirmado"""
+    try:
+        job = db.query(DynamicFieldBackfill).filter(DynamicFieldBackfill.id == job_id).first()
+        
+        if not job:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Backfill nao encontrado"
+            )
+        
+        if job.status not in STARTABLE_STATUSES and not is_stale(job, BackfillStatus.EXECUTANDO):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Job com status {job.status} nao pode ser retomado"
+            )
+        
+        background_tasks.add_task(run_backfill, str(job.id))
+        
+        logger.info(f"Backfill retomado por {current_user.username}: {job.id}")
+        return job.to_dict()
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Erro ao retomar backfill: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Erro interno do servidor"
+        )
+
 @router.get("/{field_id}", response_model=DynamicFieldResponse)
 async def get_dynamic_field(
     field_id: str,
     current_user: User = Depends(require_permissions(["dynamic_field:read"])),
+    etag: Optional[str] = Depends(
+        conditional_entity(dynamic_field_state, "field_id", tables=("dynamic_field_definitions",))
+    ),
     db: Session = Depends(get_db)
 ):
-    """Obtem um campo dinamico especifico"""
+    """Obtem um campo dinamico especifico (304 quando If-None-Match traz o ETag atual)"""
     try:
         field = db.query(DynamicFieldDefinition).filter(DynamicFieldDefinition.id == field_id).first()
         
@@ -75,6 +219,7 @@ async def get_dynamic_field(
 @router.post("/", response_model=DynamicFieldResponse, status_code=status.HTTP_201_CREATED)
 async def create_dynamic_field(
     field_data: DynamicFieldCreate,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(require_permissions(["dynamic_field:create"])),
     db: Session = Depends(get_db)
 ):
@@ -105,16 +250,30 @@ async def create_dynamic_field(
             order_index=field_data.order_index,
             validation_rules=field_data.validation_rules
         )
+        check_dynamic_field_definition(field)
         
         db.add(field)
+        db.flush()
+        
+        # Campo obrigatorio com valor padrao: preencher requisitos existentes
+        jobs = create_backfill_jobs(db, field, created_by=current_user.id)
+        
         db.commit()
-        db.refresh(field)
+        
+        for job in jobs:
+            background_tasks.add_task(run_backfill, str(job.id))
         
         logger.info(f"Campo dinamico criado por {current_user.username}: {field.field_name}")
         return field
         
     except HTTPException:
         raise
+    except DynamicFieldDefinitionError as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     except Exception as e:
         logger.error(f"Erro ao criar campo dinamico: {e}")
         db.rollback()
@@ -127,6 +286,7 @@ async def create_dynamic_field(
 async def update_dynamic_field(
     field_id: str,
     field_data: DynamicFieldUpdate,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(require_permissions(["dynamic_field:update"])),
     db: Session = Depends(get_db)
 ):
@@ -157,17 +317,45 @@ async def update_dynamic_field(
         # Atualizar campos
         update_data = field_data.dict(exclude_unset=True)
         
+        # A coluna gerada depende do nome e do tipo do campo
+        if field.promoted_column and any(
+            key in update_data and update_data[key] != getattr(field, key)
+            for key in ("field_name", "field_type", "applies_to")
+        ):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Rebaixe o campo antes de alterar nome, tipo ou aplicacao"
+            )
+        
+        previous = {
+            "field_name": field.field_name,
+            "options": field.get_options_list(),
+            "is_required": field.is_required
+        }
+        
         for field_name, value in update_data.items():
             setattr(field, field_name, value)
+        check_dynamic_field_definition(field)
+        
+        # Renomeacao, remocao de opcoes e novo padrao obrigatorio reescrevem os documentos em lotes
+        jobs = create_backfill_jobs(db, field, previous, created_by=current_user.id)
         
         db.commit()
-        db.refresh(field)
+        
+        for job in jobs:
+            background_tasks.add_task(run_backfill, str(job.id))
         
         logger.info(f"Campo dinamico atualizado por {current_user.username}: {field.field_name}")
         return field
         
     except HTTPException:
         raise
+    except DynamicFieldDefinitionError as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     except Exception as e:
         logger.error(f"Erro ao atualizar campo dinamico: {e}")
         db.rollback()
@@ -192,6 +380,9 @@ async def delete_dynamic_field(
                 detail="Campo dinamico nao encontrado"
             )
         
+        if field.promoted_column:
+            demote_field(db, field)
+        
         db.delete(field)
         db.commit()
         
@@ -271,6 +462,82 @@ async def deactivate_dynamic_field(
             detail="Erro interno do servidor"
         )
 
+@router.post("/{field_id}/promote", response_model=DynamicFieldResponse)
+async def promote_dynamic_field(
+    field_id: str,
+    current_user: User = Depends(require_permissions(["dynamic_field:admin"])),
+    db: Session = Depends(get_db)
+):
+    """Promove um campo dinamico a coluna gerada indexada em requirements"""
+    try:
+        field = db.query(DynamicFieldDefinition).filter(DynamicFieldDefinition.id == field_id).first()
+        
+        if not field:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Campo dinamico nao encontrado"
+            )
+        
+        promote_field(db, field)
+        db.commit()
+        
+        logger.info(f"Campo dinamico promovido por {current_user.username}: {field.field_name} -> {field.promoted_column}")
+        return field
+        
+    except FieldPromotionError as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Erro ao promover campo dinamico: {e}")
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Erro interno do servidor"
+        )
+
+@router.post("/{field_id}/demote", response_model=DynamicFieldResponse)
+async def demote_dynamic_field(
+    field_id: str,
+    current_user: User = Depends(require_permissions(["dynamic_field:admin"])),
+    db: Session = Depends(get_db)
+):
+    """Remove a coluna gerada de um campo dinamico promovido (os valores continuam no JSON)"""
+    try:
+        field = db.query(DynamicFieldDefinition).filter(DynamicFieldDefinition.id == field_id).first()
+        
+        if not field:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Campo dinamico nao encontrado"
+            )
+        
+        demote_field(db, field)
+        db.commit()
+        
+        logger.info(f"Campo dinamico rebaixado por {current_user.username}: {field.field_name}")
+        return field
+        
+    except FieldPromotionError as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Erro ao rebaixar campo dinamico: {e}")
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Erro interno do servidor"
+        )
+
 @router.post("/initialize-defaults")
 async def initialize_default_fields(
     current_user: User = Depends(require_permissions(["dynamic_field:create"])),
@@ -0,0 +1,83 @@
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from typing import List, Optional
+import asyncio
+import logging
+
+from app.core.config import settings
+from app.core.database import canonical_id, get_db
+from app.core.security import check_permissions, require_permissions
+from app.models.user import User
+from app.services.change_feed import broker, format_sse
+
+router = APIRouter()
+
+logger = logging.getLogger(__name__)
+
+CHANGE_FEED_ENTITIES = ("requirement", "project")
+
+@router.get("/")
+async def stream_changes(
+    project_id: Optional[List[str]] = Query(None),
+    entity: Optional[List[str]] = Query(None),
+    last_event_id: Optional[str] = Header(None),
+    current_user: User = Depends(require_permissions(["requirement:read"])),
+    db: Session = Depends(get_db)
+):
+    """Feed de mudancas de requisitos e projetos (Server-Sent Events)
+
+    Eventos "<entidade>.<acao>" (created, updated, deleted, assigned, completed,
+    imported) com os ids alterados, filtrados por project_id e entity. Um evento
+    "reset" pede que o cliente recarregue as listagens; o cabecalho Last-Event-ID
+    retoma a partir do ultimo evento recebido.
+    """
+    entities = set(entity or CHANGE_FEED_ENTITIES)
+    unknown = entities.difference(CHANGE_FEED_ENTITIES)
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Entidades invalidas: {', '.join(sorted(unknown))}"
+        )
+    if not check_permissions(current_user, ["project:read"]):
+        entities.discard("project")
+
+    project_ids = None
+    if project_id:
+        try:
+            # Formato em que os ids saem nos eventos
+            project_ids = {canonical_id(value) for value in project_id}
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="project_id invalido"
+            )
+
+    # A conexao fica aberta por muito tempo: devolve a conexao da autenticacao ao pool
+    db.close()
+
+    logger.info(f"Feed de mudancas aberto por {current_user.username}")
+
+    async def stream():
+        # Inscricao no inicio do stream: o finally sempre a remove na desconexao
+        subscription = broker.subscribe(entities, project_ids, last_event_id)
+        try:
+            yield b"retry: 3000\n\n"
+            while True:
+                try:
+                    event_id, change = await asyncio.wait_for(
+                        subscription.queue.get(), timeout=settings.CHANGE_FEED_HEARTBEAT_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    # Comentario SSE: mantem a conexao viva em proxies
+                    yield b": ping\n\n"
+                    continue
+                yield format_sse(event_id, change)
+        finally:
+            broker.unsubscribe(subscription)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
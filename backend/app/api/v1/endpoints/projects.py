@@ -1,34 +1,72 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, Query
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
 from typing import List, Optional
 import logging
 
+from app.core.config import settings
 from app.core.database import get_db
 from app.core.security import get_current_active_user, require_permissions
 from app.models.user import User
-from app.models.project import Project
-from app.schemas.project import ProjectCreate, ProjectUpdate, ProjectResponse, ProjectResponseSummary, ProjectFilter
+from app.models.project import Project, PROJECT_SORT_COLUMNS
+from app.models.project_clone import ProjectClone
+from app.models.project_purge import ProjectPurge
+from app.models.enums import CloneStatus, ProjectStatus, Priority, PurgeStatus
+from app.schemas.project import (
+    ProjectCloneRequest, ProjectCreate, ProjectUpdate, ProjectResponse, ProjectResponseSummary, ProjectFilter
+)
+from app.services.batch_get import BatchIdsError, missing_ids_headers, order_by_ids, parse_ids
+from app.services.change_feed import record_change
+from app.services.etags import conditional_entity, conditional_list, etag_headers, project_state
+from app.services import project_clone
+from app.services.job_leases import is_stale
+from app.services.pagination import InvalidCursorError, paginate, sort_pattern
+from app.services.project_purge import (
+    STARTABLE_STATUSES, count_project_requirements, delete_project_cascade, run_project_purge, start_project_purge
+)
+from app.services.read_models import list_response, project_summary_records, project_summary_select
+from app.services.sparse_fields import PROJECT_FIELDS, SparseFieldsError, load_sparse, parse_fields
 
 router = APIRouter()
 
 logger = logging.getLogger(__name__)
 
+PROJECT_SORT_FIELDS = {name: getattr(Project, name) for name in PROJECT_SORT_COLUMNS}
+
 @router.get("/", response_model=List[ProjectResponseSummary])
 async def get_projects(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     search: Optional[str] = None,
-    status: Optional[str] = None,
-    priority: Optional[str] = None,
+    status_filter: Optional[ProjectStatus] = Query(None, alias="status"),
+    priority: Optional[Priority] = None,
     client_name: Optional[str] = None,
     created_by: Optional[str] = None,
     is_active: Optional[bool] = None,
+    sort: str = Query("-created_at", regex=sort_pattern(PROJECT_SORT_FIELDS)),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    ids: Optional[str] = None,
     current_user: User = Depends(require_permissions(["project:read"])),
+    etag: str = Depends(conditional_list("projects", "requirements")),
     db: Session = Depends(get_db)
 ):
-    """Lista todos os projetos com filtros"""
+    """Lista todos os projetos com filtros
+
+    Ordenacao por sort ("campo" ou "-campo"). Quando ha mais paginas o cabecalho
+    X-Next-Cursor traz o cursor da proxima, que dispensa skip.
+    fields=id,name,status limita a resposta (e as colunas consultadas) aos campos informados.
+    ids=a,b,c busca esses projetos em uma consulta, na ordem pedida e sem paginacao; os ids nao
+    encontrados vem no cabecalho X-Missing-Ids.
+    Com If-None-Match igual ao ETag atual responde 304 sem consultar os projetos.
+    """
     try:
-        query = db.query(Project)
+        requested = parse_fields(fields, ProjectResponseSummary)
+        batch_ids = parse_ids(ids)
+        
+        # Modelo de leitura: colunas do resumo e contagens de requisitos direto do banco
+        query = project_summary_select(sort, PROJECT_SORT_FIELDS, requested)
         
         # Aplicar filtros
         if search:
@@ -38,8 +76,8 @@ async def get_projects(
                 Project.client_name.contains(search)
             )
         
-        if status:
-            query = query.filter(Project.status == status)
+        if status_filter:
+            query = query.filter(Project.status == status_filter)
         
         if priority:
             query = query.filter(Project.priority == priority)
@@ -53,14 +91,26 @@ async def get_projects(
         if is_active is not None:
             query = query.filter(Project.is_active == is_active)
         
-        # Ordenar por data de criacao (mais recentes primeiro)
-        query = query.order_by(Project.created_at.desc())
-        
-        # Paginacao
-        projects = query.offset(skip).limit(limit).all()
+        if batch_ids is not None:
+            rows, next_cursor = db.execute(query.where(Project.id.in_(batch_ids))).all(), None
+        else:
+            # Ordenacao e paginacao (por cursor quando informado)
+            rows, next_cursor = paginate(
+                query, sort, PROJECT_SORT_FIELDS, Project.id, limit, skip=skip, cursor=cursor, db=db
+            )
         
-        return projects
+        items = project_summary_records(rows, requested)
+        headers = etag_headers(etag)
+        if batch_ids is not None:
+            items, missing = order_by_ids(items, batch_ids)
+            headers.update(missing_ids_headers(missing))
+        return list_response(items, next_cursor, headers)
         
+    except (InvalidCursorError, SparseFieldsError, BatchIdsError) as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     except Exception as e:
         logger.error(f"Erro ao listar projetos: {e}")
         raise HTTPException(
@@ -68,15 +118,156 @@ async def get_projects(
             detail="Erro interno do servidor"
         )
 
+@router.get("/purges/{job_id}")
+async def get_project_purge(
+    job_id: str,
+    current_user: User = Depends(require_permissions(["project:delete"])),
+    db: Session = Depends(get_db)
+):
+    """Obtem o progresso do expurgo assincrono de um projeto"""
+    try:
+        job = db.query(ProjectPurge).filter(ProjectPurge.id == job_id).first()
+        
+        if not job:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Expurgo nao encontrado"
+            )
+        
+        return job.to_dict()
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Erro ao obter expurgo: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Erro interno do servidor"
+        )
+
+@router.post("/purges/{job_id}/resume")
+async def resume_project_purge(
+    job_id: str,
+    background_tasks: BackgroundTasks,
+    current_user: User = Depends(require_permissions(["project:delete"])),
+    db: Session = Depends(get_db)
+):
+    """Retoma um expurgo que falhou ou perdeu o worker (os lotes ja removidos nao sao refeitos)"""
+    try:
+        job = db.query(ProjectPurge).filter(ProjectPurge.id == job_id).first()
+        
+        if not job:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Expurgo nao encontrado"
+            )
+        
+        if job.status not in STARTABLE_STATUSES and not is_stale(job, PurgeStatus.EXECUTANDO):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Expurgo com status {job.status} nao pode ser retomado"
+            )
+        
+        background_tasks.add_task(run_project_purge, str(job.id))
+        
+        logger.info(f"Expurgo retomado por {current_user.username}: {job.project_name}")
+        return job.to_dict()
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Erro ao retomar expurgo: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Erro interno do servidor"
+        )
+
+@router.get("/clones/{job_id}")
+async def get_project_clone(
+    job_id: str,
+    current_user: User = Depends(require_permissions(["project:create"])),
+    db: Session = Depends(get_db)
+):
+    """Obtem o andamento da clonagem em background de um projeto"""
+    try:
+        job = db.query(ProjectClone).filter(ProjectClone.id == job_id).first()
+        
+        if not job:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Clonagem nao encontrada"
+            )
+        
+        return job.to_dict()
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Erro ao obter clonagem: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Erro interno do servidor"
+        )
+
+@router.post("/clones/{job_id}/resume")
+async def resume_project_clone(
+    job_id: str,
+    background_tasks: BackgroundTasks,
+    current_user: User = Depends(require_permissions(["project:create"])),
+    db: Session = Depends(get_db)
+):
+    """Reexecuta uma clonagem que falhou ou perdeu o worker (a copia e atomica, nada e duplicado)"""
+    try:
+        job = db.query(ProjectClone).filter(ProjectClone.id == job_id).first()
+        
+        if not job:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Clonagem nao encontrada"
+            )
+        
+        if job.status not in project_clone.STARTABLE_STATUSES and not is_stale(job, CloneStatus.EXECUTANDO):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Clonagem com status {job.status} nao pode ser retomada"
+            )
+        
+        background_tasks.add_task(project_clone.run_project_clone, str(job.id))
+        
+        logger.info(f"Clonagem retomada por {current_user.username}: {job.id}")
+        return job.to_dict()
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Erro ao retomar clonagem: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Erro interno do servidor"
+        )
+
 @router.get("/{project_id}", response_model=ProjectResponse)
 async def get_project(
     project_id: str,
+    fields: Optional[str] = None,
     current_user: User = Depends(require_permissions(["project:read"])),
+    etag: Optional[str] = Depends(
+        conditional_entity(project_state, "project_id", tables=("projects", "requirements", "users"))
+    ),
     db: Session = Depends(get_db)
 ):
-    """Obtem um projeto especifico"""
+    """Obtem um projeto especifico
+
+    Com fields=id,name,requirements_count so as colunas desses campos sao carregadas
+    (contagens calculadas no banco, sem carregar os requisitos).
+    Com If-None-Match igual ao ETag atual responde 304 sem carregar o projeto.
+    """
     try:
-        project = db.query(Project).filter(Project.id == project_id).first()
+        requested = parse_fields(fields, ProjectResponse)
+        if requested:
+            project = load_sparse(db, PROJECT_FIELDS, requested, Project.id == project_id)
+        else:
+            project = db.query(Project).filter(Project.id == project_id).first()
         
         if not project:
             raise HTTPException(
@@ -84,8 +275,13 @@ async def get_project(
                 detail="Projeto nao encontrado"
             )
         
-        return project
+        return ORJSONResponse(project, headers=etag_headers(etag)) if requested else project
         
+    except SparseFieldsError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     except HTTPException:
         raise
     except Exception as e:
@@ -116,10 +312,15 @@ async def create_project(
             is_active=project_data.is_active,
             created_by=current_user.id
         )
-        
+        # Relacionamentos ja conhecidos: a resposta nao precisa consulta-los
         db.add(project)
+        set_committed_value(project, "created_by_user", current_user)
+        set_committed_value(project, "requirements", [])
+        # INSERT antecipado para o evento levar o id gerado
+        db.flush()
+        record_change(db, "project", "created", project.id, project.id)
+        
         db.commit()
-        db.refresh(project)
         
         logger.info(f"Projeto criado por {current_user.username}: {project.name}")
         return project
@@ -162,8 +363,8 @@ async def update_project(
         for field, value in update_data.items():
             setattr(project, field, value)
         
+        record_change(db, "project", "updated", project.id, project.id)
         db.commit()
-        db.refresh(project)
         
         logger.info(f"Projeto atualizado por {current_user.username}: {project.name}")
         return project
@@ -178,13 +379,81 @@ async def update_project(
             detail="Erro interno do servidor"
         )
 
+@router.post("/{project_id}/clone", response_model=ProjectResponse, status_code=status.HTTP_201_CREATED)
+async def clone_project(
+    project_id: str,
+    clone_data: ProjectCloneRequest,
+    background_tasks: BackgroundTasks,
+    mode: Optional[str] = Query(None, regex="^(sync|async)$"),
+    current_user: User = Depends(require_permissions(["project:create"])),
+    db: Session = Depends(get_db)
+):
+    """Clona um projeto e seus requisitos no servidor (INSERT ... SELECT)
+
+    sync copia na requisicao e retorna 201 com o projeto novo; async cria o
+    projeto inativo e retorna 202 com o job da copia. Sem mode, origens acima de
+    PROJECT_CLONE_ASYNC_THRESHOLD requisitos vao para async.
+    """
+    try:
+        source = db.query(Project).filter(Project.id == project_id).first()
+        
+        if not source:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Projeto nao encontrado"
+            )
+        
+        total_rows = None
+        if mode is None:
+            total_rows = count_project_requirements(db, source.id)
+            mode = "async" if total_rows > settings.PROJECT_CLONE_ASYNC_THRESHOLD else "sync"
+        
+        if mode == "async":
+            job = project_clone.start_project_clone(db, source, clone_data, current_user, total_rows)
+            db.commit()
+            background_tasks.add_task(project_clone.run_project_clone, str(job.id))
+            
+            logger.info(f"Clonagem de projeto agendada por {current_user.username}: {source.name} -> {clone_data.name}")
+            return ORJSONResponse(status_code=status.HTTP_202_ACCEPTED, content=job.to_dict())
+        
+        project, copied = project_clone.clone_project(db, source, clone_data, current_user)
+        
+        logger.info(
+            f"Projeto clonado por {current_user.username}: {source.name} -> {project.name} "
+            f"({copied} requisitos)"
+        )
+        return project
+        
+    except project_clone.CloneError as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Erro ao clonar projeto: {e}")
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Erro interno do servidor"
+        )
+
 @router.delete("/{project_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_project(
     project_id: str,
+    background_tasks: BackgroundTasks,
+    mode: Optional[str] = Query(None, regex="^(sync|async)$"),
     current_user: User = Depends(require_permissions(["project:delete"])),
     db: Session = Depends(get_db)
 ):
-    """Deleta um projeto"""
+    """Deleta um projeto
+
+    sync remove o projeto e seus requisitos com um DELETE (cascade no banco) e
+    retorna 204; async agenda o expurgo em lotes e retorna 202 com o job. Sem
+    mode, projetos acima de PROJECT_PURGE_ASYNC_THRESHOLD requisitos vao para async.
+    """
     try:
         project = db.query(Project).filter(Project.id == project_id).first()
         
@@ -201,7 +470,20 @@ async def delete_project(
                 detail="Nao tem permissao para deletar este projeto"
             )
         
-        db.delete(project)
+        total_rows = None
+        if mode is None:
+            total_rows = count_project_requirements(db, project.id)
+            mode = "async" if total_rows > settings.PROJECT_PURGE_ASYNC_THRESHOLD else "sync"
+        
+        if mode == "async":
+            job = start_project_purge(db, project, total_rows, current_user.id)
+            db.commit()
+            background_tasks.add_task(run_project_purge, str(job.id))
+            
+            logger.info(f"Expurgo de projeto agendado por {current_user.username}: {project.name}")
+            return ORJSONResponse(status_code=status.HTTP_202_ACCEPTED, content=job.to_dict())
+        
+        delete_project_cascade(db, project.id)
         db.commit()
         
         logger.info(f"Projeto deletado por {current_user.username}: {project.name}")
@@ -260,6 +542,7 @@ async def activate_project(
             )
         
         project.is_active = True
+        record_change(db, "project", "updated", project.id, project.id)
         db.commit()
         
         logger.info(f"Projeto ativado por {current_user.username}: {project.name}")
@@ -292,6 +575,7 @@ async def deactivate_project(
             )
         
         project.is_active = False
+        record_change(db, "project", "updated", project.id, project.id)
         db.commit()
         
         logger.info(f"Projeto desativado por {current_user.username}: {project.name}")
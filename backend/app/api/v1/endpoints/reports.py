@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from fastapi.responses import FileResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_
+from sqlalchemy import func, select
 from typing import List, Optional, Dict, Any
 import logging
 import pandas as pd
@@ -14,7 +14,13 @@ from app.core.security import get_current_active_user, require_permissions
 from app.models.user import User
 from app.models.project import Project
 from app.models.requirement import Requirement
+from app.models.enums import ProjectStatus, RequirementType, RequirementStatus, Priority
 from app.core.config import settings
+from app.services.effort import get_effort_analytics
+from app.services.etags import conditional_list
+from app.services.read_models import (
+    progress, project_export_select, requirement_breakdown, requirement_export_select
+)
 
 router = APIRouter()
 
@@ -23,15 +29,16 @@ logger = logging.getLogger(__name__)
 @router.get("/dashboard")
 async def get_dashboard_data(
     current_user: User = Depends(require_permissions(["report:read"])),
+    etag: str = Depends(conditional_list("projects", "requirements", time_dependent=True)),
     db: Session = Depends(get_db)
 ):
-    """Obtem dados do dashboard"""
+    """Obtem dados do dashboard (304 quando If-None-Match traz o ETag atual)"""
     try:
         # Estatisticas gerais
         total_projects = db.query(Project).count()
         active_projects = db.query(Project).filter(Project.is_active == True).count()
         total_requirements = db.query(Requirement).count()
-        completed_requirements = db.query(Requirement).filter(Requirement.status == "concluido").count()
+        completed_requirements = db.query(Requirement).filter(Requirement.status == RequirementStatus.CONCLUIDO).count()
         
         # Projetos por status
         projects_by_status = db.query(
@@ -58,12 +65,7 @@ async def get_dashboard_data(
         ).group_by(Requirement.priority).all()
         
         # Requisitos atrasados
-        overdue_requirements = db.query(Requirement).filter(
-            and_(
-                Requirement.due_date < datetime.utcnow(),
-                Requirement.status.notin_(["concluido", "cancelado"])
-            )
-        ).count()
+        overdue_requirements = db.query(Requirement).filter(Requirement.is_overdue).count()
         
         # Projetos recentes (ultimos 30 dias)
         thirty_days_ago = datetime.utcnow() - timedelta(days=30)
@@ -111,11 +113,36 @@ async def get_dashboard_data(
             detail="Erro interno do servidor"
         )
 
+@router.get("/effort")
+async def get_effort_report(
+    group_by: str = Query("project", regex="^(project|assigned_to)$"),
+    project_id: Optional[str] = None,
+    assigned_to: Optional[str] = None,
+    current_user: User = Depends(require_permissions(["report:read"])),
+    etag: str = Depends(conditional_list("requirements", "projects", "users")),
+    db: Session = Depends(get_db)
+):
+    """Obtem metricas de esforco (acuracia, variancia e consumo de horas) por projeto ou responsavel"""
+    try:
+        return get_effort_analytics(
+            db,
+            group_by=group_by,
+            project_id=project_id,
+            assigned_to=assigned_to
+        )
+        
+    except Exception as e:
+        logger.error(f"Erro ao obter relatorio de esforco: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Erro interno do servidor"
+        )
+
 @router.get("/projects/export")
 async def export_projects_report(
     format: str = Query("csv", regex="^(csv|excel|pdf)$"),
-    status: Optional[str] = None,
-    priority: Optional[str] = None,
+    status: Optional[ProjectStatus] = None,
+    priority: Optional[Priority] = None,
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
     current_user: User = Depends(require_permissions(["report:export"])),
@@ -123,7 +150,8 @@ async def export_projects_report(
 ):
     """Exporta relatorio de projetos"""
     try:
-        query = db.query(Project)
+        # Modelo de leitura: colunas da planilha, contagens e nomes resolvidos no banco
+        query = project_export_select()
         
         # Aplicar filtros
         if status:
@@ -138,29 +166,9 @@ async def export_projects_report(
         if end_date:
             query = query.filter(Project.created_at <= end_date)
         
-        projects = query.all()
-        
-        # Converter para DataFrame
-        data = []
-        for project in projects:
-            data.append({
-                "ID": project.id,
-                "Nome": project.name,
-                "Descricao": project.description,
-                "Status": project.status,
-                "Prioridade": project.priority,
-                "Cliente": project.client_name,
-                "Orcamento": project.budget,
-                "Data Inicio": project.start_date,
-                "Data Fim": project.end_date,
-                "Requisitos": project.requirements_count,
-                "Progresso (%)": project.progress_percentage,
-                "Criado Por": project.created_by_user.full_name if project.created_by_user else "",
-                "Data Criacao": project.created_at,
-                "Data Atualizacao": project.updated_at
-            })
-        
-        df = pd.DataFrame(data)
+        # Converter para DataFrame (cabecalhos sao os rotulos das colunas)
+        result = db.execute(query)
+        df = pd.DataFrame(result.all(), columns=list(result.keys()))
         
         # Criar arquivo temporario
         with tempfile.NamedTemporaryFile(delete=False, suffix=f".{format}") as tmp_file:
@@ -189,9 +197,9 @@ async def export_projects_report(
 async def export_requirements_report(
     format: str = Query("csv", regex="^(csv|excel|pdf)$"),
     project_id: Optional[str] = None,
-    type: Optional[str] = None,
-    priority: Optional[str] = None,
-    status: Optional[str] = None,
+    type: Optional[RequirementType] = None,
+    priority: Optional[Priority] = None,
+    status: Optional[RequirementStatus] = None,
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
     current_user: User = Depends(require_permissions(["report:export"])),
@@ -199,7 +207,8 @@ async def export_requirements_report(
 ):
     """Exporta relatorio de requisitos"""
     try:
-        query = db.query(Requirement)
+        # Modelo de leitura: campos calculados, projeto e usuarios resolvidos no proprio SELECT
+        query = requirement_export_select()
         
         # Aplicar filtros
         if project_id:
@@ -220,33 +229,9 @@ async def export_requirements_report(
         if end_date:
             query = query.filter(Requirement.created_at <= end_date)
         
-        requirements = query.all()
-        
-        # Converter para DataFrame
-        data = []
-        for req in requirements:
-            data.append({
-                "ID": req.id,
-                "Titulo": req.title,
-                "Descricao": req.description,
-                "Tipo": req.type,
-                "Prioridade": req.priority,
-                "Status": req.status,
-                "Complexidade": req.complexity,
-                "Horas Estimadas": req.estimated_hours,
-                "Horas Reais": req.actual_hours,
-                "Data Vencimento": req.due_date,
-                "Data Conclusao": req.completion_date,
-                "Projeto": req.project.name if req.project else "",
-                "Atribuido Para": req.assigned_user.full_name if req.assigned_user else "",
-                "Criado Por": req.created_by_user.full_name if req.created_by_user else "",
-                "Atrasado": req.is_overdue,
-                "Progresso (%)": req.progress_percentage,
-                "Data Criacao": req.created_at,
-                "Data Atualizacao": req.updated_at
-            })
-        
-        df = pd.DataFrame(data)
+        # Converter para DataFrame (cabecalhos sao os rotulos das colunas)
+        result = db.execute(query)
+        df = pd.DataFrame(result.all(), columns=list(result.keys()))
         
         # Criar arquivo temporario
         with tempfile.NamedTemporaryFile(delete=False, suffix=f".{format}") as tmp_file:
@@ -275,11 +260,17 @@ async def export_requirements_report(
 async def get_project_summary(
     project_id: str,
     current_user: User = Depends(require_permissions(["report:read"])),
+    etag: str = Depends(conditional_list("projects", "requirements", time_dependent=True)),
     db: Session = Depends(get_db)
 ):
     """Obtem resumo de um projeto especifico"""
     try:
-        project = db.query(Project).filter(Project.id == project_id).first()
+        project = db.execute(
+            select(
+                Project.id, Project.name, Project.description, Project.status,
+                Project.priority, Project.client_name
+            ).where(Project.id == project_id)
+        ).first()
         
         if not project:
             raise HTTPException(
@@ -287,29 +278,22 @@ async def get_project_summary(
                 detail="Projeto nao encontrado"
             )
         
-        # Estatisticas do projeto
-        requirements = project.requirements
-        total_requirements = len(requirements)
-        completed_requirements = len([r for r in requirements if r.status == "concluido"])
-        overdue_requirements = len([r for r in requirements if r.is_overdue])
-        
-        # Requisitos por status
+        # Estatisticas do projeto agrupadas no banco, sem carregar os requisitos
+        total_requirements = 0
+        completed_requirements = 0
+        overdue_requirements = 0
         requirements_by_status = {}
-        for req in requirements:
-            status = req.status
-            requirements_by_status[status] = requirements_by_status.get(status, 0) + 1
-        
-        # Requisitos por tipo
         requirements_by_type = {}
-        for req in requirements:
-            type = req.type
-            requirements_by_type[type] = requirements_by_type.get(type, 0) + 1
-        
-        # Requisitos por prioridade
         requirements_by_priority = {}
-        for req in requirements:
-            priority = req.priority
-            requirements_by_priority[priority] = requirements_by_priority.get(priority, 0) + 1
+        for group in requirement_breakdown(db, project_id):
+            total_requirements += group.count
+            if group.status == RequirementStatus.CONCLUIDO:
+                completed_requirements += group.count
+            if group.is_overdue:
+                overdue_requirements += group.count
+            requirements_by_status[group.status] = requirements_by_status.get(group.status, 0) + group.count
+            requirements_by_type[group.type] = requirements_by_type.get(group.type, 0) + group.count
+            requirements_by_priority[group.priority] = requirements_by_priority.get(group.priority, 0) + group.count
         
         return {
             "project": {
@@ -319,7 +303,7 @@ async def get_project_summary(
                 "status": project.status,
                 "priority": project.priority,
                 "client_name": project.client_name,
-                "progress_percentage": project.progress_percentage
+                "progress_percentage": progress(completed_requirements, total_requirements)
             },
             "statistics": {
                 "total_requirements": total_requirements,
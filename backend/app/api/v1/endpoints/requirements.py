@@ -1,91 +1,170 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, Query, Request, File, Form, UploadFile
+from fastapi.responses import FileResponse, ORJSONResponse
+from sqlalchemy.orm import Session, joinedload, noload
+from sqlalchemy.orm.attributes import set_committed_value
 from typing import List, Optional
 import logging
 from datetime import datetime
 
+from app.core.config import settings
 from app.core.database import get_db
+from app.core.entity_cache import EntityCache, get_entity_cache
 from app.core.security import get_current_active_user, require_permissions
 from app.models.user import User
 from app.models.project import Project
-from app.models.requirement import Requirement
-from app.schemas.requirement import RequirementCreate, RequirementUpdate, RequirementResponse, RequirementResponseSummary, RequirementFilter
+from app.models.requirement import Requirement, REQUIREMENT_SORT_COLUMNS
+from app.models.enums import RequirementType, RequirementStatus, Priority, Complexity
+from app.schemas.requirement import (
+    RequirementCreate, RequirementUpdate, RequirementResponse, RequirementResponseSummary, RequirementFilter,
+    RequirementBulkRequest, RequirementBulkResponse
+)
+from app.services.batch_get import BatchIdsError, missing_ids_headers, order_by_ids, parse_ids
+from app.services.change_feed import record_change
+from app.services.dynamic_field_schema import DynamicFieldValidationError, validate_dynamic_fields
+from app.services.dynamic_fields import DynamicFieldFilterError, parse_dynamic_field_filters
+from app.services.etags import conditional_entity, conditional_list, etag_headers, requirement_state
+from app.services.facets import FacetError, get_requirement_facets
+from app.services.loaders import (
+    REQUIREMENT_EXPANSION_TABLES, REQUIREMENT_EXPANSIONS, ExpandError, RequestLoaders, expand_rows,
+    expansion_columns, get_loaders, parse_expand
+)
+from app.services.read_models import (
+    RequirementSummaryRecord, list_response, record_names, requirement_summary_select, rows_to_dicts, to_records
+)
+from app.services.pagination import InvalidCursorError, paginate, sort_pattern
+from app.services.requirement_bulk import bulk_write_requirements
+from app.services.requirement_filters import apply_requirement_filters
+from app.services.requirement_import import ImportFileError, get_error_report, import_requirements, prune_import_reports
+from app.services.sparse_fields import REQUIREMENT_FIELDS, SparseFieldsError, load_sparse, parse_fields
 
 router = APIRouter()
 
 logger = logging.getLogger(__name__)
 
-@router.get("/", response_model=List[RequirementResponseSummary])
-async def get_requirements(
-    skip: int = Query(0, ge=0),
-    limit: int = Query(100, ge=1, le=1000),
+REQUIREMENT_SORT_FIELDS = {name: getattr(Requirement, name) for name in REQUIREMENT_SORT_COLUMNS}
+# Campo calculado (CASE sobre o status): ordena e pagina por keyset como os demais, sem indice proprio
+REQUIREMENT_SORT_FIELDS["progress_percentage"] = Requirement.progress_percentage
+
+# Relacionamentos serializados em RequirementResponse, carregados na mesma consulta
+REQUIREMENT_DETAIL_OPTIONS = (
+    joinedload(Requirement.project),
+    joinedload(Requirement.assigned_user),
+    joinedload(Requirement.created_by_user),
+)
+
+def requirement_detail_options(expand: Optional[List[str]]) -> list:
+    """Relacionamentos do detalhe: todos sem expand; com expand, so os pedidos (os demais vem nulos)"""
+    if expand is None:
+        return list(REQUIREMENT_DETAIL_OPTIONS)
+    return [
+        joinedload(relationship) if name in expand else noload(relationship)
+        for name, relationship in REQUIREMENT_FIELDS.relationships.items()
+    ]
+
+def requirement_filters(
+    request: Request,
     search: Optional[str] = None,
     project_id: Optional[str] = None,
-    type: Optional[str] = None,
-    priority: Optional[str] = None,
-    status: Optional[str] = None,
-    complexity: Optional[str] = None,
+    type: Optional[RequirementType] = None,
+    priority: Optional[Priority] = None,
+    status_filter: Optional[RequirementStatus] = Query(None, alias="status"),
+    complexity: Optional[Complexity] = None,
     assigned_to: Optional[str] = None,
     created_by: Optional[str] = None,
     is_overdue: Optional[bool] = None,
+    min_progress: Optional[float] = Query(None, ge=0, le=100),
+    max_progress: Optional[float] = Query(None, ge=0, le=100)
+) -> RequirementFilter:
+    """Filtros comuns da listagem de requisitos (inclui df.<campo>[.<operador>]=valor)"""
+    try:
+        dynamic_fields = parse_dynamic_field_filters(request.query_params)
+    except DynamicFieldFilterError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    return RequirementFilter(
+        search=search,
+        project_id=project_id,
+        type=type,
+        priority=priority,
+        status=status_filter,
+        complexity=complexity,
+        assigned_to=assigned_to,
+        created_by=created_by,
+        is_overdue=is_overdue,
+        min_progress=min_progress,
+        max_progress=max_progress,
+        dynamic_fields=dynamic_fields
+    )
+
+@router.get("/", response_model=List[RequirementResponseSummary])
+async def get_requirements(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    filters: RequirementFilter = Depends(requirement_filters),
+    sort: str = Query("-created_at", regex=sort_pattern(REQUIREMENT_SORT_FIELDS)),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    ids: Optional[str] = None,
+    expand: Optional[str] = None,
     current_user: User = Depends(require_permissions(["requirement:read"])),
+    etag: str = Depends(conditional_list(
+        "requirements", "dynamic_field_definitions", time_dependent=True,
+        expand_tables=REQUIREMENT_EXPANSION_TABLES
+    )),
+    loaders: RequestLoaders = Depends(get_loaders),
     db: Session = Depends(get_db)
 ):
-    """Lista todos os requisitos com filtros"""
+    """Lista todos os requisitos com filtros
+
+    Ordenacao por sort ("campo" ou "-campo"). Quando ha mais paginas o cabecalho
+    X-Next-Cursor traz o cursor da proxima, que dispensa skip.
+    Campos dinamicos sao filtrados com df.<campo>=valor (repetir o parametro exige todos os valores).
+    fields=id,title,status limita a resposta (e as colunas consultadas) aos campos informados.
+    ids=a,b,c busca esses requisitos em uma consulta, na ordem pedida e sem paginacao; os ids nao
+    encontrados vem no cabecalho X-Missing-Ids.
+    expand=project,assigned_user,created_by_user embute esses relacionamentos em cada item, carregados
+    em lote (uma consulta por tabela para a pagina inteira).
+    Com If-None-Match igual ao ETag atual responde 304 sem consultar os requisitos.
+    """
     try:
-        query = db.query(Requirement)
-        
-        # Aplicar filtros
-        if search:
-            query = query.filter(
-                Requirement.title.contains(search) |
-                Requirement.description.contains(search)
+        requested = parse_fields(fields, RequirementResponseSummary)
+        batch_ids = parse_ids(ids)
+        expanded = parse_expand(expand, REQUIREMENT_EXPANSIONS)
+        
+        # Modelo de leitura: colunas do resumo direto do banco, sem instanciar o modelo ORM
+        query = requirement_summary_select(sort, REQUIREMENT_SORT_FIELDS, requested)
+        if expanded:
+            query = query.add_columns(*expansion_columns(expanded))
+        query = apply_requirement_filters(db, query, filters)
+        
+        if batch_ids is not None:
+            rows, next_cursor = db.execute(query.where(Requirement.id.in_(batch_ids))).all(), None
+        else:
+            # Ordenacao e paginacao (por cursor quando informado)
+            rows, next_cursor = paginate(
+                query, sort, REQUIREMENT_SORT_FIELDS, Requirement.id, limit, skip=skip, cursor=cursor, db=db
             )
         
-        if project_id:
-            query = query.filter(Requirement.project_id == project_id)
-        
-        if type:
-            query = query.filter(Requirement.type == type)
-        
-        if priority:
-            query = query.filter(Requirement.priority == priority)
-        
-        if status:
-            query = query.filter(Requirement.status == status)
-        
-        if complexity:
-            query = query.filter(Requirement.complexity == complexity)
-        
-        if assigned_to:
-            query = query.filter(Requirement.assigned_to == assigned_to)
-        
-        if created_by:
-            query = query.filter(Requirement.created_by == created_by)
-        
-        if is_overdue is not None:
-            if is_overdue:
-                # Requisitos atrasados
-                query = query.filter(
-                    Requirement.due_date < datetime.utcnow(),
-                    Requirement.status.notin_(["concluido", "cancelado"])
-                )
-            else:
-                # Requisitos nao atrasados
-                query = query.filter(
-                    (Requirement.due_date >= datetime.utcnow()) |
-                    (Requirement.due_date.is_(None)) |
-                    (Requirement.status.in_(["concluido", "cancelado"]))
-                )
-        
-        # Ordenar por data de criacao (mais recentes primeiro)
-        query = query.order_by(Requirement.created_at.desc())
-        
-        # Paginacao
-        requirements = query.offset(skip).limit(limit).all()
-        
-        return requirements
-        
+        if expanded:
+            items = expand_rows(rows, requested or record_names(RequirementSummaryRecord), expanded, loaders)
+        elif requested:
+            items = rows_to_dicts(rows, requested)
+        else:
+            items = to_records(rows, RequirementSummaryRecord)
+        headers = etag_headers(etag)
+        if batch_ids is not None:
+            items, missing = order_by_ids(items, batch_ids)
+            headers.update(missing_ids_headers(missing))
+        return list_response(items, next_cursor, headers)
+        
+    except (InvalidCursorError, DynamicFieldFilterError, SparseFieldsError, BatchIdsError, ExpandError) as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     except Exception as e:
         logger.error(f"Erro ao listar requisitos: {e}")
         raise HTTPException(
@@ -93,15 +172,60 @@ async def get_requirements(
             detail="Erro interno do servidor"
         )
 
+@router.get("/facets")
+async def get_requirement_facets_endpoint(
+    fields: str = Query(..., description="Facetas separadas por virgula: status,priority,df.kpis_envolvidos"),
+    limit: int = Query(50, ge=1, le=500),
+    filters: RequirementFilter = Depends(requirement_filters),
+    current_user: User = Depends(require_permissions(["requirement:read"])),
+    etag: str = Depends(conditional_list("requirements", "dynamic_field_definitions", time_dependent=True)),
+    db: Session = Depends(get_db)
+):
+    """Contagem de requisitos por valor de campos nativos e dinamicos, com os mesmos filtros da listagem"""
+    try:
+        facet_fields = list(dict.fromkeys(field.strip() for field in fields.split(",") if field.strip()))
+        return get_requirement_facets(db, filters, facet_fields, limit=limit)
+        
+    except (FacetError, DynamicFieldFilterError) as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        logger.error(f"Erro ao calcular facetas de requisitos: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Erro interno do servidor"
+        )
+
 @router.get("/{requirement_id}", response_model=RequirementResponse)
 async def get_requirement(
     requirement_id: str,
+    fields: Optional[str] = None,
+    expand: Optional[str] = None,
     current_user: User = Depends(require_permissions(["requirement:read"])),
+    etag: Optional[str] = Depends(
+        conditional_entity(requirement_state, "requirement_id", tables=("requirements", "projects", "users"))
+    ),
     db: Session = Depends(get_db)
 ):
-    """Obtem um requisito especifico"""
+    """Obtem um requisito especifico
+
+    Com fields=id,title,status so as colunas e relacionamentos desses campos sao carregados.
+    expand=project,assigned_user escolhe os relacionamentos embutidos (sem o parametro vem todos),
+    carregados na mesma consulta do requisito.
+    Com If-None-Match igual ao ETag atual responde 304 sem carregar o requisito.
+    """
     try:
-        requirement = db.query(Requirement).filter(Requirement.id == requirement_id).first()
+        requested = parse_fields(fields, RequirementResponse)
+        expanded = parse_expand(expand, REQUIREMENT_EXPANSIONS)
+        if requested:
+            requested += [name for name in expanded or () if name not in requested]
+            requirement = load_sparse(db, REQUIREMENT_FIELDS, requested, Requirement.id == requirement_id)
+        else:
+            requirement = db.query(Requirement).options(*requirement_detail_options(expanded)).filter(
+                Requirement.id == requirement_id
+            ).first()
         
         if not requirement:
             raise HTTPException(
@@ -109,8 +233,13 @@ async def get_requirement(
                 detail="Requisito nao encontrado"
             )
         
-        return requirement
+        return ORJSONResponse(requirement, headers=etag_headers(etag)) if requested else requirement
         
+    except (SparseFieldsError, ExpandError) as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     except HTTPException:
         raise
     except Exception as e:
@@ -124,12 +253,13 @@ async def get_requirement(
 async def create_requirement(
     requirement_data: RequirementCreate,
     current_user: User = Depends(require_permissions(["requirement:create"])),
+    cache: EntityCache = Depends(get_entity_cache),
     db: Session = Depends(get_db)
 ):
     """Cria um novo requisito"""
     try:
         # Verificar se o projeto existe
-        project = db.query(Project).filter(Project.id == requirement_data.project_id).first()
+        project = cache.get(Project, requirement_data.project_id)
         
         if not project:
             raise HTTPException(
@@ -138,14 +268,17 @@ async def create_requirement(
             )
         
         # Verificar se o usuario atribuido existe
+        assigned_user = None
         if requirement_data.assigned_to:
-            assigned_user = db.query(User).filter(User.id == requirement_data.assigned_to).first()
+            assigned_user = cache.get(User, requirement_data.assigned_to)
             if not assigned_user:
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail="Usuario atribuido nao encontrado"
                 )
         
+        dynamic_fields = validate_dynamic_fields(db, requirement_data.dynamic_fields)
+        
         # Criar novo requisito
         requirement = Requirement(
             title=requirement_data.title,
@@ -158,19 +291,31 @@ async def create_requirement(
             actual_hours=requirement_data.actual_hours,
             due_date=requirement_data.due_date,
             completion_date=requirement_data.completion_date,
-            dynamic_fields=requirement_data.dynamic_fields,
+            dynamic_fields=dynamic_fields,
             project_id=requirement_data.project_id,
             assigned_to=requirement_data.assigned_to,
             created_by=current_user.id
         )
-        
+        # Relacionamentos ja consultados acima: a resposta nao precisa recarrega-los
+        # (atribuidos apos o add para nao incluir o requisito nas colecoes carregadas)
         db.add(requirement)
+        set_committed_value(requirement, "project", project)
+        set_committed_value(requirement, "assigned_user", assigned_user)
+        set_committed_value(requirement, "created_by_user", current_user)
+        # INSERT antecipado para o evento levar o id gerado
+        db.flush()
+        record_change(db, "requirement", "created", requirement.id, requirement.project_id)
+        
         db.commit()
-        db.refresh(requirement)
         
         logger.info(f"Requisito criado por {current_user.username}: {requirement.title}")
         return requirement
         
+    except DynamicFieldValidationError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     except HTTPException:
         raise
     except Exception as e:
@@ -181,16 +326,125 @@ async def create_requirement(
             detail="Erro interno do servidor"
         )
 
+@router.post("/bulk", response_model=RequirementBulkResponse)
+async def bulk_requirements(
+    bulk_data: RequirementBulkRequest,
+    current_user: User = Depends(require_permissions(["requirement:create"])),
+    db: Session = Depends(get_db)
+):
+    """Cria, atualiza ou faz upsert de varios requisitos em uma transacao, com resultado por item"""
+    try:
+        if bulk_data.mode != "create" and not current_user.has_permission("requirement:update"):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Permissoes insuficientes"
+            )
+        
+        result = bulk_write_requirements(db, bulk_data.mode, bulk_data.items, current_user, atomic=bulk_data.atomic)
+        
+        logger.info(
+            f"Requisitos em lote ({bulk_data.mode}) por {current_user.username}: "
+            f"{result['created']} criados, {result['updated']} atualizados, {result['failed']} com erro"
+        )
+        return result
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Erro ao gravar requisitos em lote: {e}")
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Erro interno do servidor"
+        )
+
+@router.post("/import")
+async def import_requirements_file(
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(...),
+    project_id: str = Form(...),
+    current_user: User = Depends(require_permissions(["requirement:create"])),
+    db: Session = Depends(get_db)
+):
+    """Importa requisitos de uma planilha CSV/XLSX para o projeto"""
+    try:
+        if file.size is not None and file.size > settings.MAX_FILE_SIZE:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail="Arquivo excede o tamanho maximo permitido"
+            )
+        
+        result = import_requirements(db, file.file, file.filename, project_id, current_user)
+        background_tasks.add_task(prune_import_reports)
+        
+        logger.info(
+            f"Requisitos importados por {current_user.username}: {result['imported']} de "
+            f"{result['rows_read']} linhas ({result['rows_per_second']} linhas/s)"
+        )
+        return result
+        
+    except ImportFileError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Erro ao importar requisitos: {e}")
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Erro interno do servidor"
+        )
+
+@router.get("/import/{import_id}/errors")
+async def get_import_error_report(
+    import_id: str,
+    current_user: User = Depends(require_permissions(["requirement:create"])),
+    db: Session = Depends(get_db)
+):
+    """Baixa o relatorio CSV das linhas rejeitadas de uma importacao (autor da importacao ou admin)"""
+    try:
+        report = get_error_report(import_id)
+        
+        # Relatorio de um projeto ja removido tambem deixa de existir
+        if not report or not db.query(Project.id).filter(Project.id == report["project_id"]).first():
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Relatorio de erros nao encontrado"
+            )
+        
+        if report["user_id"] != str(current_user.id) and not current_user.has_permission("requirement:admin"):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Nao tem permissao para baixar este relatorio"
+            )
+        
+        return FileResponse(report["path"], media_type="text/csv", filename=f"erros_importacao_{import_id}.csv")
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Erro ao obter relatorio de importacao: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Erro interno do servidor"
+        )
+
 @router.put("/{requirement_id}", response_model=RequirementResponse)
 async def update_requirement(
     requirement_id: str,
     requirement_data: RequirementUpdate,
     current_user: User = Depends(require_permissions(["requirement:update"])),
+    cache: EntityCache = Depends(get_entity_cache),
     db: Session = Depends(get_db)
 ):
     """Atualiza um requisito"""
     try:
-        requirement = db.query(Requirement).filter(Requirement.id == requirement_id).first()
+        requirement = db.query(Requirement).options(*REQUIREMENT_DETAIL_OPTIONS).filter(
+            Requirement.id == requirement_id
+        ).first()
         
         if not requirement:
             raise HTTPException(
@@ -212,8 +466,9 @@ async def update_requirement(
             )
         
         # Verificar se o usuario atribuido existe
+        assigned_user = None
         if requirement_data.assigned_to:
-            assigned_user = db.query(User).filter(User.id == requirement_data.assigned_to).first()
+            assigned_user = cache.get(User, requirement_data.assigned_to)
             if not assigned_user:
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
@@ -223,15 +478,26 @@ async def update_requirement(
         # Atualizar campos
         update_data = requirement_data.dict(exclude_unset=True)
         
+        if "dynamic_fields" in update_data:
+            update_data["dynamic_fields"] = validate_dynamic_fields(db, update_data["dynamic_fields"])
+        
         for field, value in update_data.items():
             setattr(requirement, field, value)
         
+        if "assigned_to" in update_data:
+            set_committed_value(requirement, "assigned_user", assigned_user)
+        
+        record_change(db, "requirement", "updated", requirement.id, requirement.project_id)
         db.commit()
-        db.refresh(requirement)
         
         logger.info(f"Requisito atualizado por {current_user.username}: {requirement.title}")
         return requirement
         
+    except DynamicFieldValidationError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     except HTTPException:
         raise
     except Exception as e:
@@ -246,11 +512,12 @@ async def update_requirement(
 async def delete_requirement(
     requirement_id: str,
     current_user: User = Depends(require_permissions(["requirement:delete"])),
+    cache: EntityCache = Depends(get_entity_cache),
     db: Session = Depends(get_db)
 ):
     """Deleta um requisito"""
     try:
-        requirement = db.query(Requirement).filter(Requirement.id == requirement_id).first()
+        requirement = cache.get(Requirement, requirement_id)
         
         if not requirement:
             raise HTTPException(
@@ -266,6 +533,7 @@ async def delete_requirement(
             )
         
         db.delete(requirement)
+        record_change(db, "requirement", "deleted", requirement.id, requirement.project_id)
         db.commit()
         
         logger.info(f"Requisito deletado por {current_user.username}: {requirement.title}")
@@ -285,11 +553,12 @@ async def assign_requirement(
     requirement_id: str,
     user_id: str,
     current_user: User = Depends(require_permissions(["requirement:update"])),
+    cache: EntityCache = Depends(get_entity_cache),
     db: Session = Depends(get_db)
 ):
     """Atribui um requisito a um usuario"""
     try:
-        requirement = db.query(Requirement).filter(Requirement.id == requirement_id).first()
+        requirement = cache.get(Requirement, requirement_id)
         
         if not requirement:
             raise HTTPException(
@@ -297,7 +566,7 @@ async def assign_requirement(
                 detail="Requisito nao encontrado"
             )
         
-        user = db.query(User).filter(User.id == user_id).first()
+        user = cache.get(User, user_id)
         
         if not user:
             raise HTTPException(
@@ -306,6 +575,7 @@ async def assign_requirement(
             )
         
         requirement.assigned_to = user_id
+        record_change(db, "requirement", "assigned", requirement.id, requirement.project_id)
         db.commit()
         
         logger.info(f"Requisito atribuido por {current_user.username}: {requirement.title} -> {user.username}")
@@ -325,11 +595,12 @@ async def assign_requirement(
 async def complete_requirement(
     requirement_id: str,
     current_user: User = Depends(require_permissions(["requirement:update"])),
+    cache: EntityCache = Depends(get_entity_cache),
     db: Session = Depends(get_db)
 ):
     """Marca um requisito como concluido"""
     try:
-        requirement = db.query(Requirement).filter(Requirement.id == requirement_id).first()
+        requirement = cache.get(Requirement, requirement_id)
         
         if not requirement:
             raise HTTPException(
@@ -337,8 +608,9 @@ async def complete_requirement(
                 detail="Requisito nao encontrado"
             )
         
-        requirement.status = "concluido"
+        requirement.status = RequirementStatus.CONCLUIDO
         requirement.completion_date = datetime.utcnow()
+        record_change(db, "requirement", "completed", requirement.id, requirement.project_id)
         db.commit()
         
         logger.info(f"Requisito concluido por {current_user.username}: {requirement.title}")
@@ -0,0 +1,81 @@
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, Query
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.orm import Session
+from typing import Optional
+import logging
+
+from app.core.config import settings
+from app.core.database import get_db
+from app.core.security import require_permissions
+from app.models.user import User
+from app.services.sync import SyncTokenError, SyncTokenExpiredError, prune_tombstones, sync_changes
+
+router = APIRouter()
+
+logger = logging.getLogger(__name__)
+
+def _sync_response(
+    db: Session,
+    resource: str,
+    since: Optional[str],
+    limit: int,
+    background_tasks: BackgroundTasks
+) -> ORJSONResponse:
+    try:
+        page = sync_changes(db, resource, since, limit)
+        background_tasks.add_task(prune_tombstones)
+        return ORJSONResponse(page, headers={"Cache-Control": "no-store"})
+
+    except SyncTokenExpiredError as e:
+        raise HTTPException(
+            status_code=status.HTTP_410_GONE,
+            detail=str(e)
+        )
+    except SyncTokenError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        logger.error(f"Erro ao sincronizar {resource}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Erro interno do servidor"
+        )
+
+@router.get("/requirements")
+async def sync_requirements(
+    background_tasks: BackgroundTasks,
+    since: Optional[str] = None,
+    limit: int = Query(settings.SYNC_PAGE_SIZE, ge=1, le=settings.SYNC_MAX_PAGE_SIZE),
+    current_user: User = Depends(require_permissions(["requirement:read"])),
+    db: Session = Depends(get_db)
+):
+    """Requisitos alterados e excluidos desde o token since (sem since: carga completa)
+
+    Aplique primeiro "deleted" e depois "items"; enquanto has_more for verdadeiro,
+    continue com next_token. O ultimo next_token e o since da proxima sincronizacao.
+    """
+    return _sync_response(db, "requirements", since, limit, background_tasks)
+
+@router.get("/projects")
+async def sync_projects(
+    background_tasks: BackgroundTasks,
+    since: Optional[str] = None,
+    limit: int = Query(settings.SYNC_PAGE_SIZE, ge=1, le=settings.SYNC_MAX_PAGE_SIZE),
+    current_user: User = Depends(require_permissions(["project:read"])),
+    db: Session = Depends(get_db)
+):
+    """Projetos alterados e excluidos desde o token since (mesmo protocolo de /sync/requirements)"""
+    return _sync_response(db, "projects", since, limit, background_tasks)
+
+@router.get("/dynamic-fields")
+async def sync_dynamic_fields(
+    background_tasks: BackgroundTasks,
+    since: Optional[str] = None,
+    limit: int = Query(settings.SYNC_PAGE_SIZE, ge=1, le=settings.SYNC_MAX_PAGE_SIZE),
+    current_user: User = Depends(require_permissions(["dynamic_field:read"])),
+    db: Session = Depends(get_db)
+):
+    """Definicoes de campos dinamicos alteradas e excluidas desde o token since"""
+    return _sync_response(db, "dynamic-fields", since, limit, background_tasks)
@@ -1,12 +1,22 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import delete
 from sqlalchemy.orm import Session
 from typing import List, Optional
 import logging
 
 from app.core.database import get_db
+from app.core.entity_cache import EntityCache, get_entity_cache
 from app.core.security import get_current_active_user, require_permissions, get_password_hash
 from app.models.user import User
 from app.schemas.user import UserCreate, UserUpdate, UserResponse, UserResponseSafe
+from app.services.batch_get import BatchIdsError, missing_ids_headers, order_by_ids, parse_ids
+from app.services.etags import conditional_list, etag_headers
+from app.services.read_models import UserSafeRecord, list_response, rows_to_dicts, to_records, user_safe_select
+from app.services.sparse_fields import USER_FIELDS, SparseFieldsError, load_sparse, parse_fields
+from app.services.user_reassignment import (
+    ReassignmentError, preview_reassignment, reassign_user_work, resolve_reassignment_target
+)
 
 router = APIRouter()
 
@@ -19,12 +29,21 @@ async def get_users(
     search: Optional[str] = None,
     role: Optional[str] = None,
     is_active: Optional[bool] = None,
+    fields: Optional[str] = None,
+    ids: Optional[str] = None,
     current_user: User = Depends(require_permissions(["user:read", "user:admin"])),
+    etag: str = Depends(conditional_list("users")),
     db: Session = Depends(get_db)
 ):
-    """Lista todos os usuarios com filtros"""
+    """Lista todos os usuarios com filtros (fields=id,username limita os campos consultados)
+
+    ids=a,b,c busca esses usuarios em uma consulta, na ordem pedida e sem paginacao; os ids nao
+    encontrados vem no cabecalho X-Missing-Ids.
+    """
     try:
-        query = db.query(User)
+        requested = parse_fields(fields, UserResponseSafe)
+        batch_ids = parse_ids(ids)
+        query = user_safe_select(requested)
         
         # Aplicar filtros
         if search:
@@ -41,14 +60,24 @@ async def get_users(
         if is_active is not None:
             query = query.filter(User.is_active == is_active)
         
-        # Ordenar por nome de usuario
-        query = query.order_by(User.username)
-        
-        # Paginacao
-        users = query.offset(skip).limit(limit).all()
+        if batch_ids is not None:
+            rows = db.execute(query.where(User.id.in_(batch_ids)))
+        else:
+            # Ordenar por nome de usuario e paginar
+            rows = db.execute(query.order_by(User.username).offset(skip).limit(limit))
         
-        return users
+        items = rows_to_dicts(rows, requested) if requested else to_records(rows, UserSafeRecord)
+        headers = etag_headers(etag)
+        if batch_ids is not None:
+            items, missing = order_by_ids(items, batch_ids)
+            headers.update(missing_ids_headers(missing))
+        return list_response(items, headers=headers)
         
+    except (SparseFieldsError, BatchIdsError) as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     except Exception as e:
         logger.error(f"Erro ao listar usuarios: {e}")
         raise HTTPException(
@@ -59,12 +88,18 @@ async def get_users(
 @router.get("/{user_id}", response_model=UserResponse)
 async def get_user(
     user_id: str,
+    fields: Optional[str] = None,
     current_user: User = Depends(require_permissions(["user:read", "user:admin"])),
+    cache: EntityCache = Depends(get_entity_cache),
     db: Session = Depends(get_db)
 ):
-    """Obtem um usuario especifico"""
+    """Obtem um usuario especifico (fields=id,username carrega so essas colunas)"""
     try:
-        user = db.query(User).filter(User.id == user_id).first()
+        requested = parse_fields(fields, UserResponse)
+        if requested:
+            user = load_sparse(db, USER_FIELDS, requested, User.id == user_id)
+        else:
+            user = cache.get(User, user_id)
         
         if not user:
             raise HTTPException(
@@ -72,8 +107,13 @@ async def get_user(
                 detail="Usuario nao encontrado"
             )
         
-        return user
+        return ORJSONResponse(user) if requested else user
         
+    except SparseFieldsError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     except HTTPException:
         raise
     except Exception as e:
@@ -116,7 +156,6 @@ async def create_user(
         
         db.add(user)
         db.commit()
-        db.refresh(user)
         
         logger.info(f"Usuario criado por {current_user.username}: {user.username}")
         return user
@@ -136,11 +175,12 @@ async def update_user(
     user_id: str,
     user_data: UserUpdate,
     current_user: User = Depends(require_permissions(["user:update", "user:admin"])),
+    cache: EntityCache = Depends(get_entity_cache),
     db: Session = Depends(get_db)
 ):
     """Atualiza um usuario"""
     try:
-        user = db.query(User).filter(User.id == user_id).first()
+        user = cache.get(User, user_id)
         
         if not user:
             raise HTTPException(
@@ -182,7 +222,6 @@ async def update_user(
             setattr(user, field, value)
         
         db.commit()
-        db.refresh(user)
         
         logger.info(f"Usuario atualizado por {current_user.username}: {user.username}")
         return user
@@ -200,12 +239,20 @@ async def update_user(
 @router.delete("/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_user(
     user_id: str,
+    reassign_to: Optional[str] = None,
     current_user: User = Depends(require_permissions(["user:delete", "user:admin"])),
+    cache: EntityCache = Depends(get_entity_cache),
     db: Session = Depends(get_db)
 ):
-    """Deleta um usuario"""
+    """Deleta um usuario
+
+    Na mesma transacao, os requisitos abertos atribuidos a ele passam para
+    reassign_to (ou ficam sem responsavel), os encerrados ficam sem responsavel e
+    os projetos e a autoria dos requisitos passam para reassign_to (ou para quem
+    executa a exclusao).
+    """
     try:
-        user = db.query(User).filter(User.id == user_id).first()
+        user = cache.get(User, user_id)
         
         if not user:
             raise HTTPException(
@@ -227,11 +274,24 @@ async def delete_user(
                 detail="Nao e possivel deletar um superusuario"
             )
         
-        db.delete(user)
+        target = resolve_reassignment_target(db, user, reassign_to)
+        moved = reassign_user_work(db, user, target, target or current_user, deleting=True)
+        
+        # Sem carregar as colecoes do usuario: as referencias ja foram movidas acima
+        db.execute(delete(User.__table__).where(User.__table__.c.id == user.id))
         db.commit()
         
-        logger.info(f"Usuario deletado por {current_user.username}: {user.username}")
+        logger.info(
+            f"Usuario deletado por {current_user.username}: {user.username} "
+            f"({moved['requirements']} requisitos e {moved['projects']} projetos reatribuidos)"
+        )
         
+    except ReassignmentError as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     except HTTPException:
         raise
     except Exception as e:
@@ -242,15 +302,58 @@ async def delete_user(
             detail="Erro interno do servidor"
         )
 
+@router.get("/{user_id}/reassignment")
+async def get_reassignment_preview(
+    user_id: str,
+    action: str = Query("deactivate", regex="^(deactivate|delete)$"),
+    reassign_to: Optional[str] = None,
+    current_user: User = Depends(require_permissions(["user:update", "user:admin"])),
+    cache: EntityCache = Depends(get_entity_cache),
+    db: Session = Depends(get_db)
+):
+    """Previa da reatribuicao executada ao desativar ou deletar o usuario"""
+    try:
+        user = cache.get(User, user_id)
+        
+        if not user:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Usuario nao encontrado"
+            )
+        
+        target = resolve_reassignment_target(db, user, reassign_to)
+        
+        return {
+            "action": action,
+            "reassign_to": target.id if target else None,
+            "project_owner": target.id if target else current_user.id,
+            **preview_reassignment(db, user.id, deleting=action == "delete")
+        }
+        
+    except ReassignmentError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Erro ao calcular previa de reatribuicao: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Erro interno do servidor"
+        )
+
 @router.post("/{user_id}/activate")
 async def activate_user(
     user_id: str,
     current_user: User = Depends(require_permissions(["user:update", "user:admin"])),
+    cache: EntityCache = Depends(get_entity_cache),
     db: Session = Depends(get_db)
 ):
     """Ativa um usuario"""
     try:
-        user = db.query(User).filter(User.id == user_id).first()
+        user = cache.get(User, user_id)
         
         if not user:
             raise HTTPException(
@@ -277,12 +380,19 @@ async def activate_user(
 @router.post("/{user_id}/deactivate")
 async def deactivate_user(
     user_id: str,
+    reassign_to: Optional[str] = None,
     current_user: User = Depends(require_permissions(["user:update", "user:admin"])),
+    cache: EntityCache = Depends(get_entity_cache),
     db: Session = Depends(get_db)
 ):
-    """Desativa um usuario"""
+    """Desativa um usuario
+
+    Na mesma transacao, os requisitos abertos atribuidos a ele passam para
+    reassign_to (ou ficam sem responsavel) e os projetos criados por ele passam
+    para reassign_to (ou para quem executa a desativacao).
+    """
     try:
-        user = db.query(User).filter(User.id == user_id).first()
+        user = cache.get(User, user_id)
         
         if not user:
             raise HTTPException(
@@ -297,12 +407,21 @@ async def deactivate_user(
                 detail="Nao e possivel desativar o proprio usuario"
             )
         
+        target = resolve_reassignment_target(db, user, reassign_to)
+        moved = reassign_user_work(db, user, target, target or current_user)
+        
         user.is_active = False
         db.commit()
         
         logger.info(f"Usuario desativado por {current_user.username}: {user.username}")
-        return {"message": "Usuario desativado com sucesso"}
+        return {"message": "Usuario desativado com sucesso", "reassigned": moved}
         
+    except ReassignmentError as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     except HTTPException:
         raise
     except Exception as e:
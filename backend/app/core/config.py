@@ -31,11 +31,59 @@ class Settings(BaseSettings):
     LOG_LEVEL: str = "INFO"
     LOG_FILE: str = "logs/app.log"
     
+    # Cabecalhos de depuracao nas respostas (ex.: acertos do cache de entidades da requisicao)
+    DEBUG_HEADERS: bool = False
+    
     # Configuracoes de seguranca adicional
     RATE_LIMIT_PER_MINUTE: int = 60
     MAX_LOGIN_ATTEMPTS: int = 5
     LOCKOUT_DURATION_MINUTES: int = 15
     
+    # Reescrita em lotes de campos dinamicos (backfill)
+    BACKFILL_BATCH_SIZE: int = 500
+    BACKFILL_THROTTLE_SECONDS: float = 0.1
+    
+    # Escrita em lote de requisitos (/requirements/bulk)
+    REQUIREMENT_BULK_MAX_ITEMS: int = 500
+    
+    # Busca em lote por ids nas listagens (?ids=); 300 UUIDs cabem na linha de requisicao
+    BATCH_GET_MAX_IDS: int = 300
+    
+    # Importacao de planilhas de requisitos (linhas validadas/carregadas por lote)
+    IMPORT_BATCH_SIZE: int = 1000
+    # Relatorios de linhas rejeitadas (uploads/import_reports) expiram apos este prazo
+    IMPORT_REPORT_RETENTION_HOURS: int = 72
+    
+    # Exclusao de projetos: acima deste numero de requisitos a exclusao vira um
+    # expurgo assincrono em lotes (DELETE por lote, commit entre lotes)
+    PROJECT_PURGE_ASYNC_THRESHOLD: int = 10000
+    PROJECT_PURGE_BATCH_SIZE: int = 5000
+    PROJECT_PURGE_THROTTLE_SECONDS: float = 0.05
+    
+    # Clonagem de projetos: acima deste numero de requisitos a copia roda em background
+    PROJECT_CLONE_ASYNC_THRESHOLD: int = 5000
+    
+    # Jobs em background (backfill, expurgo, clonagem) em execucao sem renovar o
+    # lease por este tempo sao considerados sem worker e podem ser retomados
+    JOB_LEASE_SECONDS: int = 300
+    
+    # ETags: listagens e relatorios que dependem da hora atual (atrasados, prazos)
+    # mudam de ETag a cada janela, mesmo sem escritas
+    ETAG_TIME_BUCKET_SECONDS: int = 60
+    
+    # Feed de mudancas (SSE em /events): "memory" entrega aos clientes do proprio
+    # processo; "postgres" distribui entre workers/instancias via LISTEN/NOTIFY
+    CHANGE_FEED_BROKER: str = "memory"
+    CHANGE_FEED_QUEUE_SIZE: int = 1000
+    CHANGE_FEED_REPLAY_SIZE: int = 1000
+    CHANGE_FEED_HEARTBEAT_SECONDS: int = 15
+    
+    # Sincronizacao incremental (/sync): tokens mais antigos que a retencao dos
+    # tombstones sao recusados (410) e o cliente refaz a carga completa
+    SYNC_TOMBSTONE_RETENTION_DAYS: int = 30
+    SYNC_PAGE_SIZE: int = 1000
+    SYNC_MAX_PAGE_SIZE: int = 5000
+    
     # Configuracoes de upload
     UPLOAD_DIR: str = "uploads"
     MAX_FILE_SIZE: int = 10 * 1024 * 1024  # 10MB
@@ -1,8 +1,13 @@
-from sqlalchemy import create_engine
+from fastapi import HTTPException
+from sqlalchemy import create_engine, event, Uuid
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.sql.expression import FunctionElement
+from sqlalchemy.types import TypeDecorator
 from app.core.config import settings
 import logging
+import uuid
 
 # Criar engine do banco de dados
 engine = create_engine(
@@ -12,17 +17,76 @@ engine = create_engine(
     echo=False  # Set to True for SQL debugging
 )
 
+if engine.dialect.name == "sqlite":
+    # SQLite so aplica as FKs (e o ON DELETE CASCADE) com o pragma ligado por conexao
+    @event.listens_for(engine, "connect")
+    def _enable_sqlite_foreign_keys(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
 # Criar sessao do banco de dados
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# expire_on_commit=False: os objetos continuam carregados apos o commit, entao a
+# serializacao da resposta nao recarrega cada linha gravada. Os valores gerados no
+# banco (created_at/updated_at com func.now()) nao seriam conhecidos sem recarregar;
+# por isso os modelos com essas colunas declaram __mapper_args__ = {"eager_defaults":
+# True}, que os traz de volta via RETURNING no proprio INSERT/UPDATE
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
 
 # Base para os modelos
 Base = declarative_base()
 
+class GUID(TypeDecorator):
+    """UUID nativo no PostgreSQL (CHAR(32) em outros bancos) exposto como str no Python
+
+    Valores que nao sao UUIDs validos viram NULL no bind, de modo que buscas por
+    ids malformados simplesmente nao encontram registros (404) em vez de erro no banco.
+    """
+    impl = Uuid(as_uuid=True)
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None or isinstance(value, uuid.UUID):
+            return value
+        try:
+            return uuid.UUID(str(value))
+        except ValueError:
+            return None
+
+    def process_result_value(self, value, dialect):
+        return str(value) if value is not None else None
+
+def canonical_id(value) -> str:
+    """Id no formato em que GUID volta do banco (UUID com hifens); ValueError se nao for um UUID"""
+    return str(uuid.UUID(str(value)))
+
+def generate_uuid() -> str:
+    """Gera um novo identificador UUID em formato texto"""
+    return str(uuid.uuid4())
+
+class new_uuid(FunctionElement):
+    """UUID gerado no banco, para chaves em INSERT ... SELECT"""
+    type = GUID()
+    inherit_cache = True
+
+@compiles(new_uuid)
+def _compile_new_uuid(element, compiler, **kw):
+    # 32 digitos hexadecimais, o formato do GUID fora do PostgreSQL
+    return "lower(hex(randomblob(16)))"
+
+@compiles(new_uuid, "postgresql")
+def _compile_new_uuid_pg(element, compiler, **kw):
+    return "gen_random_uuid()"
+
 # Dependency para obter sessao do banco
 def get_db():
     db = SessionLocal()
     try:
         yield db
+    except HTTPException:
+        # Respostas de controle (304 do GET condicional, 4xx dos endpoints), nao erros da sessao
+        db.rollback()
+        raise
     except Exception as e:
         logging.error(f"Erro na sessao do banco: {e}")
         db.rollback()
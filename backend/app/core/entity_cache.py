@@ -0,0 +1,49 @@
+from typing import Any, Optional, Type, TypeVar
+
+from fastapi import Depends, Request
+from sqlalchemy import inspect
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.util import identity_key
+
+from app.core.database import canonical_id, get_db
+
+# Cabecalho de depuracao com os acertos do cache (apenas com DEBUG_HEADERS)
+ENTITY_CACHE_HEADER = "X-Entity-Cache"
+
+T = TypeVar("T")
+
+class EntityCache:
+    """Cache de identidade da requisicao para buscas por chave primaria
+
+    get_db e resolvido uma vez por requisicao, entao a autenticacao, as demais
+    dependencias e o endpoint compartilham a sessao e o seu identity map. get()
+    devolve a instancia ja carregada por qualquer um deles sem ir ao banco (o
+    usuario autenticado, o projeto validado, os relacionamentos de um joinedload)
+    e conta acertos e faltas para o cabecalho de depuracao.
+    """
+    __slots__ = ("db", "hits", "misses")
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, model: Type[T], pk: Any) -> Optional[T]:
+        try:
+            # Formato em que as chaves voltam do banco (GUID)
+            key = canonical_id(pk)
+        except ValueError:
+            return None
+
+        cached = self.db.identity_map.get(identity_key(model, key))
+        if cached is not None and not inspect(cached).expired:
+            self.hits += 1
+        else:
+            self.misses += 1
+        return self.db.get(model, key)
+
+def get_entity_cache(request: Request, db: Session = Depends(get_db)) -> EntityCache:
+    """Dependencia: o cache da requisicao (guardado em request.state para o middleware de depuracao)"""
+    cache = EntityCache(db)
+    request.state.entity_cache = cache
+    return cache
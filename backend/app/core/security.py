@@ -4,11 +4,10 @@ from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
 import logging
 
 from app.core.config import settings
-from app.core.database import get_db
+from app.core.entity_cache import EntityCache, get_entity_cache
 from app.models.user import User
 
 # Configurar criptografia de senhas
@@ -47,7 +46,7 @@ def verify_token(token: str) -> Optional[dict]:
 
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
+    cache: EntityCache = Depends(get_entity_cache)
 ) -> User:
     """Obtem o usuario atual baseado no token JWT"""
     credentials_exception = HTTPException(
@@ -69,7 +68,8 @@ async def get_current_user(
     except JWTError:
         raise credentials_exception
     
-    user = db.query(User).filter(User.id == user_id).first()
+    # Compartilhado com o endpoint: buscas seguintes pelo mesmo usuario nao vao ao banco
+    user = cache.get(User, user_id)
     if user is None:
         raise credentials_exception
     
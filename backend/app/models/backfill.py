@@ -0,0 +1,63 @@
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, JSON, Text
+from sqlalchemy.sql import func
+from app.core.database import Base, GUID, generate_uuid
+from app.models.enums import BackfillOperation, BackfillStatus, db_enum
+from typing import Dict, Any, Optional
+
+class DynamicFieldBackfill(Base):
+    """Job de reescrita em lotes dos documentos dynamic_fields apos alteracao de uma definicao"""
+    __tablename__ = "dynamic_field_backfills"
+    __mapper_args__ = {"eager_defaults": True}
+    
+    id = Column(GUID, primary_key=True, default=generate_uuid)
+    field_id = Column(GUID, ForeignKey("dynamic_field_definitions.id", ondelete="SET NULL"), nullable=True)
+    operation = Column(db_enum(BackfillOperation), nullable=False)
+    params = Column(JSON, nullable=False, default=dict)
+    status = Column(db_enum(BackfillStatus), nullable=False, default=BackfillStatus.PENDENTE)
+    
+    # Progresso: ultimo requisito processado (cursor por id) e contadores
+    last_id = Column(GUID, nullable=True)
+    total_rows = Column(Integer, nullable=True)
+    processed_rows = Column(Integer, nullable=False, default=0)
+    updated_rows = Column(Integer, nullable=False, default=0)
+    error = Column(Text, nullable=True)
+    
+    created_by = Column(GUID, ForeignKey("users.id"), nullable=True)
+    
+    # Timestamps
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, default=func.now())
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+    
+    def __repr__(self):
+        return f"<DynamicFieldBackfill {self.operation} {self.status}>"
+    
+    @property
+    def progress_percentage(self) -> Optional[float]:
+        """Porcentagem processada em relacao ao total estimado no inicio"""
+        if self.status == BackfillStatus.CONCLUIDO:
+            return 100.0
+        if not self.total_rows:
+            return None
+        return round(min(self.processed_rows / self.total_rows, 1) * 100, 2)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Converte o job para dicionario"""
+        return {
+            "id": self.id,
+            "field_id": self.field_id,
+            "operation": self.operation,
+            "params": self.params,
+            "status": self.status,
+            "total_rows": self.total_rows,
+            "processed_rows": self.processed_rows,
+            "updated_rows": self.updated_rows,
+            "progress_percentage": self.progress_percentage,
+            "error": self.error,
+            "created_by": self.created_by,
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "updated_at": self.updated_at.isoformat() if self.updated_at else None
+        }
@@ -0,0 +1,112 @@
+from typing import List
+
+from sqlalchemy import BigInteger, Column, DateTime, Index, Integer, String, event, text
+from sqlalchemy.sql import func
+from app.core.database import Base, GUID
+
+# Tabelas expostas em /sync: cada linha tem change_seq (indice (change_seq, id))
+# e as exclusoes ficam em deleted_records, ambos preenchidos por triggers
+SYNC_TABLES = ("requirements", "projects", "dynamic_field_definitions")
+
+# SQLite: contador global em table_versions que numera as escritas (o banco
+# serializa as transacoes de escrita, entao a ordem do contador e a de commit)
+CHANGE_SEQ_COUNTER = "_change_seq"
+
+# PostgreSQL: change_seq e o id da transacao que gravou a linha. Um leitor usa
+# como proximo token o xmin do seu snapshot: toda transacao com id menor ja
+# terminou, entao nenhuma escrita confirmada depois da leitura fica para tras
+TRANSACTION_SEQ = "pg_current_xact_id()::text::bigint"
+
+class DeletedRecord(Base):
+    """Registro de exclusao (tombstone) de uma linha das tabelas sincronizaveis"""
+    __tablename__ = "deleted_records"
+    __table_args__ = (
+        Index("idx_deleted_records_table_seq", "table_name", "change_seq", "id"),
+    )
+
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True)
+    table_name = Column(String(64), nullable=False)
+    record_id = Column(GUID, nullable=False)
+    change_seq = Column(BigInteger, nullable=False)
+    # Indexado para a limpeza dos registros antigos
+    deleted_at = Column(DateTime, nullable=False, default=func.now(), index=True)
+
+    def __repr__(self):
+        return f"<DeletedRecord {self.table_name} {self.record_id}>"
+
+def change_tracking_ddl(dialect_name: str) -> List[str]:
+    """Instrucoes que criam os triggers de change_seq e de tombstones das tabelas sincronizaveis"""
+    if dialect_name == "postgresql":
+        statements = [
+            "CREATE OR REPLACE FUNCTION set_change_seq() RETURNS trigger AS $$ "
+            f"BEGIN NEW.change_seq := {TRANSACTION_SEQ}; RETURN NEW; END; $$ LANGUAGE plpgsql",
+            "CREATE OR REPLACE FUNCTION record_deletion() RETURNS trigger AS $$ "
+            "BEGIN "
+            "INSERT INTO deleted_records (table_name, record_id, change_seq, deleted_at) "
+            f"VALUES (TG_TABLE_NAME, OLD.id, {TRANSACTION_SEQ}, now()); "
+            "RETURN NULL; "
+            "END; $$ LANGUAGE plpgsql",
+        ]
+        for table in SYNC_TABLES:
+            statements += [
+                f"DROP TRIGGER IF EXISTS {table}_change_seq ON {table}",
+                f"CREATE TRIGGER {table}_change_seq BEFORE INSERT OR UPDATE ON {table} "
+                "FOR EACH ROW EXECUTE FUNCTION set_change_seq()",
+                f"DROP TRIGGER IF EXISTS {table}_tombstone ON {table}",
+                f"CREATE TRIGGER {table}_tombstone AFTER DELETE ON {table} "
+                "FOR EACH ROW EXECUTE FUNCTION record_deletion()",
+            ]
+        return statements
+
+    bump = (
+        f"UPDATE table_versions SET version = version + 1 WHERE table_name = '{CHANGE_SEQ_COUNTER}' AND shard = 0; "
+    )
+    current = f"(SELECT version FROM table_versions WHERE table_name = '{CHANGE_SEQ_COUNTER}' AND shard = 0)"
+    statements = [
+        f"INSERT INTO table_versions (table_name, shard, version) VALUES ('{CHANGE_SEQ_COUNTER}', 0, 0) "
+        "ON CONFLICT DO NOTHING"
+    ]
+    for table in SYNC_TABLES:
+        # O UPDATE da propria linha nao dispara o trigger de novo (recursive_triggers desligado)
+        for operation in ("INSERT", "UPDATE"):
+            statements.append(
+                f"CREATE TRIGGER IF NOT EXISTS {table}_change_seq_{operation.lower()} "
+                f"AFTER {operation} ON {table} BEGIN {bump}"
+                f"UPDATE {table} SET change_seq = {current} WHERE id = NEW.id; "
+                "END"
+            )
+        statements.append(
+            f"CREATE TRIGGER IF NOT EXISTS {table}_tombstone AFTER DELETE ON {table} BEGIN {bump}"
+            "INSERT INTO deleted_records (table_name, record_id, change_seq, deleted_at) "
+            f"VALUES ('{table}', OLD.id, {current}, CURRENT_TIMESTAMP); "
+            "END"
+        )
+    return statements
+
+def drop_change_tracking_ddl(dialect_name: str) -> List[str]:
+    """Instrucoes que removem os triggers e funcoes criados por change_tracking_ddl"""
+    if dialect_name == "postgresql":
+        statements = []
+        for table in SYNC_TABLES:
+            statements.append(f"DROP TRIGGER IF EXISTS {table}_change_seq ON {table}")
+            statements.append(f"DROP TRIGGER IF EXISTS {table}_tombstone ON {table}")
+        return statements + ["DROP FUNCTION IF EXISTS set_change_seq()", "DROP FUNCTION IF EXISTS record_deletion()"]
+
+    statements = [f"DELETE FROM table_versions WHERE table_name = '{CHANGE_SEQ_COUNTER}'"]
+    for table in SYNC_TABLES:
+        statements += [
+            f"DROP TRIGGER IF EXISTS {table}_change_seq_insert",
+            f"DROP TRIGGER IF EXISTS {table}_change_seq_update",
+            f"DROP TRIGGER IF EXISTS {table}_tombstone",
+        ]
+    return statements
+
+def install_change_tracking_triggers(connection) -> None:
+    for statement in change_tracking_ddl(connection.dialect.name):
+        connection.execute(text(statement))
+
+@event.listens_for(Base.metadata, "after_create")
+def _install_after_create(target, connection, tables=(), **kw):
+    # create_all (ambiente de desenvolvimento): instala quando a tabela de tombstones e criada
+    if DeletedRecord.__table__ in tables:
+        install_change_tracking_triggers(connection)
@@ -1,14 +1,18 @@
-from sqlalchemy import Column, String, DateTime, Boolean, JSON, Text
+from sqlalchemy import BigInteger, Column, String, DateTime, Boolean, JSON, Text, Index, text
 from sqlalchemy.sql import func
-from app.core.database import Base
-import uuid
+from app.core.database import Base, GUID, generate_uuid
 from datetime import datetime
 from typing import Dict, Any, List, Optional
 
 class DynamicFieldDefinition(Base):
     __tablename__ = "dynamic_field_definitions"
+    __table_args__ = (
+        # Sincronizacao incremental (/sync/dynamic-fields)
+        Index("idx_dynamic_field_definitions_change_seq", "change_seq", "id"),
+    )
+    __mapper_args__ = {"eager_defaults": True}
     
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = Column(GUID, primary_key=True, default=generate_uuid)
     field_name = Column(String(100), nullable=False, index=True)
     field_type = Column(String(50), nullable=False)  # text, number, date, select, textarea, boolean
     field_label = Column(String(200), nullable=True)
@@ -19,10 +23,13 @@ class DynamicFieldDefinition(Base):
     applies_to = Column(String(50), nullable=False, default="requirement")  # requirement, project
     order_index = Column(String(10), nullable=True)  # Para ordenacao dos campos
     validation_rules = Column(JSON, nullable=True)  # Regras de validacao
+    promoted_column = Column(String(100), nullable=True)  # Coluna gerada em requirements, quando promovido
     
     # Timestamps
     created_at = Column(DateTime, default=func.now())
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+    # Sequencia de sincronizacao (/sync), gravada por trigger a cada escrita
+    change_seq = Column(BigInteger, nullable=False, server_default=text("0"))
     
     def __repr__(self):
         return f"<DynamicFieldDefinition {self.field_name}>"
@@ -63,6 +70,7 @@ class DynamicFieldDefinition(Base):
             "applies_to": self.applies_to,
             "order_index": self.order_index,
             "validation_rules": self.validation_rules,
+            "promoted_column": self.promoted_column,
             "created_at": self.created_at.isoformat() if self.created_at else None,
             "updated_at": self.updated_at.isoformat() if self.updated_at else None
         }
@@ -0,0 +1,98 @@
+from enum import StrEnum
+from typing import Type
+
+from sqlalchemy import Enum
+
+# Registro unico dos valores permitidos para colunas categoricas.
+# Os modelos usam estes enums como tipos de coluna (enum nativo no PostgreSQL)
+# e os schemas Pydantic os usam como tipos de campo.
+
+class RequirementType(StrEnum):
+    FUNCIONAL = "funcional"
+    NAO_FUNCIONAL = "nao_funcional"
+    REGRA_NEGOCIO = "regra_negocio"
+
+class RequirementStatus(StrEnum):
+    PENDENTE = "pendente"
+    EM_ANALISE = "em_analise"
+    APROVADO = "aprovado"
+    EM_DESENVOLVIMENTO = "em_desenvolvimento"
+    CONCLUIDO = "concluido"
+    CANCELADO = "cancelado"
+
+class ProjectStatus(StrEnum):
+    EM_ANDAMENTO = "em_andamento"
+    CONCLUIDO = "concluido"
+    CANCELADO = "cancelado"
+    PAUSADO = "pausado"
+
+class Priority(StrEnum):
+    BAIXA = "baixa"
+    MEDIA = "media"
+    ALTA = "alta"
+    CRITICA = "critica"
+
+class Complexity(StrEnum):
+    BAIXA = "baixa"
+    MEDIA = "media"
+    ALTA = "alta"
+
+class BackfillOperation(StrEnum):
+    RENOMEAR_CAMPO = "renomear_campo"
+    REMOVER_OPCOES = "remover_opcoes"
+    PREENCHER_PADRAO = "preencher_padrao"
+
+class BackfillStatus(StrEnum):
+    PENDENTE = "pendente"
+    EXECUTANDO = "executando"
+    PAUSADO = "pausado"
+    CONCLUIDO = "concluido"
+    FALHOU = "falhou"
+
+class PurgeStatus(StrEnum):
+    PENDENTE = "pendente"
+    EXECUTANDO = "executando"
+    CONCLUIDO = "concluido"
+    FALHOU = "falhou"
+
+class CloneStatus(StrEnum):
+    PENDENTE = "pendente"
+    EXECUTANDO = "executando"
+    CONCLUIDO = "concluido"
+    FALHOU = "falhou"
+
+# Status de requisito que encerram o trabalho (nao contam como atraso nem horas restantes)
+CLOSED_REQUIREMENT_STATUSES = (RequirementStatus.CONCLUIDO, RequirementStatus.CANCELADO)
+OPEN_REQUIREMENT_STATUSES = tuple(s for s in RequirementStatus if s not in CLOSED_REQUIREMENT_STATUSES)
+
+# Progresso (%) associado a cada status de requisito
+REQUIREMENT_STATUS_PROGRESS = {
+    RequirementStatus.PENDENTE: 0,
+    RequirementStatus.EM_ANALISE: 25,
+    RequirementStatus.APROVADO: 50,
+    RequirementStatus.EM_DESENVOLVIMENTO: 75,
+    RequirementStatus.CONCLUIDO: 100,
+    RequirementStatus.CANCELADO: 0,
+}
+
+# Nome do tipo enum no PostgreSQL para cada enum do registro
+DB_ENUM_NAMES = {
+    RequirementType: "requirement_type",
+    RequirementStatus: "requirement_status",
+    ProjectStatus: "project_status",
+    Priority: "priority_level",
+    Complexity: "complexity_level",
+    BackfillOperation: "backfill_operation",
+    BackfillStatus: "backfill_status",
+    PurgeStatus: "purge_status",
+    CloneStatus: "clone_status",
+}
+
+def db_enum(enum_cls: Type[StrEnum]) -> Enum:
+    """Tipo de coluna para um enum do registro (persistido pelo valor, nao pelo nome)"""
+    return Enum(
+        enum_cls,
+        name=DB_ENUM_NAMES[enum_cls],
+        values_callable=lambda members: [member.value for member in members],
+        validate_strings=True,
+    )
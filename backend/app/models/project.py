@@ -1,19 +1,29 @@
-from sqlalchemy import Column, String, DateTime, Text, ForeignKey, Boolean
+from sqlalchemy import BigInteger, Column, String, DateTime, Text, ForeignKey, Boolean, Index, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
-from app.core.database import Base
-import uuid
+from app.core.database import Base, GUID, generate_uuid
+from app.models.enums import ProjectStatus, Priority, RequirementStatus, db_enum
 from datetime import datetime
 from typing import Dict, Any
 
+# Campos aceitos no parametro sort da listagem; cada um tem indice (campo, id)
+PROJECT_SORT_COLUMNS = ("created_at", "updated_at", "name", "status", "priority", "start_date", "end_date")
+
 class Project(Base):
     __tablename__ = "projects"
+    __table_args__ = (
+        # Ordenacao com paginacao por cursor
+        *(Index(f"idx_projects_sort_{name}", name, "id") for name in PROJECT_SORT_COLUMNS),
+        # Sincronizacao incremental (/sync/projects)
+        Index("idx_projects_change_seq", "change_seq", "id"),
+    )
+    __mapper_args__ = {"eager_defaults": True}
     
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = Column(GUID, primary_key=True, default=generate_uuid)
     name = Column(String(200), nullable=False, index=True)
     description = Column(Text, nullable=True)
-    status = Column(String(50), nullable=False, default="em_andamento")
-    priority = Column(String(20), nullable=False, default="media")
+    status = Column(db_enum(ProjectStatus), nullable=False, default=ProjectStatus.EM_ANDAMENTO)
+    priority = Column(db_enum(Priority), nullable=False, default=Priority.MEDIA)
     start_date = Column(DateTime, nullable=True)
     end_date = Column(DateTime, nullable=True)
     budget = Column(String(100), nullable=True)
@@ -21,13 +31,16 @@ class Project(Base):
     is_active = Column(Boolean, default=True)
     
     # Relacionamentos
-    created_by = Column(String(36), ForeignKey("users.id"), nullable=False)
+    created_by = Column(GUID, ForeignKey("users.id"), nullable=False)
     created_by_user = relationship("User", back_populates="projects")
-    requirements = relationship("Requirement", back_populates="project", cascade="all, delete-orphan")
+    # passive_deletes: a exclusao dos requisitos fica com o ON DELETE CASCADE do banco
+    requirements = relationship("Requirement", back_populates="project", cascade="all, delete-orphan", passive_deletes=True)
     
     # Timestamps
     created_at = Column(DateTime, default=func.now())
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+    # Sequencia de sincronizacao (/sync), gravada por trigger a cada escrita
+    change_seq = Column(BigInteger, nullable=False, server_default=text("0"))
     
     def __repr__(self):
         return f"<Project {self.name}>"
@@ -42,7 +55,7 @@ class Project(Base):
         """Retorna o numero de requisitos concluidos"""
         if not self.requirements:
             return 0
-        return len([req for req in self.requirements if req.status == "concluido"])
+        return len([req for req in self.requirements if req.status == RequirementStatus.CONCLUIDO])
     
     @property
     def progress_percentage(self) -> float:
@@ -73,6 +86,16 @@ class Project(Base):
             "updated_at": self.updated_at.isoformat() if self.updated_at else None
         }
     
+    def to_dict_reference(self) -> Dict[str, Any]:
+        """Referencia ao projeto em outros recursos (sem contagens, que carregam os requisitos)"""
+        return {
+            "id": self.id,
+            "name": self.name,
+            "status": self.status,
+            "priority": self.priority,
+            "client_name": self.client_name
+        }
+    
     def to_dict_summary(self) -> Dict[str, Any]:
         """Converte o projeto para dicionario resumido"""
         return {
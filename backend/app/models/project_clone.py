@@ -0,0 +1,51 @@
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, JSON, Text
+from sqlalchemy.sql import func
+from app.core.database import Base, GUID, generate_uuid
+from app.models.enums import CloneStatus, db_enum
+from typing import Dict, Any
+
+class ProjectClone(Base):
+    """Job de clonagem em background de um projeto e seus requisitos"""
+    __tablename__ = "project_clones"
+    __mapper_args__ = {"eager_defaults": True}
+    
+    id = Column(GUID, primary_key=True, default=generate_uuid)
+    source_project_id = Column(GUID, ForeignKey("projects.id", ondelete="SET NULL"), nullable=True)
+    # Projeto criado (inativo ate a copia terminar); removido junto com o job
+    project_id = Column(GUID, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False, index=True)
+    options = Column(JSON, nullable=False, default=dict)
+    status = Column(db_enum(CloneStatus), nullable=False, default=CloneStatus.PENDENTE)
+    
+    # Progresso (a copia e uma unica instrucao: total conhecido no inicio, copiados ao final)
+    total_rows = Column(Integer, nullable=True)
+    copied_rows = Column(Integer, nullable=False, default=0)
+    error = Column(Text, nullable=True)
+    
+    created_by = Column(GUID, ForeignKey("users.id"), nullable=True)
+    
+    # Timestamps
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, default=func.now())
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+    
+    def __repr__(self):
+        return f"<ProjectClone {self.source_project_id} -> {self.project_id} {self.status}>"
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Converte o job para dicionario"""
+        return {
+            "id": self.id,
+            "source_project_id": self.source_project_id,
+            "project_id": self.project_id,
+            "options": self.options,
+            "status": self.status,
+            "total_rows": self.total_rows,
+            "copied_rows": self.copied_rows,
+            "error": self.error,
+            "created_by": self.created_by,
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "updated_at": self.updated_at.isoformat() if self.updated_at else None
+        }
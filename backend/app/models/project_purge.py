@@ -0,0 +1,59 @@
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy.sql import func
+from app.core.database import Base, GUID, generate_uuid
+from app.models.enums import PurgeStatus, db_enum
+from typing import Dict, Any, Optional
+
+class ProjectPurge(Base):
+    """Job de exclusao assincrona em lotes de um projeto com muitos requisitos"""
+    __tablename__ = "project_purges"
+    __mapper_args__ = {"eager_defaults": True}
+    
+    id = Column(GUID, primary_key=True, default=generate_uuid)
+    # Sem FK: o job permanece como registro apos o projeto ser removido
+    project_id = Column(GUID, nullable=False, index=True)
+    project_name = Column(String(200), nullable=False)
+    status = Column(db_enum(PurgeStatus), nullable=False, default=PurgeStatus.PENDENTE)
+    
+    # Progresso
+    total_rows = Column(Integer, nullable=True)
+    deleted_rows = Column(Integer, nullable=False, default=0)
+    error = Column(Text, nullable=True)
+    
+    created_by = Column(GUID, ForeignKey("users.id"), nullable=True)
+    
+    # Timestamps
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, default=func.now())
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+    
+    def __repr__(self):
+        return f"<ProjectPurge {self.project_name} {self.status}>"
+    
+    @property
+    def progress_percentage(self) -> Optional[float]:
+        """Porcentagem de requisitos removidos em relacao ao total no inicio"""
+        if self.status == PurgeStatus.CONCLUIDO:
+            return 100.0
+        if not self.total_rows:
+            return None
+        return round(min(self.deleted_rows / self.total_rows, 1) * 100, 2)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Converte o job para dicionario"""
+        return {
+            "id": self.id,
+            "project_id": self.project_id,
+            "project_name": self.project_name,
+            "status": self.status,
+            "total_rows": self.total_rows,
+            "deleted_rows": self.deleted_rows,
+            "progress_percentage": self.progress_percentage,
+            "error": self.error,
+            "created_by": self.created_by,
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "updated_at": self.updated_at.isoformat() if self.updated_at else None
+        }
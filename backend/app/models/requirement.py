@@ -1,54 +1,116 @@
-from sqlalchemy import Column, String, DateTime, Text, ForeignKey, Boolean, JSON
+from sqlalchemy import BigInteger, Column, String, DateTime, Text, ForeignKey, Boolean, JSON, Numeric, Integer, Index, and_, case, text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
-from app.core.database import Base
-import uuid
+from sqlalchemy.sql.expression import FunctionElement
+from app.core.database import Base, GUID, generate_uuid
+from app.models.enums import (
+    RequirementType, RequirementStatus, Priority, Complexity,
+    CLOSED_REQUIREMENT_STATUSES, REQUIREMENT_STATUS_PROGRESS, db_enum
+)
 from datetime import datetime
 from typing import Dict, Any, Optional
 
+OPEN_DUE_DATE_PREDICATE = "status NOT IN ({})".format(
+    ", ".join(f"'{status.value}'" for status in CLOSED_REQUIREMENT_STATUSES)
+)
+
+# Campos aceitos no parametro sort da listagem; cada um tem indice (campo, id) e (project_id, campo, id)
+REQUIREMENT_SORT_COLUMNS = ("created_at", "updated_at", "due_date", "priority", "status", "title")
+
+class days_between(FunctionElement):
+    """Dias inteiros (arredondados para baixo) entre dois timestamps, como timedelta.days"""
+    type = Integer()
+    inherit_cache = True
+
+@compiles(days_between)
+def _compile_days_between(element, compiler, **kw):
+    end, start = [compiler.process(arg, **kw) for arg in element.clauses]
+    diff = f"(julianday({end}) - julianday({start}))"
+    return f"(CAST({diff} AS INTEGER) - ({diff} < CAST({diff} AS INTEGER)))"
+
+@compiles(days_between, "postgresql")
+def _compile_days_between_pg(element, compiler, **kw):
+    end, start = [compiler.process(arg, **kw) for arg in element.clauses]
+    return f"CAST(floor(extract(epoch from ({end} - {start})) / 86400) AS INTEGER)"
+
 class Requirement(Base):
     __tablename__ = "requirements"
+    __table_args__ = (
+        # Atende o filtro de atrasados (prazo vencido entre os requisitos em aberto)
+        Index(
+            "idx_requirements_open_due_date",
+            "due_date",
+            postgresql_where=text(OPEN_DUE_DATE_PREDICATE),
+            sqlite_where=text(OPEN_DUE_DATE_PREDICATE),
+        ),
+        # Filtros por campos dinamicos (containment @>) no PostgreSQL
+        Index(
+            "idx_requirements_dynamic_fields",
+            "dynamic_fields",
+            postgresql_using="gin",
+            postgresql_ops={"dynamic_fields": "jsonb_path_ops"},
+        ).ddl_if(dialect="postgresql"),
+        # Ordenacao com paginacao por cursor, geral e dentro de um projeto
+        *(Index(f"idx_requirements_sort_{name}", name, "id") for name in REQUIREMENT_SORT_COLUMNS),
+        *(Index(f"idx_requirements_project_sort_{name}", "project_id", name, "id") for name in REQUIREMENT_SORT_COLUMNS),
+        # Sincronizacao incremental (/sync/requirements)
+        Index("idx_requirements_change_seq", "change_seq", "id"),
+    )
+    __mapper_args__ = {"eager_defaults": True}
     
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = Column(GUID, primary_key=True, default=generate_uuid)
     title = Column(String(200), nullable=False, index=True)
     description = Column(Text, nullable=True)
-    type = Column(String(50), nullable=False, default="funcional")  # funcional, nao_funcional, regra_negocio
-    priority = Column(String(20), nullable=False, default="media")  # baixa, media, alta, critica
-    status = Column(String(50), nullable=False, default="pendente")  # pendente, em_analise, aprovado, em_desenvolvimento, concluido, cancelado
-    complexity = Column(String(20), nullable=True)  # baixa, media, alta
-    estimated_hours = Column(String(50), nullable=True)
-    actual_hours = Column(String(50), nullable=True)
+    type = Column(db_enum(RequirementType), nullable=False, default=RequirementType.FUNCIONAL)
+    priority = Column(db_enum(Priority), nullable=False, default=Priority.MEDIA)
+    status = Column(db_enum(RequirementStatus), nullable=False, default=RequirementStatus.PENDENTE)
+    complexity = Column(db_enum(Complexity), nullable=True)
+    estimated_hours = Column(Numeric(10, 2), nullable=True)
+    actual_hours = Column(Numeric(10, 2), nullable=True)
     due_date = Column(DateTime, nullable=True)
     completion_date = Column(DateTime, nullable=True)
     
-    # Campos dinamicos (JSON)
-    dynamic_fields = Column(JSON, default=dict)
+    # Campos dinamicos (JSONB no PostgreSQL)
+    dynamic_fields = Column(JSON().with_variant(JSONB(), "postgresql"), default=dict)
     
     # Relacionamentos
-    project_id = Column(String(36), ForeignKey("projects.id"), nullable=False)
+    project_id = Column(GUID, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False)
     project = relationship("Project", back_populates="requirements")
     
-    assigned_to = Column(String(36), ForeignKey("users.id"), nullable=True)
+    assigned_to = Column(GUID, ForeignKey("users.id"), nullable=True)
     assigned_user = relationship("User", back_populates="assigned_requirements", foreign_keys=[assigned_to])
     
-    created_by = Column(String(36), ForeignKey("users.id"), nullable=False)
+    created_by = Column(GUID, ForeignKey("users.id"), nullable=False)
     created_by_user = relationship("User", back_populates="created_requirements", foreign_keys=[created_by])
     
     # Timestamps
     created_at = Column(DateTime, default=func.now())
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+    # Sequencia de sincronizacao (/sync), gravada por trigger a cada escrita
+    change_seq = Column(BigInteger, nullable=False, server_default=text("0"))
     
     def __repr__(self):
         return f"<Requirement {self.title}>"
     
-    @property
+    @hybrid_property
     def is_overdue(self) -> bool:
         """Verifica se o requisito esta atrasado"""
         if not self.due_date:
             return False
-        return datetime.utcnow() > self.due_date and self.status not in ["concluido", "cancelado"]
+        return datetime.utcnow() > self.due_date and self.status not in CLOSED_REQUIREMENT_STATUSES
     
-    @property
+    @is_overdue.expression
+    def is_overdue(cls):
+        return and_(
+            cls.due_date.isnot(None),
+            cls.due_date < datetime.utcnow(),
+            cls.status.notin_(CLOSED_REQUIREMENT_STATUSES)
+        )
+    
+    @hybrid_property
     def days_until_due(self) -> Optional[int]:
         """Retorna o numero de dias ate o vencimento"""
         if not self.due_date:
@@ -56,18 +118,18 @@ class Requirement(Base):
         delta = self.due_date - datetime.utcnow()
         return delta.days
     
-    @property
+    @days_until_due.expression
+    def days_until_due(cls):
+        return days_between(cls.due_date, datetime.utcnow())
+    
+    @hybrid_property
     def progress_percentage(self) -> float:
         """Retorna a porcentagem de progresso baseada no status"""
-        status_progress = {
-            "pendente": 0,
-            "em_analise": 25,
-            "aprovado": 50,
-            "em_desenvolvimento": 75,
-            "concluido": 100,
-            "cancelado": 0
-        }
-        return status_progress.get(self.status, 0)
+        return REQUIREMENT_STATUS_PROGRESS.get(self.status, 0)
+    
+    @progress_percentage.expression
+    def progress_percentage(cls):
+        return case(REQUIREMENT_STATUS_PROGRESS, value=cls.status, else_=0)
     
     def get_dynamic_field(self, field_name: str) -> Any:
         """Obtem o valor de um campo dinamico"""
@@ -89,8 +151,8 @@ class Requirement(Base):
             "priority": self.priority,
             "status": self.status,
             "complexity": self.complexity,
-            "estimated_hours": self.estimated_hours,
-            "actual_hours": self.actual_hours,
+            "estimated_hours": float(self.estimated_hours) if self.estimated_hours is not None else None,
+            "actual_hours": float(self.actual_hours) if self.actual_hours is not None else None,
             "due_date": self.due_date.isoformat() if self.due_date else None,
             "completion_date": self.completion_date.isoformat() if self.completion_date else None,
             "dynamic_fields": self.dynamic_fields,
@@ -0,0 +1,75 @@
+from typing import List
+
+from sqlalchemy import BigInteger, Column, SmallInteger, String, event, text
+from app.core.database import Base
+
+# Tabelas cujas escritas mudam os ETags das respostas que as leem
+VERSIONED_TABLES = ("users", "projects", "requirements", "dynamic_field_definitions")
+
+# Linhas do contador por tabela no PostgreSQL: cada conexao incrementa a sua
+# (pid % shards), assim escritas concorrentes na mesma tabela nao esperam o
+# commit umas das outras para atualizar o contador
+TABLE_VERSION_SHARDS = 8
+
+class TableVersion(Base):
+    """Contador de escritas por tabela, incrementado por triggers na transacao da escrita
+
+    A versao de uma tabela e a soma das suas linhas. Como o incremento faz parte
+    da transacao, a versao nova so fica visivel junto com os dados alterados
+    (inclusive escritas por COPY, INSERT ... SELECT e DELETE em lote).
+    """
+    __tablename__ = "table_versions"
+
+    table_name = Column(String(64), primary_key=True)
+    shard = Column(SmallInteger, primary_key=True, default=0)
+    version = Column(BigInteger, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<TableVersion {self.table_name}[{self.shard}] {self.version}>"
+
+def table_version_ddl(dialect_name: str) -> List[str]:
+    """Instrucoes que criam as linhas do contador e os triggers das tabelas versionadas"""
+    shards = TABLE_VERSION_SHARDS if dialect_name == "postgresql" else 1
+    rows = ", ".join(f"('{table}', {shard}, 0)" for table in VERSIONED_TABLES for shard in range(shards))
+    statements = [
+        f"INSERT INTO table_versions (table_name, shard, version) VALUES {rows} ON CONFLICT DO NOTHING"
+    ]
+
+    if dialect_name == "postgresql":
+        statements.append(
+            "CREATE OR REPLACE FUNCTION bump_table_version() RETURNS trigger AS $$ "
+            "BEGIN "
+            "UPDATE table_versions SET version = version + 1 "
+            f"WHERE table_name = TG_TABLE_NAME AND shard = mod(pg_backend_pid(), {TABLE_VERSION_SHARDS}); "
+            "RETURN NULL; "
+            "END; $$ LANGUAGE plpgsql"
+        )
+        for table in VERSIONED_TABLES:
+            # Um incremento por instrucao (nao por linha)
+            statements.append(f"DROP TRIGGER IF EXISTS {table}_table_version ON {table}")
+            statements.append(
+                f"CREATE TRIGGER {table}_table_version "
+                f"AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {table} "
+                "FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version()"
+            )
+    else:
+        # SQLite so tem triggers por linha
+        for table in VERSIONED_TABLES:
+            for operation in ("INSERT", "UPDATE", "DELETE"):
+                statements.append(
+                    f"CREATE TRIGGER IF NOT EXISTS {table}_table_version_{operation.lower()} "
+                    f"AFTER {operation} ON {table} BEGIN "
+                    f"UPDATE table_versions SET version = version + 1 WHERE table_name = '{table}' AND shard = 0; "
+                    "END"
+                )
+    return statements
+
+def install_table_version_triggers(connection) -> None:
+    for statement in table_version_ddl(connection.dialect.name):
+        connection.execute(text(statement))
+
+@event.listens_for(Base.metadata, "after_create")
+def _install_after_create(target, connection, tables=(), **kw):
+    # create_all (ambiente de desenvolvimento): instala quando a tabela do contador e criada
+    if TableVersion.__table__ in tables:
+        install_table_version_triggers(connection)
@@ -61,6 +61,7 @@ class DynamicFieldUpdate(BaseModel):
 
 class DynamicFieldResponse(DynamicFieldBase):
     id: str
+    promoted_column: Optional[str] = None
     created_at: datetime
     updated_at: datetime
     
@@ -2,30 +2,18 @@ from pydantic import BaseModel, validator
 from typing import Optional, Dict, Any
 from datetime import datetime
 
+from app.models.enums import ProjectStatus, Priority
+
 class ProjectBase(BaseModel):
     name: str
     description: Optional[str] = None
-    status: str = "em_andamento"
-    priority: str = "media"
+    status: ProjectStatus = ProjectStatus.EM_ANDAMENTO
+    priority: Priority = Priority.MEDIA
     start_date: Optional[datetime] = None
     end_date: Optional[datetime] = None
     budget: Optional[str] = None
     client_name: Optional[str] = None
     is_active: bool = True
-    
-    @validator('status')
-    def validate_status(cls, v):
-        valid_statuses = ["em_andamento", "concluido", "cancelado", "pausado"]
-        if v not in valid_statuses:
-            raise ValueError(f'Status deve ser um dos seguintes: {", ".join(valid_statuses)}')
-        return v
-    
-    @validator('priority')
-    def validate_priority(cls, v):
-        valid_priorities = ["baixa", "media", "alta", "critica"]
-        if v not in valid_priorities:
-            raise ValueError(f'Prioridade deve ser uma das seguintes: {", ".join(valid_priorities)}')
-        return v
 
 class ProjectCreate(ProjectBase):
     pass
@@ -33,28 +21,28 @@ class ProjectCreate(ProjectBase):
 class ProjectUpdate(BaseModel):
     name: Optional[str] = None
     description: Optional[str] = None
-    status: Optional[str] = None
-    priority: Optional[str] = None
+    status: Optional[ProjectStatus] = None
+    priority: Optional[Priority] = None
     start_date: Optional[datetime] = None
     end_date: Optional[datetime] = None
     budget: Optional[str] = None
     client_name: Optional[str] = None
     is_active: Optional[bool] = None
+
+class ProjectCloneRequest(BaseModel):
+    """Opcoes da clonagem de um projeto (campos omitidos sao copiados da origem)"""
+    name: str
+    description: Optional[str] = None
+    client_name: Optional[str] = None
+    shift_days: int = 0
+    reset_status: bool = True
+    assignee_map: Dict[str, Optional[str]] = {}
+    clear_assignees: bool = False
     
-    @validator('status')
-    def validate_status(cls, v):
-        if v is not None:
-            valid_statuses = ["em_andamento", "concluido", "cancelado", "pausado"]
-            if v not in valid_statuses:
-                raise ValueError(f'Status deve ser um dos seguintes: {", ".join(valid_statuses)}')
-        return v
-    
-    @validator('priority')
-    def validate_priority(cls, v):
-        if v is not None:
-            valid_priorities = ["baixa", "media", "alta", "critica"]
-            if v not in valid_priorities:
-                raise ValueError(f'Prioridade deve ser uma das seguintes: {", ".join(valid_priorities)}')
+    @validator('shift_days')
+    def validate_shift_days(cls, v):
+        if abs(v) > 3650:
+            raise ValueError('shift_days deve estar entre -3650 e 3650')
         return v
 
 class ProjectResponse(ProjectBase):
@@ -67,6 +55,10 @@ class ProjectResponse(ProjectBase):
     created_at: datetime
     updated_at: datetime
     
+    @validator('created_by_user', pre=True)
+    def serialize_user(cls, v):
+        return v.to_dict_safe() if hasattr(v, "to_dict_safe") else v
+    
     class Config:
         from_attributes = True
 
@@ -74,8 +66,8 @@ class ProjectResponseSummary(BaseModel):
     id: str
     name: str
     description: Optional[str] = None
-    status: str
-    priority: str
+    status: ProjectStatus
+    priority: Priority
     client_name: Optional[str] = None
     requirements_count: int
     progress_percentage: float
@@ -85,8 +77,8 @@ class ProjectResponseSummary(BaseModel):
         from_attributes = True
 
 class ProjectFilter(BaseModel):
-    status: Optional[str] = None
-    priority: Optional[str] = None
+    status: Optional[ProjectStatus] = None
+    priority: Optional[Priority] = None
     client_name: Optional[str] = None
     created_by: Optional[str] = None
     is_active: Optional[bool] = None
@@ -1,48 +1,39 @@
 from pydantic import BaseModel, validator
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Literal, Tuple
 from datetime import datetime
+from decimal import InvalidOperation
+
+from app.core.config import settings
+from app.models.enums import RequirementType, RequirementStatus, Priority, Complexity
+from app.services.effort import HOURS_MAX, parse_hours
+
+def _validate_hours(v):
+    if v is None or (isinstance(v, str) and not v.strip()):
+        return None
+    try:
+        hours = parse_hours(v)
+    except (InvalidOperation, TypeError):
+        hours = None
+    if hours is None:
+        raise ValueError(f'Horas devem ser um numero nao negativo de ate {HOURS_MAX}')
+    return float(hours)
 
 class RequirementBase(BaseModel):
     title: str
     description: Optional[str] = None
-    type: str = "funcional"
-    priority: str = "media"
-    status: str = "pendente"
-    complexity: Optional[str] = None
-    estimated_hours: Optional[str] = None
-    actual_hours: Optional[str] = None
+    type: RequirementType = RequirementType.FUNCIONAL
+    priority: Priority = Priority.MEDIA
+    status: RequirementStatus = RequirementStatus.PENDENTE
+    complexity: Optional[Complexity] = None
+    estimated_hours: Optional[float] = None
+    actual_hours: Optional[float] = None
     due_date: Optional[datetime] = None
     completion_date: Optional[datetime] = None
     dynamic_fields: Dict[str, Any] = {}
     
-    @validator('type')
-    def validate_type(cls, v):
-        valid_types = ["funcional", "nao_funcional", "regra_negocio"]
-        if v not in valid_types:
-            raise ValueError(f'Tipo deve ser um dos seguintes: {", ".join(valid_types)}')
-        return v
-    
-    @validator('priority')
-    def validate_priority(cls, v):
-        valid_priorities = ["baixa", "media", "alta", "critica"]
-        if v not in valid_priorities:
-            raise ValueError(f'Prioridade deve ser uma das seguintes: {", ".join(valid_priorities)}')
-        return v
-    
-    @validator('status')
-    def validate_status(cls, v):
-        valid_statuses = ["pendente", "em_analise", "aprovado", "em_desenvolvimento", "concluido", "cancelado"]
-        if v not in valid_statuses:
-            raise ValueError(f'Status deve ser um dos seguintes: {", ".join(valid_statuses)}')
-        return v
-    
-    @validator('complexity')
-    def validate_complexity(cls, v):
-        if v is not None:
-            valid_complexities = ["baixa", "media", "alta"]
-            if v not in valid_complexities:
-                raise ValueError(f'Complexidade deve ser uma das seguintes: {", ".join(valid_complexities)}')
-        return v
+    @validator('estimated_hours', 'actual_hours', pre=True)
+    def validate_hours(cls, v):
+        return _validate_hours(v)
 
 class RequirementCreate(RequirementBase):
     project_id: str
@@ -51,48 +42,20 @@ class RequirementCreate(RequirementBase):
 class RequirementUpdate(BaseModel):
     title: Optional[str] = None
     description: Optional[str] = None
-    type: Optional[str] = None
-    priority: Optional[str] = None
-    status: Optional[str] = None
-    complexity: Optional[str] = None
-    estimated_hours: Optional[str] = None
-    actual_hours: Optional[str] = None
+    type: Optional[RequirementType] = None
+    priority: Optional[Priority] = None
+    status: Optional[RequirementStatus] = None
+    complexity: Optional[Complexity] = None
+    estimated_hours: Optional[float] = None
+    actual_hours: Optional[float] = None
     due_date: Optional[datetime] = None
     completion_date: Optional[datetime] = None
     assigned_to: Optional[str] = None
     dynamic_fields: Optional[Dict[str, Any]] = None
     
-    @validator('type')
-    def validate_type(cls, v):
-        if v is not None:
-            valid_types = ["funcional", "nao_funcional", "regra_negocio"]
-            if v not in valid_types:
-                raise ValueError(f'Tipo deve ser um dos seguintes: {", ".join(valid_types)}')
-        return v
-    
-    @validator('priority')
-    def validate_priority(cls, v):
-        if v is not None:
-            valid_priorities = ["baixa", "media", "alta", "critica"]
-            if v not in valid_priorities:
-                raise ValueError(f'Prioridade deve ser uma das seguintes: {", ".join(valid_priorities)}')
-        return v
-    
-    @validator('status')
-    def validate_status(cls, v):
-        if v is not None:
-            valid_statuses = ["pendente", "em_analise", "aprovado", "em_desenvolvimento", "concluido", "cancelado"]
-            if v not in valid_statuses:
-                raise ValueError(f'Status deve ser um dos seguintes: {", ".join(valid_statuses)}')
-        return v
-    
-    @validator('complexity')
-    def validate_complexity(cls, v):
-        if v is not None:
-            valid_complexities = ["baixa", "media", "alta"]
-            if v not in valid_complexities:
-                raise ValueError(f'Complexidade deve ser uma das seguintes: {", ".join(valid_complexities)}')
-        return v
+    @validator('estimated_hours', 'actual_hours', pre=True)
+    def validate_hours(cls, v):
+        return _validate_hours(v)
 
 class RequirementResponse(RequirementBase):
     id: str
@@ -108,16 +71,24 @@ class RequirementResponse(RequirementBase):
     created_at: datetime
     updated_at: datetime
     
+    @validator('project', pre=True)
+    def serialize_project(cls, v):
+        return v.to_dict_reference() if hasattr(v, "to_dict_reference") else v
+    
+    @validator('assigned_user', 'created_by_user', pre=True)
+    def serialize_user(cls, v):
+        return v.to_dict_safe() if hasattr(v, "to_dict_safe") else v
+    
     class Config:
         from_attributes = True
 
 class RequirementResponseSummary(BaseModel):
     id: str
     title: str
-    type: str
-    priority: str
-    status: str
-    complexity: Optional[str] = None
+    type: RequirementType
+    priority: Priority
+    status: RequirementStatus
+    complexity: Optional[Complexity] = None
     due_date: Optional[datetime] = None
     is_overdue: bool
     progress_percentage: float
@@ -128,11 +99,43 @@ class RequirementResponseSummary(BaseModel):
 
 class RequirementFilter(BaseModel):
     project_id: Optional[str] = None
-    type: Optional[str] = None
-    priority: Optional[str] = None
-    status: Optional[str] = None
-    complexity: Optional[str] = None
+    type: Optional[RequirementType] = None
+    priority: Optional[Priority] = None
+    status: Optional[RequirementStatus] = None
+    complexity: Optional[Complexity] = None
     assigned_to: Optional[str] = None
     created_by: Optional[str] = None
     is_overdue: Optional[bool] = None
     search: Optional[str] = None
+    min_progress: Optional[float] = None
+    max_progress: Optional[float] = None
+    # Filtros df.<campo>[.<operador>]: {campo: [(operador, valor)]}
+    dynamic_fields: Dict[str, List[Tuple[str, str]]] = {}
+
+class RequirementBulkRequest(BaseModel):
+    # create: insere todos; update: altera parcialmente (id obrigatorio);
+    # upsert: altera os ids existentes e insere os demais
+    mode: Literal["create", "upsert", "update"] = "create"
+    # atomic: qualquer item invalido cancela a gravacao de todos
+    atomic: bool = False
+    items: List[Dict[str, Any]]
+    
+    @validator('items')
+    def validate_items(cls, v):
+        if not v:
+            raise ValueError('Informe ao menos um item')
+        if len(v) > settings.REQUIREMENT_BULK_MAX_ITEMS:
+            raise ValueError(f'Maximo de {settings.REQUIREMENT_BULK_MAX_ITEMS} itens por requisicao')
+        return v
+
+class RequirementBulkItemResult(BaseModel):
+    index: int
+    id: Optional[str] = None
+    status: Literal["criado", "atualizado", "erro", "ignorado"]
+    error: Optional[str] = None
+
+class RequirementBulkResponse(BaseModel):
+    created: int
+    updated: int
+    failed: int
+    results: List[RequirementBulkItemResult]
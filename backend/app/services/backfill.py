@@ -0,0 +1,257 @@
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+import logging
+import time
+
+from sqlalchemy import bindparam, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.backfill import DynamicFieldBackfill
+from app.models.dynamic_field import DynamicFieldDefinition
+from app.models.enums import BackfillOperation, BackfillStatus
+from app.models.requirement import Requirement
+from app.services.job_leases import claimable, register_job_type, renew_lease
+
+# Reescrita online dos documentos dynamic_fields apos mudancas nas definicoes.
+# Cada lote le as proximas linhas por id (keyset), reescreve so as que mudam e
+# grava o cursor e os contadores na mesma transacao: um job interrompido retoma
+# do ultimo lote confirmado. As transformacoes sao idempotentes, entao reprocessar
+# um lote e inofensivo. Linhas criadas durante o job com id abaixo do cursor nao
+# sao revisitadas; elas ja passam pela validacao das definicoes novas. Cada lote
+# renova o lease do job (job_leases): um worker que morre no meio deixa o job
+# em execucao ate o lease vencer, e entao ele pode ser retomado.
+
+logger = logging.getLogger(__name__)
+
+# Status a partir dos quais um job pode (re)comecar
+STARTABLE_STATUSES = (BackfillStatus.PENDENTE, BackfillStatus.PAUSADO, BackfillStatus.FALHOU)
+
+class BackfillStateError(ValueError):
+    """Transicao de status invalida para o job de backfill"""
+
+def transform_document(
+    operation: BackfillOperation,
+    params: Dict[str, Any],
+    document: Optional[Dict[str, Any]]
+) -> Optional[Dict[str, Any]]:
+    """Aplica a operacao ao documento; retorna o novo documento ou None se nada muda"""
+    document = document or {}
+
+    if operation == BackfillOperation.RENOMEAR_CAMPO:
+        old_name, new_name = params["old_name"], params["new_name"]
+        if old_name not in document:
+            return None
+        updated = dict(document)
+        value = updated.pop(old_name)
+        # Um valor ja gravado com o nome novo tem precedencia
+        updated.setdefault(new_name, value)
+        return updated
+
+    if operation == BackfillOperation.REMOVER_OPCOES:
+        field_name, removed = params["field_name"], set(params["options"])
+        value = document.get(field_name)
+        updated = dict(document)
+        if isinstance(value, list):
+            kept = [item for item in value if item not in removed]
+            if len(kept) == len(value):
+                return None
+            updated[field_name] = kept
+        elif value in removed:
+            del updated[field_name]
+        else:
+            return None
+        return updated
+
+    if operation == BackfillOperation.PREENCHER_PADRAO:
+        field_name = params["field_name"]
+        if document.get(field_name) is not None:
+            return None
+        updated = dict(document)
+        updated[field_name] = params["value"]
+        return updated
+
+    raise BackfillStateError(f"Operacao de backfill desconhecida: {operation}")
+
+def plan_backfills(
+    definition: DynamicFieldDefinition,
+    previous: Optional[Dict[str, Any]] = None
+) -> List[Dict[str, Any]]:
+    """Operacoes necessarias para alinhar os documentos a definicao (previous = estado anterior)
+
+    Retorna [{"operation": ..., "params": ...}] na ordem de execucao.
+    """
+    if definition.applies_to != "requirement":
+        return []
+
+    operations = []
+    previous = previous or {}
+
+    old_name = previous.get("field_name")
+    if old_name and old_name != definition.field_name:
+        operations.append({
+            "operation": BackfillOperation.RENOMEAR_CAMPO,
+            "params": {"old_name": old_name, "new_name": definition.field_name}
+        })
+
+    removed = [
+        option for option in previous.get("options") or []
+        if option not in definition.get_options_list()
+    ]
+    if removed and definition.field_type == "select":
+        operations.append({
+            "operation": BackfillOperation.REMOVER_OPCOES,
+            "params": {"field_name": definition.field_name, "options": removed}
+        })
+
+    default = (definition.validation_rules or {}).get("default")
+    if definition.is_required and default is not None and not previous.get("is_required"):
+        operations.append({
+            "operation": BackfillOperation.PREENCHER_PADRAO,
+            "params": {"field_name": definition.field_name, "value": default}
+        })
+
+    return operations
+
+def create_backfill_jobs(
+    db: Session,
+    definition: DynamicFieldDefinition,
+    previous: Optional[Dict[str, Any]] = None,
+    created_by: Optional[str] = None
+) -> List[DynamicFieldBackfill]:
+    """Registra os jobs da alteracao na sessao (confirmados junto com a definicao)"""
+    jobs = [
+        DynamicFieldBackfill(
+            field_id=definition.id,
+            operation=planned["operation"],
+            params=planned["params"],
+            status=BackfillStatus.PENDENTE,
+            created_by=created_by
+        )
+        for planned in plan_backfills(definition, previous)
+    ]
+    db.add_all(jobs)
+    return jobs
+
+def pause_backfill(db: Session, job: DynamicFieldBackfill) -> None:
+    """Sinaliza a pausa; o executor para ao fim do lote corrente"""
+    if job.status not in (BackfillStatus.PENDENTE, BackfillStatus.EXECUTANDO):
+        raise BackfillStateError(f"Job com status {job.status} nao pode ser pausado")
+    job.status = BackfillStatus.PAUSADO
+
+def _claim(db: Session, job_id: str) -> Optional[datetime]:
+    """Marca o job como em execucao se ninguem o iniciou ou se o lease venceu (UPDATE condicional)
+
+    Retorna o lease gravado (updated_at) ou None se outro worker esta com o job.
+    """
+    table = DynamicFieldBackfill.__table__
+    lease = datetime.utcnow()
+    result = db.execute(
+        update(table)
+        .where(table.c.id == job_id, claimable(table, STARTABLE_STATUSES, BackfillStatus.EXECUTANDO))
+        .values(status=BackfillStatus.EXECUTANDO, error=None, finished_at=None, updated_at=lease)
+    )
+    db.commit()
+    return lease if result.rowcount == 1 else None
+
+def _run_batch(db: Session, job: DynamicFieldBackfill, batch_size: int, lock_rows: bool) -> int:
+    """Processa um lote e avanca o cursor; retorna o numero de linhas lidas"""
+    query = db.query(Requirement.id, Requirement.dynamic_fields)
+    if job.last_id:
+        query = query.filter(Requirement.id > job.last_id)
+    query = query.order_by(Requirement.id).limit(batch_size)
+    if lock_rows:
+        # Impede que uma escrita concorrente sobrescreva o documento entre leitura e UPDATE
+        query = query.with_for_update()
+    rows = query.all()
+    if not rows:
+        return 0
+
+    changes = []
+    for row_id, document in rows:
+        updated = transform_document(job.operation, job.params, document)
+        if updated is not None:
+            changes.append({"row_id": row_id, "document": updated})
+
+    if changes:
+        table = Requirement.__table__
+        db.execute(
+            update(table)
+            .where(table.c.id == bindparam("row_id"))
+            .values(dynamic_fields=bindparam("document")),
+            changes
+        )
+
+    job.last_id = rows[-1].id
+    job.processed_rows += len(rows)
+    job.updated_rows += len(changes)
+    renew_lease(job)
+    db.commit()
+    return len(rows)
+
+def run_backfill(
+    job_id: str,
+    session_factory: Callable[[], Session] = SessionLocal,
+    batch_size: Optional[int] = None,
+    throttle_seconds: Optional[float] = None
+) -> None:
+    """Executa o job em lotes ate concluir, ser pausado ou falhar (executado em background)"""
+    batch_size = batch_size or settings.BACKFILL_BATCH_SIZE
+    throttle_seconds = settings.BACKFILL_THROTTLE_SECONDS if throttle_seconds is None else throttle_seconds
+
+    db = session_factory()
+    try:
+        lease = _claim(db, job_id)
+        if lease is None:
+            logger.info(f"Backfill {job_id} ja em execucao ou finalizado")
+            return
+
+        job = db.get(DynamicFieldBackfill, job_id)
+        if not job.started_at:
+            job.started_at = datetime.utcnow()
+        if job.total_rows is None:
+            job.total_rows = db.query(Requirement.id).count()
+        lease = renew_lease(job)
+        db.commit()
+
+        lock_rows = db.get_bind().dialect.name == "postgresql"
+        logger.info(f"Backfill {job_id} iniciado: {job.operation} {job.params}")
+
+        while True:
+            db.refresh(job)
+            if job.status != BackfillStatus.EXECUTANDO:
+                logger.info(f"Backfill {job_id} interrompido com status {job.status}")
+                return
+            if job.updated_at != lease:
+                logger.info(f"Backfill {job_id} assumido por outro worker (lease vencido)")
+                return
+
+            if _run_batch(db, job, batch_size, lock_rows) == 0:
+                job.status = BackfillStatus.CONCLUIDO
+                job.finished_at = datetime.utcnow()
+                db.commit()
+                logger.info(
+                    f"Backfill {job_id} concluido: {job.processed_rows} linhas lidas, "
+                    f"{job.updated_rows} atualizadas"
+                )
+                return
+
+            lease = job.updated_at
+
+            if throttle_seconds:
+                time.sleep(throttle_seconds)
+
+    except Exception as e:
+        logger.error(f"Erro no backfill {job_id}: {e}")
+        db.rollback()
+        job = db.get(DynamicFieldBackfill, job_id)
+        if job:
+            job.status = BackfillStatus.FALHOU
+            job.error = str(e)
+            job.finished_at = datetime.utcnow()
+            db.commit()
+    finally:
+        db.close()
+
+register_job_type(DynamicFieldBackfill, BackfillStatus.EXECUTANDO, BackfillStatus.PENDENTE, run_backfill)
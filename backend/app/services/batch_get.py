@@ -0,0 +1,48 @@
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.database import canonical_id
+
+# Busca em lote por ids (?ids=a,b,c nas listagens): uma consulta IN por tabela,
+# resposta na ordem dos ids pedidos e os ids nao encontrados no cabecalho abaixo
+MISSING_IDS_HEADER = "X-Missing-Ids"
+
+class BatchIdsError(ValueError):
+    """Parametro ids vazio ou com mais ids que o permitido"""
+
+def parse_ids(value: Optional[str]) -> Optional[List[str]]:
+    """Ids pedidos, sem repeticoes e na ordem informada (None sem o parametro)"""
+    if value is None:
+        return None
+
+    ids = list(dict.fromkeys(item.strip() for item in value.split(",") if item.strip()))
+    if not ids:
+        raise BatchIdsError("ids deve listar ao menos um id")
+    if len(ids) > settings.BATCH_GET_MAX_IDS:
+        raise BatchIdsError(f"Maximo de {settings.BATCH_GET_MAX_IDS} ids por requisicao")
+    return ids
+
+def _canonical(value: str) -> str:
+    # Ids voltam do banco no formato canonico do UUID; ids malformados nunca casam
+    try:
+        return canonical_id(value)
+    except ValueError:
+        return value
+
+def order_by_ids(items: List[Any], ids: List[str]) -> Tuple[List[Any], List[str]]:
+    """Reordena os itens na ordem dos ids pedidos e retorna (itens, ids nao encontrados)"""
+    by_id = {}
+    for item in items:
+        by_id[item["id"] if isinstance(item, dict) else item.id] = item
+
+    ordered, missing = [], []
+    for requested in ids:
+        item = by_id.get(_canonical(requested))
+        if item is None:
+            missing.append(requested)
+        else:
+            ordered.append(item)
+    return ordered, missing
+
+def missing_ids_headers(missing: List[str]) -> Dict[str, str]:
+    return {MISSING_IDS_HEADER: ",".join(missing)} if missing else {}
@@ -0,0 +1,275 @@
+import asyncio
+import logging
+import select
+import threading
+import time
+import uuid
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Deque, Iterable, List, Optional, Set, Tuple
+
+import orjson
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal, canonical_id, engine
+
+# Feed de mudancas de requisitos e projetos (SSE em /events). As escritas
+# registram eventos na sessao (record_change) e eles so saem depois do commit:
+#
+#   memory     after_commit entrega aos clientes conectados a este processo
+#   postgres   before_commit envia pg_notify na propria transacao (o PostgreSQL
+#              so entrega no commit) e um listener por processo repassa aos
+#              seus clientes; funciona com varios workers/instancias
+#
+# Os eventos levam so ids (entidade, acao, id, projeto): o cliente busca as
+# linhas alteradas com ?ids= em vez de recarregar as paginas da listagem.
+
+logger = logging.getLogger(__name__)
+
+NOTIFY_CHANNEL = "change_feed"
+
+# Evento enviado quando o cliente perdeu eventos (fila cheia, Last-Event-ID fora
+# do historico, queda do listener): deve recarregar as listagens que exibe
+RESET = "reset"
+
+_PENDING_KEY = "change_events"
+
+@dataclass(slots=True, frozen=True)
+class ChangeEvent:
+    entity: str
+    action: str
+    id: Optional[str]
+    project_id: Optional[str]
+    at: str
+
+    def to_json(self) -> bytes:
+        return orjson.dumps({
+            "entity": self.entity, "action": self.action, "id": self.id,
+            "project_id": self.project_id, "at": self.at
+        })
+
+    @classmethod
+    def from_json(cls, payload: str) -> "ChangeEvent":
+        return cls(**orjson.loads(payload))
+
+def _canonical(value: Any) -> Optional[str]:
+    # Ids no formato em que voltam do banco (os filtros do feed comparam strings)
+    if value is None:
+        return None
+    try:
+        return canonical_id(value)
+    except ValueError:
+        return str(value)
+
+def record_change(
+    db: Session,
+    entity: str,
+    action: str,
+    entity_id: Optional[str] = None,
+    project_id: Optional[str] = None
+) -> None:
+    """Registra um evento na transacao da sessao (publicado apenas se ela for confirmada)"""
+    if not db.in_transaction():
+        # Sem transacao o rollback nao dispara eventos e o registro vazaria para o proximo commit
+        db.begin()
+    db.info.setdefault(_PENDING_KEY, []).append(ChangeEvent(
+        entity=entity,
+        action=action,
+        id=_canonical(entity_id),
+        project_id=_canonical(project_id),
+        at=datetime.utcnow().isoformat()
+    ))
+
+def _uses_notify(session: Session) -> bool:
+    return settings.CHANGE_FEED_BROKER == "postgres" and session.get_bind().dialect.name == "postgresql"
+
+@event.listens_for(SessionLocal, "before_commit")
+def _notify_before_commit(session, **kw):
+    events = session.info.get(_PENDING_KEY)
+    if events and _uses_notify(session):
+        # Um pg_notify por evento em uma unica instrucao
+        session.execute(
+            text("SELECT pg_notify(:channel, payload) FROM unnest(CAST(:payloads AS text[])) AS payload"),
+            {"channel": NOTIFY_CHANNEL, "payloads": [change.to_json().decode() for change in events]}
+        )
+
+@event.listens_for(SessionLocal, "after_commit")
+def _publish_after_commit(session):
+    events = session.info.pop(_PENDING_KEY, None)
+    if events and not _uses_notify(session):
+        broker.publish(events)
+
+@event.listens_for(SessionLocal, "after_soft_rollback")
+def _discard_after_rollback(session, previous_transaction):
+    session.info.pop(_PENDING_KEY, None)
+
+class Subscription:
+    """Fila de um cliente conectado, alimentada a partir de qualquer thread"""
+    __slots__ = ("loop", "queue", "entities", "project_ids")
+
+    def __init__(self, entities: Set[str], project_ids: Optional[Set[str]]):
+        self.loop = asyncio.get_running_loop()
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=settings.CHANGE_FEED_QUEUE_SIZE)
+        self.entities = entities
+        self.project_ids = project_ids
+
+    def wants(self, change: ChangeEvent) -> bool:
+        return change.entity in self.entities and (
+            self.project_ids is None or change.project_id in self.project_ids
+        )
+
+    def deliver(self, numbered: List[Tuple[str, Any]]) -> None:
+        """Enfileira os eventos do filtro (roda no loop do cliente)"""
+        for event_id, change in numbered:
+            if change is not RESET and not self.wants(change):
+                continue
+            try:
+                self.queue.put_nowait((event_id, change))
+            except asyncio.QueueFull:
+                # Cliente lento: descarta o atrasado e pede recarga completa
+                while not self.queue.empty():
+                    self.queue.get_nowait()
+                self.queue.put_nowait((None, RESET))
+
+class ChangeBroker:
+    """Pub/sub em memoria com historico curto para retomada por Last-Event-ID
+
+    Os ids dos eventos sao "<epoca>-<sequencia>"; a epoca muda a cada processo,
+    entao um Last-Event-ID de outro processo (ou de antes de um restart) vira reset.
+    """
+
+    def __init__(self, replay_size: int):
+        self.epoch = uuid.uuid4().hex[:8]
+        self._lock = threading.Lock()
+        self._sequence = 0
+        self._recent: Deque[Tuple[int, ChangeEvent]] = deque(maxlen=replay_size)
+        self._subscribers: Set[Subscription] = set()
+
+    def publish(self, events: Iterable[Any]) -> None:
+        """Numera e distribui os eventos (seguro a partir de qualquer thread)"""
+        numbered = []
+        with self._lock:
+            for change in events:
+                if change is RESET:
+                    # Eventos perdidos: o historico deixa de valer para retomadas
+                    self._recent.clear()
+                    numbered.append((None, RESET))
+                    continue
+                self._sequence += 1
+                self._recent.append((self._sequence, change))
+                numbered.append((f"{self.epoch}-{self._sequence}", change))
+            subscribers = list(self._subscribers)
+
+        for subscription in subscribers:
+            subscription.loop.call_soon_threadsafe(subscription.deliver, numbered)
+
+    def subscribe(
+        self,
+        entities: Set[str],
+        project_ids: Optional[Set[str]] = None,
+        last_event_id: Optional[str] = None
+    ) -> Subscription:
+        """Registra um cliente (no loop do evento) e enfileira o que ele perdeu desde last_event_id"""
+        subscription = Subscription(entities, project_ids)
+        with self._lock:
+            self._subscribers.add(subscription)
+            if last_event_id is None:
+                return subscription
+            missed = self._missed_since(last_event_id)
+
+        subscription.deliver(missed if missed is not None else [(None, RESET)])
+        return subscription
+
+    def _missed_since(self, last_event_id: str) -> Optional[List[Tuple[str, ChangeEvent]]]:
+        epoch, _, sequence = last_event_id.partition("-")
+        if epoch != self.epoch or not sequence.isdigit():
+            return None
+        last = int(sequence)
+        oldest = self._recent[0][0] if self._recent else self._sequence + 1
+        if last > self._sequence or last < oldest - 1:
+            return None
+        return [(f"{self.epoch}-{number}", change) for number, change in self._recent if number > last]
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+broker = ChangeBroker(settings.CHANGE_FEED_REPLAY_SIZE)
+
+class PostgresChangeListener:
+    """LISTEN no canal do feed em uma thread com conexao dedicada (fora do pool)"""
+
+    def __init__(self, change_broker: ChangeBroker):
+        self.broker = change_broker
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="change-feed-listener", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join(timeout=5)
+
+    def _connect(self):
+        connection = engine.raw_connection()
+        # A conexao fica com a thread ate o fim do processo: nao volta ao pool
+        connection.detach()
+        dbapi_connection = connection.dbapi_connection
+        dbapi_connection.autocommit = True
+        with dbapi_connection.cursor() as cursor:
+            cursor.execute(f"LISTEN {NOTIFY_CHANNEL}")
+        return dbapi_connection
+
+    def _run(self) -> None:
+        connected_before = False
+        while not self._stop.is_set():
+            connection = None
+            try:
+                connection = self._connect()
+                if connected_before:
+                    # Notificacoes enviadas enquanto estava desconectado se perderam
+                    self.broker.publish([RESET])
+                connected_before = True
+                while not self._stop.is_set():
+                    if select.select([connection], [], [], 1.0) == ([], [], []):
+                        continue
+                    connection.poll()
+                    if connection.notifies:
+                        notifies = connection.notifies[:]
+                        del connection.notifies[:]
+                        self.broker.publish(ChangeEvent.from_json(notify.payload) for notify in notifies)
+            except Exception as e:
+                logger.error(f"Erro no listener do feed de mudancas: {e}")
+                time.sleep(1)
+            finally:
+                if connection is not None:
+                    try:
+                        connection.close()
+                    except Exception:
+                        pass
+
+def start_change_feed() -> Optional[PostgresChangeListener]:
+    """Inicia o listener do broker compartilhado, se configurado (startup da aplicacao)"""
+    if settings.CHANGE_FEED_BROKER != "postgres":
+        return None
+    if engine.dialect.name != "postgresql":
+        logger.warning("CHANGE_FEED_BROKER=postgres requer PostgreSQL; feed de mudancas apenas em memoria")
+        return None
+
+    listener = PostgresChangeListener(broker)
+    listener.start()
+    logger.info("Feed de mudancas compartilhado via LISTEN/NOTIFY")
+    return listener
+
+def format_sse(event_id: Optional[str], change: Any) -> bytes:
+    """Mensagem no formato text/event-stream"""
+    if change is RESET:
+        return b"event: reset\ndata: {}\n\n"
+    return (
+        f"id: {event_id}\nevent: {change.entity}.{change.action}\n".encode()
+        + b"data: " + change.to_json() + b"\n\n"
+    )
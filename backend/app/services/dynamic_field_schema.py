@@ -0,0 +1,129 @@
+from datetime import date
+from typing import Any, Dict, List, Literal, Optional, Tuple, Type, Union
+
+from pydantic import BaseModel, ConfigDict, Field, ValidationError, create_model
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.models.dynamic_field import DynamicFieldDefinition
+from app.models.table_version import TableVersion
+
+# Registro dos validadores de campos dinamicos: as definicoes ativas de cada
+# applies_to sao compiladas em um unico modelo Pydantic, reutilizado enquanto o
+# carimbo de versao nao mudar. O carimbo e o contador de escritas de
+# dynamic_field_definitions em table_versions (incrementado por trigger), lido a
+# cada validacao: alteracoes feitas por qualquer worker ou instancia invalidam o
+# cache de todos os processos.
+
+_compiled: Dict[str, Tuple[int, Type[BaseModel]]] = {}
+
+class DynamicFieldValidationError(ValueError):
+    """Valores de campos dinamicos incompativeis com as definicoes ativas"""
+
+    def __init__(self, errors: List[str]):
+        super().__init__("; ".join(errors))
+        self.errors = errors
+
+class DynamicFieldDefinitionError(ValueError):
+    """Definicao cujas opcoes ou validation_rules nao geram um validador (ex.: regex invalida)"""
+
+def _definitions_version(db: Session) -> int:
+    """Carimbo das definicoes, lido uma vez por transacao (escritas em lote validam muitas linhas)"""
+    cached = db.info.get("dynamic_field_version")
+    if cached and db.in_transaction() and cached[0] is db.get_transaction():
+        return cached[1]
+
+    version = db.execute(
+        select(func.coalesce(func.sum(TableVersion.version), 0))
+        .where(TableVersion.table_name == DynamicFieldDefinition.__tablename__)
+    ).scalar()
+    db.info["dynamic_field_version"] = (db.get_transaction(), version)
+    return version
+
+def _field_spec(definition: DynamicFieldDefinition) -> Tuple[Any, Dict[str, Any]]:
+    """Tipo e restricoes (validation_rules) de um campo conforme a definicao"""
+    rules = definition.validation_rules or {}
+    field_type = definition.field_type
+
+    if field_type == "number":
+        return Union[int, float], {"ge": rules.get("min"), "le": rules.get("max")}
+
+    if field_type == "boolean":
+        return bool, {}
+
+    if field_type == "date":
+        return date, {}
+
+    if field_type == "select":
+        options = definition.get_options_list()
+        if options:
+            option = Literal[tuple(options)]
+            # Selects aceitam um valor ou uma lista de valores (multipla escolha)
+            return Union[option, List[option]], {}
+        return str, {}
+
+    # text e textarea
+    return str, {
+        "min_length": rules.get("min_length"),
+        "max_length": rules.get("max_length"),
+        "pattern": rules.get("pattern"),
+    }
+
+def _compile(definitions: List[DynamicFieldDefinition], applies_to: str) -> Type[BaseModel]:
+    fields = {}
+    for index, definition in enumerate(definitions):
+        annotation, constraints = _field_spec(definition)
+        # Atributo interno com alias = nome do campo (evita colisao com atributos do BaseModel)
+        if definition.is_required:
+            fields[f"field_{index}"] = (annotation, Field(..., alias=definition.field_name, **constraints))
+        else:
+            fields[f"field_{index}"] = (Optional[annotation], Field(None, alias=definition.field_name, **constraints))
+
+    # Chaves sem definicao ativa sao mantidas como estao
+    return create_model(
+        f"DynamicFields_{applies_to}",
+        __config__=ConfigDict(extra="allow"),
+        **fields
+    )
+
+def check_dynamic_field_definition(definition: DynamicFieldDefinition) -> None:
+    """Compila o validador da definicao: regras invalidas falham ao salvar o campo, nao nas escritas de requisitos"""
+    try:
+        _compile([definition], definition.applies_to or "requirement")
+    except Exception as e:
+        lines = [line.strip() for line in str(e).splitlines() if line.strip()]
+        detail = next((line for line in reversed(lines) if not line.startswith("For further information")), "")
+        raise DynamicFieldDefinitionError(f"validation_rules invalidas para {definition.field_name}: {detail}") from e
+
+def get_dynamic_field_validator(db: Session, applies_to: str = "requirement") -> Type[BaseModel]:
+    """Retorna o modelo compilado das definicoes ativas, recompilando quando a tabela de definicoes muda"""
+    version = _definitions_version(db)
+    cached = _compiled.get(applies_to)
+    if cached and cached[0] == version:
+        return cached[1]
+
+    definitions = db.query(DynamicFieldDefinition).filter(
+        DynamicFieldDefinition.applies_to == applies_to,
+        DynamicFieldDefinition.is_active == True
+    ).all()
+
+    model = _compile(definitions, applies_to)
+    _compiled[applies_to] = (version, model)
+    return model
+
+def validate_dynamic_fields(
+    db: Session,
+    values: Optional[Dict[str, Any]],
+    applies_to: str = "requirement"
+) -> Dict[str, Any]:
+    """Valida e normaliza os campos dinamicos em uma passada (datas como AAAA-MM-DD)"""
+    model = get_dynamic_field_validator(db, applies_to)
+    try:
+        validated = model.model_validate(values or {})
+    except ValidationError as e:
+        # Uma mensagem por campo (selects geram um erro por alternativa da uniao)
+        messages = {}
+        for error in e.errors():
+            messages.setdefault(str(error["loc"][0]), error["msg"])
+        raise DynamicFieldValidationError([f"{field}: {message}" for field, message in messages.items()])
+    return validated.model_dump(mode="json", by_alias=True, exclude_unset=True)
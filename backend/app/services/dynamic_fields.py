@@ -0,0 +1,158 @@
+from datetime import date
+from decimal import Decimal, InvalidOperation
+from typing import Any, Dict, List, Mapping, Tuple
+import math
+import operator
+
+from sqlalchemy import or_, type_coerce
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Session
+
+from app.models.dynamic_field import DynamicFieldDefinition
+from app.models.requirement import Requirement
+from app.services.field_promotion import promoted_column
+
+# Prefixo dos parametros de filtro por campo dinamico (?df.fonte_dados=Sistema ERP)
+DYNAMIC_FIELD_FILTER_PREFIX = "df."
+
+# Operadores de intervalo (?df.data_entrega_estimada.gte=2026-01-01), so em campos promovidos
+RANGE_OPERATORS = {
+    "gt": operator.gt,
+    "gte": operator.ge,
+    "lt": operator.lt,
+    "lte": operator.le,
+}
+RANGE_FIELD_TYPES = ("number", "date")
+
+_TRUE_VALUES = {"true", "1", "sim"}
+_FALSE_VALUES = {"false", "0", "nao"}
+# Inteiros maiores que BIGINT vao como float (o driver do SQLite nao os aceita)
+_MAX_INTEGER = 2 ** 63
+
+class DynamicFieldFilterError(ValueError):
+    """Filtro por campo dinamico inexistente, inativo ou com valor incompativel com o tipo"""
+
+def parse_dynamic_field_filters(params: Mapping) -> Dict[str, List[Tuple[str, str]]]:
+    """Extrai os filtros df.<campo>[.<operador>] da requisicao como {campo: [(operador, valor)]}"""
+    filters: Dict[str, List[Tuple[str, str]]] = {}
+    for key, value in params.multi_items():
+        if not key.startswith(DYNAMIC_FIELD_FILTER_PREFIX):
+            continue
+        field_name, _, op = key[len(DYNAMIC_FIELD_FILTER_PREFIX):].partition(".")
+        if op and op not in RANGE_OPERATORS:
+            raise DynamicFieldFilterError(f"Operador invalido em {key}. Use: {', '.join(RANGE_OPERATORS)}")
+        filters.setdefault(field_name, []).append((op or "eq", value))
+    return filters
+
+def coerce_filter_value(definition: DynamicFieldDefinition, raw: str) -> Any:
+    """Converte o valor do filtro para o tipo JSON em que o campo e armazenado"""
+    field_type = definition.field_type
+
+    if field_type == "number":
+        try:
+            number = Decimal(raw.replace(",", "."))
+        except InvalidOperation:
+            raise DynamicFieldFilterError(f"Valor numerico invalido para {definition.field_name}: {raw}")
+        # Infinity/NaN (ou alem do double): int() estoura e nenhum documento JSON guarda esses valores
+        if not number.is_finite() or not math.isfinite(float(number)):
+            raise DynamicFieldFilterError(f"Valor numerico invalido para {definition.field_name}: {raw}")
+        if number == number.to_integral_value() and abs(number) < _MAX_INTEGER:
+            return int(number)
+        return float(number)
+
+    if field_type == "boolean":
+        lowered = raw.strip().lower()
+        if lowered in _TRUE_VALUES:
+            return True
+        if lowered in _FALSE_VALUES:
+            return False
+        raise DynamicFieldFilterError(f"Valor booleano invalido para {definition.field_name}: {raw}")
+
+    if field_type == "date":
+        try:
+            return date.fromisoformat(raw).isoformat()
+        except ValueError:
+            raise DynamicFieldFilterError(f"Data invalida para {definition.field_name} (use AAAA-MM-DD): {raw}")
+
+    if field_type == "select":
+        options = definition.get_options_list()
+        if options and raw not in options:
+            raise DynamicFieldFilterError(
+                f"Valor invalido para {definition.field_name}. Opcoes: {', '.join(options)}"
+            )
+
+    return raw
+
+def _promoted_clause(column, definition: DynamicFieldDefinition, op: str, value: Any):
+    if definition.field_type == "date":
+        value = date.fromisoformat(value)
+    if op == "eq":
+        return column == value
+    return RANGE_OPERATORS[op](column, value)
+
+def _value_clause(column, field_name: str, definition: DynamicFieldDefinition, value: Any, dialect: str):
+    if dialect == "postgresql":
+        # Containment (@>) e atendido pelo indice GIN jsonb_path_ops
+        document = type_coerce(column, JSONB)
+        clause = document.contains({field_name: value})
+        if definition.field_type == "select":
+            # Selects multiplos guardam lista: ["ROI", "Custo"] @> ["ROI"]
+            clause = or_(clause, document.contains({field_name: [value]}))
+        return clause
+
+    # Outros bancos: comparacao do valor extraido (sem suporte a listas)
+    element = column[field_name]
+    if isinstance(value, bool):
+        return element.as_boolean() == value
+    if isinstance(value, (int, float)):
+        return element.as_float() == value
+    return element.as_string() == value
+
+def build_dynamic_field_filters(
+    db: Session,
+    filters: Dict[str, List[Tuple[str, str]]],
+    applies_to: str = "requirement"
+) -> list:
+    """Valida os filtros contra as definicoes ativas e gera as condicoes SQL (AND entre todas)
+
+    Campos promovidos a coluna gerada sao filtrados pela coluna (indice B-tree, aceita
+    intervalos); os demais por containment no JSONB.
+    """
+    if not filters:
+        return []
+
+    definitions = {
+        definition.field_name: definition
+        for definition in db.query(DynamicFieldDefinition).filter(
+            DynamicFieldDefinition.field_name.in_(list(filters)),
+            DynamicFieldDefinition.applies_to == applies_to,
+            DynamicFieldDefinition.is_active == True
+        )
+    }
+
+    unknown = [field_name for field_name in filters if field_name not in definitions]
+    if unknown:
+        raise DynamicFieldFilterError(f"Campo dinamico invalido: {', '.join(unknown)}")
+
+    dialect = db.get_bind().dialect.name
+    clauses = []
+    for field_name, raw_values in filters.items():
+        definition = definitions[field_name]
+        column = promoted_column(definition)
+        for op, raw in raw_values:
+            if op != "eq" and definition.field_type not in RANGE_FIELD_TYPES:
+                raise DynamicFieldFilterError(f"Filtro de intervalo nao se aplica ao campo {field_name}")
+            if op != "eq" and column is None:
+                raise DynamicFieldFilterError(f"Filtro de intervalo requer o campo {field_name} promovido")
+
+            value = coerce_filter_value(definition, raw)
+            if column is not None:
+                clause = _promoted_clause(column, definition, op, value)
+                if definition.field_type == "select":
+                    # A coluna so tem selects de valor unico; listas seguem no GIN (BitmapOr dos indices)
+                    document = type_coerce(Requirement.dynamic_fields, JSONB)
+                    clause = or_(clause, document.contains({field_name: [value]}))
+                clauses.append(clause)
+            else:
+                clauses.append(_value_clause(Requirement.dynamic_fields, field_name, definition, value, dialect))
+    return clauses
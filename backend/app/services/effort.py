@@ -0,0 +1,144 @@
+from decimal import Decimal, InvalidOperation
+from typing import Any, Dict, List, Optional
+import re
+
+from sqlalchemy import case, func
+from sqlalchemy.orm import Session
+
+from app.models.requirement import Requirement
+from app.models.project import Project
+from app.models.user import User
+from app.models.enums import OPEN_REQUIREMENT_STATUSES
+
+# Valor inteiro: numero com separador de milhar/decimal opcional e unidade de
+# horas opcional ("40", "4,5", "1.234,50", "12.5h", "8 horas"); sinal e expoente nao
+_HOURS_PATTERN = re.compile(r"\s*(\d+(?:[.,]\d+)*)\s*(?:h|hs|hr|hrs|hora|horas)?\s*", re.IGNORECASE)
+
+HOURS_QUANTUM = Decimal("0.01")
+# Maior valor de NUMERIC(10, 2)
+HOURS_MAX = Decimal("99999999.99")
+
+def parse_hours(value: Any) -> Optional[Decimal]:
+    """Converte um valor de horas (numero ou texto livre) para Decimal
+
+    Aceita formatos como "40", "4,5", "4.5", "1.234,5", "12h" e "8 horas".
+    Retorna None para valores vazios, negativos, nao finitos, fora da precisao
+    da coluna ou que nao sejam um numero.
+    """
+    if value is None or isinstance(value, bool):
+        return None
+
+    if isinstance(value, (int, float, Decimal)):
+        number = Decimal(str(value))
+    else:
+        match = _HOURS_PATTERN.fullmatch(str(value))
+        if not match:
+            return None
+
+        text = match.group(1)
+        last_dot, last_comma = text.rfind("."), text.rfind(",")
+        if last_dot >= 0 and last_comma >= 0:
+            # O ultimo separador e o decimal, os demais sao de milhar
+            decimal_sep = "." if last_dot > last_comma else ","
+            thousands_sep = "," if decimal_sep == "." else "."
+            text = text.replace(thousands_sep, "").replace(decimal_sep, ".")
+        elif text.count(",") == 1:
+            text = text.replace(",", ".")
+        elif text.count(",") > 1 or text.count(".") > 1:
+            text = text.replace(",", "").replace(".", "")
+
+        try:
+            number = Decimal(text)
+        except InvalidOperation:
+            return None
+
+    if not number.is_finite() or number < 0:
+        return None
+    try:
+        number = number.quantize(HOURS_QUANTUM)
+    except InvalidOperation:
+        # Mais digitos que a precisao do contexto decimal
+        return None
+    return number if number <= HOURS_MAX else None
+
+def get_effort_analytics(
+    db: Session,
+    group_by: str = "project",
+    project_id: Optional[str] = None,
+    assigned_to: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """Calcula metricas de esforco agregadas no banco por projeto ou responsavel"""
+    estimated = Requirement.estimated_hours
+    actual = Requirement.actual_hours
+    has_both = (estimated > 0) & (actual > 0)
+
+    # Acuracia por requisito: menor/maior entre estimado e real (1.0 = estimativa exata)
+    accuracy = case(
+        (has_both & (actual <= estimated), actual / estimated),
+        (has_both, estimated / actual),
+        else_=None
+    )
+    remaining = case(
+        (Requirement.status.in_(OPEN_REQUIREMENT_STATUSES) & (estimated > func.coalesce(actual, 0)),
+         estimated - func.coalesce(actual, 0)),
+        else_=0
+    )
+
+    if group_by == "assigned_to":
+        key_column = Requirement.assigned_to
+        label_column = User.username
+    else:
+        key_column = Requirement.project_id
+        label_column = Project.name
+
+    query = db.query(
+        key_column.label("key"),
+        label_column.label("label"),
+        func.count(Requirement.id).label("requirements"),
+        func.count(estimated).label("estimated_count"),
+        func.count(actual).label("actual_count"),
+        func.coalesce(func.sum(estimated), 0).label("total_estimated"),
+        func.coalesce(func.sum(actual), 0).label("total_actual"),
+        func.sum(case((has_both, estimated), else_=0)).label("paired_estimated"),
+        func.sum(case((has_both, actual), else_=0)).label("paired_actual"),
+        func.avg(accuracy).label("accuracy"),
+        func.coalesce(func.sum(remaining), 0).label("remaining_hours"),
+    )
+
+    if group_by == "assigned_to":
+        query = query.outerjoin(User, User.id == Requirement.assigned_to)
+    else:
+        query = query.join(Project, Project.id == Requirement.project_id)
+
+    if project_id:
+        query = query.filter(Requirement.project_id == project_id)
+
+    if assigned_to:
+        query = query.filter(Requirement.assigned_to == assigned_to)
+
+    rows = query.group_by(key_column, label_column).order_by(label_column).all()
+
+    result = []
+    for row in rows:
+        total_estimated = float(row.total_estimated or 0)
+        total_actual = float(row.total_actual or 0)
+        paired_estimated = float(row.paired_estimated or 0)
+        paired_actual = float(row.paired_actual or 0)
+        variance = paired_actual - paired_estimated
+
+        result.append({
+            group_by: row.key,
+            "label": row.label,
+            "requirements": row.requirements,
+            "estimated_count": row.estimated_count,
+            "actual_count": row.actual_count,
+            "total_estimated_hours": round(total_estimated, 2),
+            "total_actual_hours": round(total_actual, 2),
+            "variance_hours": round(variance, 2),
+            "variance_percentage": round(variance / paired_estimated * 100, 2) if paired_estimated else None,
+            "estimate_accuracy": round(float(row.accuracy) * 100, 2) if row.accuracy is not None else None,
+            "burn_percentage": round(total_actual / total_estimated * 100, 2) if total_estimated else None,
+            "remaining_hours": round(float(row.remaining_hours or 0), 2)
+        })
+
+    return result
@@ -0,0 +1,161 @@
+import hashlib
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import orjson
+from fastapi import Depends, HTTPException, Request, Response, status
+from sqlalchemy import func, literal_column, select
+from sqlalchemy.orm import Session, aliased
+
+from app.core.config import settings
+from app.core.database import get_db
+from app.models.dynamic_field import DynamicFieldDefinition
+from app.models.project import Project
+from app.models.requirement import Requirement
+from app.models.table_version import TableVersion
+from app.models.user import User
+from app.services.read_models import project_count_columns
+
+# GET condicional (If-None-Match -> 304). As dependencias deste modulo rodam
+# depois da autenticacao e antes do endpoint: calculam o ETag com uma consulta
+# pequena e, se o cliente ja tem a versao atual, respondem 304 sem executar a
+# consulta principal nem serializar a resposta.
+#
+#   detalhe        ETag forte: updated_at (+ xmin no PostgreSQL) da linha e das
+#                  linhas embutidas na resposta
+#   lista/relat.   ETag fraco: contadores de escrita das tabelas lidas
+#                  (table_versions, incrementados por triggers)
+
+CACHE_CONTROL = "private, no-cache"
+
+def get_table_versions(db: Session, tables: Iterable[str]) -> Dict[str, int]:
+    """Versao atual de cada tabela (soma das linhas do contador)"""
+    rows = db.execute(
+        select(TableVersion.table_name, func.sum(TableVersion.version))
+        .where(TableVersion.table_name.in_(list(tables)))
+        .group_by(TableVersion.table_name)
+    ).all()
+    return {table_name: int(version) for table_name, version in rows}
+
+def make_etag(*parts: Any, weak: bool = False) -> str:
+    digest = hashlib.blake2b(orjson.dumps(parts, default=str), digest_size=16).hexdigest()
+    return f'W/"{digest}"' if weak else f'"{digest}"'
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Comparacao fraca do If-None-Match (RFC 9110): ignora o prefixo W/"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+
+def etag_headers(etag: Optional[str]) -> Dict[str, str]:
+    """Cabecalhos para respostas devolvidas diretamente pelo endpoint (ORJSONResponse)"""
+    return {"ETag": etag, "Cache-Control": CACHE_CONTROL} if etag else {}
+
+def _request_key(request: Request) -> List[Any]:
+    # Parametros de consulta mudam a representacao (filtros, ordenacao, fields)
+    return [request.url.path, sorted(request.query_params.multi_items())]
+
+def _conditional(request: Request, response: Response, etag: str) -> str:
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=etag_headers(etag))
+    return etag
+
+def conditional_list(
+    *tables: str,
+    time_dependent: bool = False,
+    expand_tables: Optional[Dict[str, Iterable[str]]] = None
+) -> Callable[..., str]:
+    """Dependencia de GET condicional para listagens e relatorios (ETag fraco)
+
+    time_dependent: a resposta usa a hora atual (atrasados, ultimos 30 dias) e o
+    ETag tambem muda a cada ETAG_TIME_BUCKET_SECONDS.
+    expand_tables: tabelas lidas por cada relacionamento de expand=, somadas as
+    demais so quando pedido.
+    """
+    def dependency(request: Request, response: Response, db: Session = Depends(get_db)) -> str:
+        read_tables = set(tables)
+        for name in request.query_params.get("expand", "").split(","):
+            read_tables.update((expand_tables or {}).get(name.strip(), ()))
+        parts = [_request_key(request), get_table_versions(db, sorted(read_tables))]
+        if time_dependent:
+            parts.append(int(time.time()) // settings.ETAG_TIME_BUCKET_SECONDS)
+        return _conditional(request, response, make_etag(*parts, weak=True))
+    return dependency
+
+def conditional_entity(
+    state: Callable[[Session, str, bool], Optional[List[Any]]],
+    path_param: str,
+    tables: Iterable[str] = ()
+) -> Callable[..., Optional[str]]:
+    """Dependencia de GET condicional para o detalhe de um recurso (ETag forte)
+
+    state devolve a versao das linhas que compoem a resposta (None se o recurso
+    nao existe; o endpoint responde 404). No SQLite updated_at tem resolucao de
+    segundos, entao as versoes das tabelas entram no lugar do xmin.
+    """
+    tables = tuple(tables)
+
+    def dependency(request: Request, response: Response, db: Session = Depends(get_db)) -> Optional[str]:
+        is_postgresql = db.get_bind().dialect.name == "postgresql"
+        current = state(db, request.path_params[path_param], is_postgresql)
+        if current is None:
+            return None
+        if not is_postgresql:
+            current.append(get_table_versions(db, tables))
+        return _conditional(request, response, make_etag(_request_key(request), current))
+    return dependency
+
+def _row_version(entity, name: str, is_postgresql: bool) -> List[Any]:
+    """updated_at da linha e, no PostgreSQL, o xmin (muda a cada escrita, mesmo sem updated_at)"""
+    columns = [entity.updated_at]
+    if is_postgresql:
+        columns.append(literal_column(f"{name}.xmin"))
+    return columns
+
+def requirement_state(db: Session, requirement_id: str, is_postgresql: bool) -> Optional[List[Any]]:
+    assignee = aliased(User, name="assignee")
+    creator = aliased(User, name="creator")
+    row = db.execute(
+        select(
+            Requirement.due_date, Requirement.status,
+            *_row_version(Requirement, "requirements", is_postgresql),
+            *_row_version(Project, "projects", is_postgresql),
+            *_row_version(assignee, "assignee", is_postgresql),
+            *_row_version(creator, "creator", is_postgresql)
+        )
+        .outerjoin(Project, Requirement.project_id == Project.id)
+        .outerjoin(assignee, Requirement.assigned_to == assignee.id)
+        .outerjoin(creator, Requirement.created_by == creator.id)
+        .where(Requirement.id == requirement_id)
+    ).first()
+    if row is None:
+        return None
+
+    # Campos calculados com a hora atual, pelas mesmas propriedades da resposta
+    computed = Requirement(due_date=row.due_date, status=row.status)
+    return [*row[2:], computed.is_overdue, computed.days_until_due]
+
+def project_state(db: Session, project_id: str, is_postgresql: bool) -> Optional[List[Any]]:
+    creator = aliased(User, name="creator")
+    row = db.execute(
+        select(
+            *_row_version(Project, "projects", is_postgresql),
+            *_row_version(creator, "creator", is_postgresql),
+            *project_count_columns().values()
+        )
+        .outerjoin(creator, Project.created_by == creator.id)
+        .where(Project.id == project_id)
+    ).first()
+    return list(row) if row is not None else None
+
+def dynamic_field_state(db: Session, field_id: str, is_postgresql: bool) -> Optional[List[Any]]:
+    row = db.execute(
+        select(*_row_version(DynamicFieldDefinition, "dynamic_field_definitions", is_postgresql))
+        .where(DynamicFieldDefinition.id == field_id)
+    ).first()
+    return list(row) if row is not None else None
@@ -0,0 +1,176 @@
+from collections import Counter, OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+import time
+
+from sqlalchemy import String, case, cast, func, literal, null, select, true, type_coerce, union_all
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Session
+
+from app.core.database import canonical_id
+from app.models.dynamic_field import DynamicFieldDefinition
+from app.models.requirement import Requirement
+from app.schemas.requirement import RequirementFilter
+from app.services.dynamic_fields import DYNAMIC_FIELD_FILTER_PREFIX
+from app.services.etags import get_table_versions
+from app.services.requirement_filters import apply_requirement_filters
+
+# Campos nativos aceitos como facetas
+BUILTIN_FACETS = {
+    "type": Requirement.type,
+    "priority": Requirement.priority,
+    "status": Requirement.status,
+    "complexity": Requirement.complexity,
+    "project_id": Requirement.project_id,
+    "assigned_to": Requirement.assigned_to,
+    "created_by": Requirement.created_by,
+}
+
+# Facetas de chaves UUID (SQLite devolve o UUID sem hifens)
+_UUID_FACETS = ("project_id", "assigned_to", "created_by")
+
+# Cache por combinacao de filtros e pela versao das tabelas lidas (table_versions,
+# incrementada por trigger em qualquer escrita, de qualquer processo): uma escrita
+# muda a chave e as entradas antigas saem pelo LRU ou pelo TTL
+FACET_CACHE_TTL_SECONDS = 60
+FACET_CACHE_MAX_ENTRIES = 256
+
+# Tabelas cujas escritas mudam as facetas
+FACET_TABLES = ("requirements", "dynamic_field_definitions")
+
+_cache: "OrderedDict[Hashable, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+
+class FacetError(ValueError):
+    """Faceta desconhecida ou de campo dinamico inativo"""
+
+def _cache_get(key: Hashable) -> Optional[Dict[str, Any]]:
+    entry = _cache.get(key)
+    if not entry:
+        return None
+    expires_at, result = entry
+    if expires_at < time.monotonic():
+        del _cache[key]
+        return None
+    _cache.move_to_end(key)
+    return result
+
+def _cache_set(key: Hashable, result: Dict[str, Any]) -> None:
+    _cache[key] = (time.monotonic() + FACET_CACHE_TTL_SECONDS, result)
+    _cache.move_to_end(key)
+    while len(_cache) > FACET_CACHE_MAX_ENTRIES:
+        _cache.popitem(last=False)
+
+def _split_facets(db: Session, fields: List[str]) -> Tuple[List[str], List[str]]:
+    builtin, dynamic = [], []
+    for field in fields:
+        if field.startswith(DYNAMIC_FIELD_FILTER_PREFIX):
+            dynamic.append(field[len(DYNAMIC_FIELD_FILTER_PREFIX):])
+        elif field in BUILTIN_FACETS:
+            builtin.append(field)
+        else:
+            raise FacetError(f"Faceta invalida: {field}. Use {', '.join(BUILTIN_FACETS)} ou df.<campo>")
+
+    if dynamic:
+        active = {
+            name for (name,) in db.query(DynamicFieldDefinition.field_name).filter(
+                DynamicFieldDefinition.field_name.in_(dynamic),
+                DynamicFieldDefinition.applies_to == "requirement",
+                DynamicFieldDefinition.is_active == True
+            )
+        }
+        unknown = [name for name in dynamic if name not in active]
+        if unknown:
+            raise FacetError(f"Campo dinamico invalido: {', '.join(unknown)}")
+    return builtin, dynamic
+
+def _dynamic_facet_select(base, field_name: str):
+    """Contagem por valor de um campo dinamico; listas contam cada item (jsonb_array_elements_text)"""
+    element = type_coerce(base.c.dynamic_fields, JSONB)[field_name]
+    as_array = case(
+        (func.jsonb_typeof(element) == "array", element),
+        else_=func.jsonb_build_array(element)
+    )
+    items = func.jsonb_array_elements_text(as_array).table_valued("value").alias(f"items_{field_name}")
+    return (
+        select(
+            literal(f"{DYNAMIC_FIELD_FILTER_PREFIX}{field_name}").label("facet"),
+            items.c.value.label("value"),
+            func.count().label("count")
+        )
+        .select_from(base)
+        .join(items, true())
+        .where(func.jsonb_typeof(element) != "null")
+        .group_by(items.c.value)
+    )
+
+def _count_dynamic_values(db: Session, base, field_names: List[str]) -> Dict[str, Counter]:
+    """Contagem em Python para bancos sem JSONB (SQLite em desenvolvimento)"""
+    counters = {name: Counter() for name in field_names}
+    for (document,) in db.execute(select(base.c.dynamic_fields)):
+        for name in field_names:
+            value = (document or {}).get(name)
+            if value is None:
+                continue
+            for item in (value if isinstance(value, list) else [value]):
+                counters[name][str(item)] += 1
+    return counters
+
+def get_requirement_facets(
+    db: Session,
+    filters: RequirementFilter,
+    fields: List[str],
+    limit: int = 50
+) -> Dict[str, Any]:
+    """Contagem de requisitos por valor de cada faceta, sobre o conjunto filtrado, em uma consulta"""
+    builtin, dynamic = _split_facets(db, fields)
+
+    # Versao lida antes das contagens: uma escrita no meio gera outra chave
+    versions = get_table_versions(db, FACET_TABLES)
+    key = (filters.model_dump_json(), tuple(fields), limit, tuple(versions.get(name, 0) for name in FACET_TABLES))
+    cached = _cache_get(key)
+    if cached is not None:
+        return cached
+
+    columns = [Requirement.id] + [BUILTIN_FACETS[name] for name in builtin]
+    if dynamic:
+        columns.append(Requirement.dynamic_fields)
+    base = apply_requirement_filters(db, db.query(*columns), filters).subquery("base")
+
+    selects = [
+        select(literal("total").label("facet"), null().label("value"), func.count().label("count")).select_from(base)
+    ]
+    for name in builtin:
+        selects.append(
+            select(literal(name).label("facet"), cast(base.c[name], String).label("value"), func.count().label("count"))
+            .group_by(base.c[name])
+        )
+
+    is_postgresql = db.get_bind().dialect.name == "postgresql"
+    if is_postgresql:
+        selects.extend(_dynamic_facet_select(base, name) for name in dynamic)
+
+    counts: Dict[str, Counter] = {name: Counter() for name in fields}
+    total = 0
+    for facet, value, count in db.execute(union_all(*selects)):
+        if facet == "total":
+            total = count
+        else:
+            if facet in _UUID_FACETS and value is not None:
+                value = canonical_id(value)
+            counts[facet][value] = count
+
+    if dynamic and not is_postgresql:
+        for name, counter in _count_dynamic_values(db, base, dynamic).items():
+            counts[f"{DYNAMIC_FIELD_FILTER_PREFIX}{name}"] = counter
+
+    result = {
+        "total": total,
+        "facets": {
+            facet: [
+                {"value": value, "count": count}
+                for value, count in sorted(counter.items(), key=lambda item: (-item[1], str(item[0])))[:limit]
+            ]
+            for facet, counter in counts.items()
+        }
+    }
+    _cache_set(key, result)
+    return result
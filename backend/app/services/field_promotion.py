@@ -0,0 +1,123 @@
+from typing import Optional
+import re
+
+from sqlalchemy import Boolean, Date, Numeric, Text, literal_column, text
+from sqlalchemy.orm import Session
+
+from app.models.dynamic_field import DynamicFieldDefinition
+
+# Promocao de campos dinamicos para colunas geradas (STORED) em requirements.
+# O JSONB continua sendo a fonte dos dados: a coluna e derivada dele, indexada com
+# B-tree e pode ser removida a qualquer momento sem perda.
+
+PROMOTED_COLUMN_PREFIX = "df_"
+
+_FIELD_NAME_PATTERN = re.compile(r"^[a-z_][a-z0-9_]{0,59}$")
+
+# Funcoes de extracao tolerantes a valores invalidos (retornam NULL em vez de erro),
+# declaradas IMMUTABLE para poderem ser usadas em colunas geradas
+EXTRACTION_FUNCTIONS_SQL = """
+CREATE OR REPLACE FUNCTION dynamic_field_numeric(doc jsonb, field text) RETURNS numeric
+LANGUAGE plpgsql IMMUTABLE AS $$
+BEGIN
+    RETURN (doc ->> field)::numeric;
+EXCEPTION WHEN others THEN
+    RETURN NULL;
+END
+$$;
+
+CREATE OR REPLACE FUNCTION dynamic_field_date(doc jsonb, field text) RETURNS date
+LANGUAGE plpgsql IMMUTABLE AS $$
+DECLARE
+    raw text := doc ->> field;
+BEGIN
+    IF raw !~ '^\\d{4}-\\d{2}-\\d{2}' THEN
+        RETURN NULL;
+    END IF;
+    RETURN make_date(substr(raw, 1, 4)::int, substr(raw, 6, 2)::int, substr(raw, 9, 2)::int);
+EXCEPTION WHEN others THEN
+    RETURN NULL;
+END
+$$;
+
+CREATE OR REPLACE FUNCTION dynamic_field_boolean(doc jsonb, field text) RETURNS boolean
+LANGUAGE plpgsql IMMUTABLE AS $$
+BEGIN
+    RETURN (doc ->> field)::boolean;
+EXCEPTION WHEN others THEN
+    RETURN NULL;
+END
+$$;
+"""
+
+# Tipo do campo -> (tipo SQL da coluna, expressao de geracao, tipo SQLAlchemy)
+_COLUMN_SPECS = {
+    "date": ("DATE", "dynamic_field_date(dynamic_fields, '{name}')", Date()),
+    "number": ("NUMERIC", "dynamic_field_numeric(dynamic_fields, '{name}')", Numeric()),
+    "boolean": ("BOOLEAN", "dynamic_field_boolean(dynamic_fields, '{name}')", Boolean()),
+    # Texto truncado para caber em uma entrada de indice B-tree
+    "text": ("TEXT", "left(dynamic_fields ->> '{name}', 255)", Text()),
+    # Selects multiplos guardam listas: a coluna fica so com os valores unicos (listas
+    # viram NULL e continuam filtradas por containment no JSONB)
+    "select": (
+        "TEXT",
+        "CASE WHEN jsonb_typeof(dynamic_fields -> '{name}') = 'string' "
+        "THEN left(dynamic_fields ->> '{name}', 255) END",
+        Text(),
+    ),
+}
+
+class FieldPromotionError(ValueError):
+    """Campo que nao pode ser promovido/rebaixado no estado ou banco atual"""
+
+def promoted_column_name(field_name: str) -> str:
+    return f"{PROMOTED_COLUMN_PREFIX}{field_name}"
+
+def promoted_index_name(column_name: str) -> str:
+    return f"idx_requirements_{column_name}"
+
+def promoted_column(definition: DynamicFieldDefinition) -> Optional[object]:
+    """Expressao SQL da coluna promovida do campo (None se o campo nao foi promovido)"""
+    if not definition.promoted_column or definition.field_type not in _COLUMN_SPECS:
+        return None
+    return literal_column(f"requirements.{definition.promoted_column}", _COLUMN_SPECS[definition.field_type][2])
+
+def promote_field(db: Session, definition: DynamicFieldDefinition) -> None:
+    """Cria a coluna gerada tipada e o indice B-tree do campo e registra na definicao
+
+    ADD COLUMN ... STORED reescreve a tabela sob bloqueio exclusivo; em tabelas grandes
+    execute fora do horario de pico.
+    """
+    if db.get_bind().dialect.name != "postgresql":
+        raise FieldPromotionError("Promocao de campos requer PostgreSQL")
+    if definition.applies_to != "requirement":
+        raise FieldPromotionError("Apenas campos de requisitos podem ser promovidos")
+    if definition.promoted_column:
+        raise FieldPromotionError("Campo ja promovido")
+    if definition.field_type not in _COLUMN_SPECS:
+        raise FieldPromotionError(f"Campos do tipo {definition.field_type} nao podem ser promovidos")
+    if not _FIELD_NAME_PATTERN.match(definition.field_name):
+        raise FieldPromotionError("Nome do campo deve conter apenas letras minusculas, numeros e _")
+
+    column_name = promoted_column_name(definition.field_name)
+    sql_type, expression, _ = _COLUMN_SPECS[definition.field_type]
+
+    db.execute(text(EXTRACTION_FUNCTIONS_SQL))
+    db.execute(text(
+        f"ALTER TABLE requirements ADD COLUMN {column_name} {sql_type} "
+        f"GENERATED ALWAYS AS ({expression.format(name=definition.field_name)}) STORED"
+    ))
+    db.execute(text(f"CREATE INDEX {promoted_index_name(column_name)} ON requirements ({column_name})"))
+
+    definition.promoted_column = column_name
+
+def demote_field(db: Session, definition: DynamicFieldDefinition) -> None:
+    """Remove a coluna gerada e o indice do campo; os valores continuam no JSONB"""
+    if not definition.promoted_column:
+        raise FieldPromotionError("Campo nao esta promovido")
+
+    column_name = definition.promoted_column
+    db.execute(text(f"DROP INDEX IF EXISTS {promoted_index_name(column_name)}"))
+    db.execute(text(f"ALTER TABLE requirements DROP COLUMN IF EXISTS {column_name}"))
+
+    definition.promoted_column = None
@@ -0,0 +1,76 @@
+from datetime import datetime, timedelta
+from typing import Any, Callable, List, Tuple
+import logging
+import threading
+
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+
+# Lease dos jobs em background (backfill, expurgo e clonagem). O worker grava
+# updated_at ao assumir o job e a cada lote confirmado; um job em execucao sem
+# renovacao ha mais de JOB_LEASE_SECONDS perdeu o worker (processo encerrado no
+# meio do job) e pode ser assumido por outro: pelo _claim do resume, de uma nova
+# execucao ou da retomada na inicializacao. Se o worker antigo ainda estiver
+# vivo, ele percebe que o updated_at nao e mais o que gravou e para no lote seguinte.
+# updated_at e gravado pela aplicacao (UTC), o mesmo relogio do corte do lease.
+
+logger = logging.getLogger(__name__)
+
+# (modelo, status em execucao, status inicial, executor) de cada tipo de job
+_job_types: List[Tuple[Any, Any, Any, Callable[[str], None]]] = []
+
+def lease_cutoff() -> datetime:
+    """Renovacoes anteriores a este instante indicam um worker perdido"""
+    return datetime.utcnow() - timedelta(seconds=settings.JOB_LEASE_SECONDS)
+
+def claimable(table, startable_statuses, running_status):
+    """Condicao do UPDATE de _claim: status inicial ou execucao com lease vencido"""
+    return or_(
+        table.c.status.in_(startable_statuses),
+        and_(table.c.status == running_status, table.c.updated_at < lease_cutoff()),
+    )
+
+def is_stale(job, running_status) -> bool:
+    """Job em execucao cujo worker deixou de renovar o lease"""
+    return job.status == running_status and (job.updated_at is None or job.updated_at < lease_cutoff())
+
+def renew_lease(job) -> datetime:
+    """Grava a renovacao no job (confirmada com o lote); retorna o valor para comparar depois"""
+    job.updated_at = datetime.utcnow()
+    return job.updated_at
+
+def register_job_type(model, running_status, pending_status, runner: Callable[[str], None]) -> None:
+    """Inclui o tipo de job na retomada da inicializacao"""
+    _job_types.append((model, running_status, pending_status, runner))
+
+def requeue_stale_jobs(session_factory: Callable[[], Session] = SessionLocal) -> int:
+    """Reexecuta em background os jobs sem worker: em execucao com lease vencido ou pendentes antigos
+
+    Pendentes entram apos o mesmo prazo, para nao disputar com a tarefa que acabou de
+    ser agendada por outro processo. O _claim de cada executor e atomico, entao varios
+    workers iniciando juntos nao executam o mesmo job duas vezes.
+    """
+    db = session_factory()
+    try:
+        pending = []
+        for model, running_status, pending_status, runner in _job_types:
+            ids = db.query(model.id).filter(
+                model.status.in_((running_status, pending_status)),
+                model.updated_at < lease_cutoff()
+            ).all()
+            pending += [(runner, str(row.id)) for row in ids]
+    finally:
+        db.close()
+
+    if pending:
+        logger.info(f"Retomando {len(pending)} jobs em background sem worker")
+
+        def run():
+            for runner, job_id in pending:
+                runner(job_id)
+
+        threading.Thread(target=run, name="job-recovery", daemon=True).start()
+    return len(pending)
@@ -0,0 +1,134 @@
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from fastapi import Depends
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.database import get_db
+from app.models.project import Project
+from app.models.requirement import Requirement
+from app.models.user import User
+
+# expand=project,assigned_user,created_by_user nas listagens de requisitos: os
+# relacionamentos sao resolvidos por carregadores em lote (estilo DataLoader) da
+# requisicao. Cada linha registra as chaves de que precisa; a primeira leitura
+# resolve todas as pendentes em uma consulta IN por tabela. assigned_user e
+# created_by_user compartilham o carregador de usuarios, entao expandir uma
+# pagina de 1000 linhas custa no maximo 2 consultas extras.
+
+class ExpandError(ValueError):
+    """Parametro expand com relacionamentos que o recurso nao tem"""
+
+class BatchLoader:
+    """Carrega registros por chave primaria em lote
+
+    load() registra chaves; get() resolve as pendentes em uma unica consulta
+    (fetch recebe a lista de chaves e devolve {chave: valor}) e guarda o
+    resultado, inclusive ausencias, ate o fim da requisicao.
+    """
+    __slots__ = ("_fetch", "_pending", "_loaded")
+
+    def __init__(self, fetch: Callable[[List[Any]], Dict[Any, Any]]):
+        self._fetch = fetch
+        self._pending = set()
+        self._loaded = {}
+
+    def load(self, key: Any) -> None:
+        if key is not None and key not in self._loaded:
+            self._pending.add(key)
+
+    def load_many(self, keys: Iterable[Any]) -> None:
+        for key in keys:
+            self.load(key)
+
+    def get(self, key: Any) -> Any:
+        if key is None:
+            return None
+        self.load(key)
+        if self._pending:
+            pending, self._pending = list(self._pending), set()
+            found = self._fetch(pending)
+            for pending_key in pending:
+                self._loaded[pending_key] = found.get(pending_key)
+        return self._loaded[key]
+
+class RequestLoaders:
+    """Carregadores da requisicao, no formato embutido em RequirementResponse"""
+    __slots__ = ("projects", "users")
+
+    def __init__(self, db: Session):
+        self.projects = BatchLoader(lambda ids: _fetch_projects(db, ids))
+        self.users = BatchLoader(lambda ids: _fetch_users(db, ids))
+
+def get_loaders(db: Session = Depends(get_db)) -> RequestLoaders:
+    """Dependencia: um conjunto de carregadores por requisicao"""
+    return RequestLoaders(db)
+
+_PROJECT_REFERENCE_COLUMNS = (Project.id, Project.name, Project.status, Project.priority, Project.client_name)
+
+_USER_SAFE_COLUMNS = (
+    User.id, User.username, User.email, User.first_name, User.last_name, User.role,
+    User.is_active, User.last_login, User.created_at
+)
+
+def _fetch_projects(db: Session, ids: List[str]) -> Dict[str, Dict[str, Any]]:
+    rows = db.execute(select(*_PROJECT_REFERENCE_COLUMNS).where(Project.id.in_(ids)))
+    # Instancia transitoria (sem sessao) so para reutilizar o formato do modelo
+    return {row.id: Project(**row._mapping).to_dict_reference() for row in rows}
+
+def _fetch_users(db: Session, ids: List[str]) -> Dict[str, Dict[str, Any]]:
+    rows = db.execute(select(*_USER_SAFE_COLUMNS).where(User.id.in_(ids)))
+    return {row.id: User(**row._mapping).to_dict_safe() for row in rows}
+
+# Relacionamento -> (chave estrangeira, carregador)
+REQUIREMENT_EXPANSIONS = {
+    "project": (Requirement.project_id, "projects"),
+    "assigned_user": (Requirement.assigned_to, "users"),
+    "created_by_user": (Requirement.created_by, "users"),
+}
+
+# Tabelas lidas por cada expansao (entram no ETag da listagem)
+REQUIREMENT_EXPANSION_TABLES = {"project": ("projects",), "assigned_user": ("users",), "created_by_user": ("users",)}
+
+def parse_expand(value: Optional[str], expansions: Dict[str, Any]) -> Optional[List[str]]:
+    """Relacionamentos pedidos em expand, na ordem informada (None sem o parametro)"""
+    if value is None:
+        return None
+
+    names = list(dict.fromkeys(name.strip() for name in value.split(",") if name.strip()))
+    unknown = [name for name in names if name not in expansions]
+    if unknown:
+        raise ExpandError(
+            f"Relacionamentos invalidos em expand: {', '.join(unknown)}. "
+            f"Disponiveis: {', '.join(expansions)}"
+        )
+    return names
+
+def expansion_columns(expand: List[str]) -> List[Any]:
+    """Chaves estrangeiras a acrescentar ao select da listagem (descartadas na resposta)"""
+    keys = {REQUIREMENT_EXPANSIONS[name][0].key: REQUIREMENT_EXPANSIONS[name][0] for name in expand}
+    return [column.label(key) for key, column in keys.items()]
+
+def expand_rows(rows, names: List[str], expand: List[str], loaders: RequestLoaders) -> List[Dict[str, Any]]:
+    """Linhas da listagem em dicts com os relacionamentos pedidos embutidos
+
+    Duas passadas: a primeira registra as chaves de todas as linhas, a segunda le
+    os carregadores (uma consulta por tabela, na primeira leitura).
+    """
+    relations = [
+        (name, REQUIREMENT_EXPANSIONS[name][0].key, getattr(loaders, REQUIREMENT_EXPANSIONS[name][1]))
+        for name in expand
+    ]
+    for row in rows:
+        mapping = row._mapping
+        for _, key, loader in relations:
+            loader.load(mapping[key])
+
+    items = []
+    for row in rows:
+        mapping = row._mapping
+        item = {name: mapping[name] for name in names}
+        for name, key, loader in relations:
+            item[name] = loader.get(mapping[key])
+        items.append(item)
+    return items
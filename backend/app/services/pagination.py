@@ -0,0 +1,144 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+import base64
+import json
+
+from sqlalchemy import DateTime, Enum, and_, case, literal, tuple_
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Query, Session
+from sqlalchemy.sql.expression import FunctionElement
+
+# Cabecalho com o cursor da proxima pagina (ausente na ultima pagina)
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+class InvalidCursorError(ValueError):
+    """Cursor malformado ou gerado para outra ordenacao"""
+
+class sort_key(FunctionElement):
+    """Chave de ordenacao e de comparacao do cursor, com a mesma ordem em todos os bancos
+
+    No PostgreSQL e a propria coluna (usa os indices; enums nativos ordenam pela
+    ordem de declaracao). No SQLite timestamps sao texto em formatos mistos
+    (CURRENT_TIMESTAMP sem fracao, valores da aplicacao com microssegundos) e enums
+    sao texto ordenado alfabeticamente: a chave normaliza o timestamp e troca o enum
+    pela posicao do valor no registro.
+    """
+    inherit_cache = True
+
+    def __init__(self, expression):
+        super().__init__(expression)
+        self.type = self.clauses.clauses[0].type
+
+@compiles(sort_key)
+def _compile_sort_key(element, compiler, **kw):
+    expression = element.clauses.clauses[0]
+    if isinstance(expression.type, DateTime):
+        return f"strftime('%Y-%m-%d %H:%M:%f', {compiler.process(expression, **kw)})"
+    if isinstance(expression.type, Enum):
+        ranks = case(
+            *((expression == value, rank) for rank, value in enumerate(expression.type.enums)),
+            else_=None
+        )
+        return compiler.process(ranks, **kw)
+    return compiler.process(expression, **kw)
+
+@compiles(sort_key, "postgresql")
+def _compile_sort_key_pg(element, compiler, **kw):
+    return compiler.process(element.clauses.clauses[0], **kw)
+
+def sort_pattern(fields: Dict[str, Any]) -> str:
+    """Expressao regular que valida o parametro sort ("campo" ou "-campo" para decrescente)"""
+    return "^-?({})$".format("|".join(fields))
+
+def parse_sort(sort: str) -> Tuple[str, bool]:
+    """Separa o parametro sort em (campo, decrescente)"""
+    return sort.lstrip("-"), sort.startswith("-")
+
+def encode_cursor(sort: str, value: Any, row_id: str) -> str:
+    """Gera o cursor opaco a partir da chave de ordenacao da ultima linha da pagina"""
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    payload = json.dumps([sort, value, str(row_id)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str, sort: str, column) -> Tuple[Any, str]:
+    """Le o cursor e retorna (valor da ordenacao, id) da ultima linha da pagina anterior"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cursor_sort, value, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if value is not None and isinstance(column.type, DateTime):
+            value = datetime.fromisoformat(value)
+    except (ValueError, TypeError) as e:
+        raise InvalidCursorError("Cursor invalido") from e
+
+    if cursor_sort != sort:
+        raise InvalidCursorError("Cursor gerado para outra ordenacao")
+    return value, row_id
+
+def _keyset_segments(column, key_column, id_column, descending: bool, value: Any, row_id: str) -> list:
+    """Filtros, na ordem da listagem, que cobrem as linhas depois de (value, row_id)
+
+    Segue a ordem padrao do PostgreSQL (nulos por ultimo em ASC e primeiro em DESC),
+    a mesma dos indices. Cada filtro e uma comparacao de tupla ou um teste de nulo,
+    que o banco resolve como condicao de indice; por isso os nulos ficam em um
+    segmento separado em vez de um OR.
+    """
+    key = tuple_(key_column, id_column)
+    if value is not None:
+        # O valor do cursor passa pela mesma normalizacao da coluna
+        bound = tuple_(sort_key(literal(value, column.type)), literal(row_id, id_column.type))
+    if descending:
+        if value is None:
+            return [and_(column.is_(None), id_column < row_id), column.isnot(None)]
+        return [key < bound]
+
+    if value is None:
+        return [and_(column.is_(None), id_column > row_id)]
+    # Expressoes calculadas (sem nullable) recebem o segmento de nulos por seguranca
+    if getattr(column.expression, "nullable", True):
+        return [key > bound, column.is_(None)]
+    return [key > bound]
+
+def paginate(
+    query: Query,
+    sort: str,
+    fields: Dict[str, Any],
+    id_column,
+    limit: int,
+    skip: int = 0,
+    cursor: Optional[str] = None,
+    db: Optional[Session] = None
+) -> Tuple[List[Any], Optional[str]]:
+    """Ordena a consulta pelo campo de sort (desempate pelo id) e retorna (linhas, proximo cursor)
+
+    Com cursor a pagina e buscada por keyset, sem OFFSET; sem cursor usa skip.
+    Aceita um Query ou um select(), executado na sessao db.
+    """
+    def fetch(page):
+        return db.execute(page).all() if db is not None else page.all()
+
+    field, descending = parse_sort(sort)
+    column = fields[field]
+    key_column = sort_key(column)
+
+    if descending:
+        query = query.order_by(key_column.desc().nulls_first(), id_column.desc())
+    else:
+        query = query.order_by(key_column.asc().nulls_last(), id_column.asc())
+
+    if cursor:
+        value, row_id = decode_cursor(cursor, sort, column)
+        rows = []
+        for segment in _keyset_segments(column, key_column, id_column, descending, value, row_id):
+            rows += fetch(query.filter(segment).limit(limit + 1 - len(rows)))
+            if len(rows) > limit:
+                break
+    else:
+        rows = fetch(query.offset(skip).limit(limit + 1))
+
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(sort, getattr(last, column.key), last.id)
@@ -0,0 +1,246 @@
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Optional, Tuple
+import logging
+
+from sqlalchemy import Integer, case, cast, func, insert, literal, null, select
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.expression import FunctionElement
+
+from app.core.database import GUID, SessionLocal, canonical_id, new_uuid
+from app.models.enums import CloneStatus, ProjectStatus, RequirementStatus
+from app.models.project import Project
+from app.models.project_clone import ProjectClone
+from app.models.requirement import Requirement
+from app.models.user import User
+from app.schemas.project import ProjectCloneRequest
+from app.services.change_feed import record_change
+from app.services.job_leases import claimable, register_job_type, renew_lease
+
+# Clonagem de projetos no servidor. O projeto novo e criado pelo ORM e os
+# requisitos sao copiados com um unico INSERT ... SELECT na mesma transacao, sem
+# passar pela aplicacao. Opcoes: deslocamento de datas, status reiniciado (com
+# horas reais e data de conclusao limpas) e remapeamento de responsaveis.
+# Modelos grandes sao copiados em background (ProjectClone); o projeto novo fica
+# inativo ate a copia terminar. Como a copia e atomica, um job com falha pode
+# ser reexecutado sem duplicar requisitos, e um job cujo worker morreu (lease
+# vencido, ver job_leases) e retomado sem intervencao.
+
+logger = logging.getLogger(__name__)
+
+# Status a partir dos quais uma clonagem pode (re)comecar
+STARTABLE_STATUSES = (CloneStatus.PENDENTE, CloneStatus.FALHOU)
+
+class CloneError(ValueError):
+    """Opcoes de clonagem invalidas"""
+
+class add_days(FunctionElement):
+    """Timestamp deslocado em um numero inteiro de dias"""
+    type = Requirement.__table__.c.due_date.type
+    inherit_cache = True
+
+@compiles(add_days)
+def _compile_add_days(element, compiler, **kw):
+    value, days = [compiler.process(arg, **kw) for arg in element.clauses]
+    return f"datetime({value}, {days} || ' days')"
+
+@compiles(add_days, "postgresql")
+def _compile_add_days_pg(element, compiler, **kw):
+    value, days = [compiler.process(arg, **kw) for arg in element.clauses]
+    return f"({value} + make_interval(days => {days}))"
+
+def _normalize_id(value: str) -> str:
+    try:
+        return canonical_id(value)
+    except ValueError:
+        raise CloneError(f"Id de usuario invalido em assignee_map: {value}")
+
+def clone_options(db: Session, data: ProjectCloneRequest) -> Dict[str, Any]:
+    """Opcoes da copia dos requisitos, com os destinos de assignee_map validados (uma consulta IN)"""
+    assignee_map = {
+        _normalize_id(old): _normalize_id(new) if new else None
+        for old, new in data.assignee_map.items()
+    }
+    targets = {new for new in assignee_map.values() if new}
+    if targets:
+        found = {
+            str(user_id) for (user_id,) in db.query(User.id).filter(User.id.in_(targets), User.is_active == True)
+        }
+        missing = sorted(targets - found)
+        if missing:
+            raise CloneError(f"Usuarios de destino nao encontrados ou inativos: {', '.join(missing)}")
+
+    return {
+        "shift_days": data.shift_days,
+        "reset_status": data.reset_status,
+        "assignee_map": assignee_map,
+        "clear_assignees": data.clear_assignees,
+    }
+
+def _shift(value: Optional[datetime], days: int) -> Optional[datetime]:
+    return value + timedelta(days=days) if value and days else value
+
+def create_clone_project(
+    db: Session,
+    source: Project,
+    data: ProjectCloneRequest,
+    created_by: str,
+    is_active: bool = True
+) -> Project:
+    """Cria (flush) o projeto de destino com os dados da origem"""
+    project = Project(
+        name=data.name,
+        description=data.description if data.description is not None else source.description,
+        status=ProjectStatus.EM_ANDAMENTO if data.reset_status else source.status,
+        priority=source.priority,
+        start_date=_shift(source.start_date, data.shift_days),
+        end_date=_shift(source.end_date, data.shift_days),
+        budget=source.budget,
+        client_name=data.client_name if data.client_name is not None else source.client_name,
+        is_active=is_active,
+        created_by=created_by
+    )
+    db.add(project)
+    db.flush()
+    record_change(db, "project", "created", project.id, project.id)
+    return project
+
+def copy_requirements(
+    db: Session,
+    source_id: str,
+    project_id: str,
+    options: Dict[str, Any],
+    created_by: str
+) -> int:
+    """Copia os requisitos da origem para o projeto com um INSERT ... SELECT; retorna as linhas copiadas"""
+    table = Requirement.__table__
+    c = table.c
+    days = options.get("shift_days") or 0
+    reset = options.get("reset_status", False)
+
+    def shifted(column):
+        return add_days(column, cast(literal(days), Integer)) if days else column
+
+    if options.get("clear_assignees"):
+        assigned_to = null()
+    elif options.get("assignee_map"):
+        assigned_to = case(
+            *[
+                (c.assigned_to == old, literal(new, GUID) if new else null())
+                for old, new in options["assignee_map"].items()
+            ],
+            else_=c.assigned_to
+        )
+    else:
+        assigned_to = c.assigned_to
+
+    columns = {
+        "id": new_uuid(),
+        "title": c.title,
+        "description": c.description,
+        "type": c.type,
+        "priority": c.priority,
+        "status": literal(RequirementStatus.PENDENTE, c.status.type) if reset else c.status,
+        "complexity": c.complexity,
+        "estimated_hours": c.estimated_hours,
+        "actual_hours": null() if reset else c.actual_hours,
+        "due_date": shifted(c.due_date),
+        "completion_date": null() if reset else shifted(c.completion_date),
+        "dynamic_fields": c.dynamic_fields,
+        "project_id": literal(project_id, GUID),
+        "assigned_to": assigned_to,
+        "created_by": literal(created_by, GUID),
+        "created_at": func.now(),
+        "updated_at": func.now(),
+    }
+    rows = select(*columns.values()).where(c.project_id == source_id)
+    return db.execute(insert(table).from_select(list(columns), rows)).rowcount
+
+def clone_project(
+    db: Session,
+    source: Project,
+    data: ProjectCloneRequest,
+    current_user: User
+) -> Tuple[Project, int]:
+    """Clona o projeto e seus requisitos na transacao corrente (confirma ao final)"""
+    options = clone_options(db, data)
+    project = create_clone_project(db, source, data, current_user.id)
+    copied = copy_requirements(db, source.id, project.id, options, current_user.id)
+    record_change(db, "requirement", "imported", project_id=project.id)
+    db.commit()
+    return project, copied
+
+def start_project_clone(
+    db: Session,
+    source: Project,
+    data: ProjectCloneRequest,
+    current_user: User,
+    total_rows: Optional[int] = None
+) -> ProjectClone:
+    """Cria o projeto de destino (inativo) e registra o job na sessao"""
+    options = clone_options(db, data)
+    project = create_clone_project(db, source, data, current_user.id, is_active=False)
+    job = ProjectClone(
+        source_project_id=source.id,
+        project_id=project.id,
+        options=options,
+        status=CloneStatus.PENDENTE,
+        total_rows=total_rows,
+        created_by=current_user.id
+    )
+    db.add(job)
+    return job
+
+def _claim(db: Session, job_id: str) -> bool:
+    """Marca o job como em execucao se ninguem o iniciou ou se o lease venceu (UPDATE condicional)"""
+    table = ProjectClone.__table__
+    result = db.execute(
+        table.update()
+        .where(table.c.id == job_id, claimable(table, STARTABLE_STATUSES, CloneStatus.EXECUTANDO))
+        .values(status=CloneStatus.EXECUTANDO, error=None, finished_at=None, updated_at=datetime.utcnow())
+    )
+    db.commit()
+    return result.rowcount == 1
+
+def run_project_clone(job_id: str, session_factory: Callable[[], Session] = SessionLocal) -> None:
+    """Copia os requisitos do job em uma transacao e ativa o projeto (executado em background)"""
+    db = session_factory()
+    try:
+        if not _claim(db, job_id):
+            logger.info(f"Clonagem {job_id} ja em execucao ou finalizada")
+            return
+
+        job = db.get(ProjectClone, job_id)
+        if not job.source_project_id:
+            raise CloneError("Projeto de origem removido")
+        job.started_at = datetime.utcnow()
+        # A copia e uma transacao unica e nao renova o lease; gravar o job antes dela
+        # mantem a linha bloqueada ate o commit, entao outro _claim (lease vencido)
+        # espera e so assume o job se esta transacao for desfeita com o worker
+        renew_lease(job)
+        db.flush()
+
+        job.copied_rows = copy_requirements(db, job.source_project_id, job.project_id, job.options, job.created_by)
+        if job.total_rows is None:
+            job.total_rows = job.copied_rows
+        db.get(Project, job.project_id).is_active = True
+        record_change(db, "project", "updated", job.project_id, job.project_id)
+        record_change(db, "requirement", "imported", project_id=job.project_id)
+        job.status = CloneStatus.CONCLUIDO
+        job.finished_at = datetime.utcnow()
+        db.commit()
+        logger.info(f"Clonagem {job_id} concluida: {job.copied_rows} requisitos copiados")
+
+    except Exception as e:
+        logger.error(f"Erro na clonagem {job_id}: {e}")
+        db.rollback()
+        job = db.get(ProjectClone, job_id)
+        if job:
+            job.status = CloneStatus.FALHOU
+            job.error = str(e)
+            job.finished_at = datetime.utcnow()
+            db.commit()
+    finally:
+        db.close()
+
+register_job_type(ProjectClone, CloneStatus.EXECUTANDO, CloneStatus.PENDENTE, run_project_clone)
@@ -0,0 +1,153 @@
+from datetime import datetime
+from typing import Callable, Optional
+import logging
+import time
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.enums import PurgeStatus
+from app.models.project import Project
+from app.models.project_purge import ProjectPurge
+from app.models.requirement import Requirement
+from app.services.change_feed import record_change
+from app.services.job_leases import claimable, register_job_type, renew_lease
+
+# Exclusao de projetos. A exclusao direta e um unico DELETE do projeto: os
+# requisitos saem pelo ON DELETE CASCADE do banco, sem carrega-los na sessao.
+# Projetos grandes sao expurgados em background: os requisitos saem em lotes
+# (um DELETE e um commit por lote, mantendo os locks curtos) e o projeto e
+# removido ao final, levando pelo cascade o que tiver sido criado no meio tempo.
+# O expurgo e idempotente: um job com falha e retomado de onde parou, e um job
+# cujo worker morreu e retomado quando o lease renovado a cada lote vence.
+
+logger = logging.getLogger(__name__)
+
+# Status a partir dos quais um expurgo pode (re)comecar
+STARTABLE_STATUSES = (PurgeStatus.PENDENTE, PurgeStatus.FALHOU)
+
+def count_project_requirements(db: Session, project_id: str) -> int:
+    """Numero de requisitos do projeto (decide entre exclusao direta e expurgo)"""
+    return db.query(func.count(Requirement.id)).filter(Requirement.project_id == project_id).scalar()
+
+def delete_project_cascade(db: Session, project_id: str) -> None:
+    """Remove o projeto com um DELETE; os requisitos saem pelo cascade do banco"""
+    db.execute(delete(Project.__table__).where(Project.__table__.c.id == project_id))
+    record_change(db, "project", "deleted", project_id, project_id)
+
+def start_project_purge(
+    db: Session,
+    project: Project,
+    total_rows: Optional[int] = None,
+    created_by: Optional[str] = None
+) -> ProjectPurge:
+    """Registra o expurgo na sessao (ou retorna o que ja esta em andamento) e desativa o projeto
+
+    O job em andamento retornado pode ter perdido o worker; agendar run_project_purge
+    para ele o retoma se o lease tiver vencido e e inofensivo caso contrario.
+    """
+    running = db.query(ProjectPurge).filter(
+        ProjectPurge.project_id == project.id,
+        ProjectPurge.status.in_((PurgeStatus.PENDENTE, PurgeStatus.EXECUTANDO))
+    ).first()
+    if running:
+        return running
+
+    project.is_active = False
+    record_change(db, "project", "updated", project.id, project.id)
+    job = ProjectPurge(
+        project_id=project.id,
+        project_name=project.name,
+        status=PurgeStatus.PENDENTE,
+        total_rows=total_rows,
+        created_by=created_by
+    )
+    db.add(job)
+    return job
+
+def _claim(db: Session, job_id: str) -> Optional[datetime]:
+    """Marca o job como em execucao se ninguem o iniciou ou se o lease venceu (UPDATE condicional)
+
+    Retorna o lease gravado (updated_at) ou None se outro worker esta com o job.
+    """
+    table = ProjectPurge.__table__
+    lease = datetime.utcnow()
+    result = db.execute(
+        table.update()
+        .where(table.c.id == job_id, claimable(table, STARTABLE_STATUSES, PurgeStatus.EXECUTANDO))
+        .values(status=PurgeStatus.EXECUTANDO, error=None, finished_at=None, updated_at=lease)
+    )
+    db.commit()
+    return lease if result.rowcount == 1 else None
+
+def _delete_batch(db: Session, job: ProjectPurge, batch_size: int) -> int:
+    """Remove um lote de requisitos do projeto e confirma; retorna o numero de linhas removidas"""
+    table = Requirement.__table__
+    batch = select(table.c.id).where(table.c.project_id == job.project_id).limit(batch_size)
+    deleted = db.execute(delete(table).where(table.c.id.in_(batch.scalar_subquery()))).rowcount
+
+    job.deleted_rows += deleted
+    renew_lease(job)
+    if deleted:
+        record_change(db, "requirement", "purged", project_id=job.project_id)
+    db.commit()
+    return deleted
+
+def run_project_purge(
+    job_id: str,
+    session_factory: Callable[[], Session] = SessionLocal,
+    batch_size: Optional[int] = None,
+    throttle_seconds: Optional[float] = None
+) -> None:
+    """Executa o expurgo em lotes ate remover o projeto ou falhar (executado em background)"""
+    batch_size = batch_size or settings.PROJECT_PURGE_BATCH_SIZE
+    throttle_seconds = settings.PROJECT_PURGE_THROTTLE_SECONDS if throttle_seconds is None else throttle_seconds
+
+    db = session_factory()
+    try:
+        lease = _claim(db, job_id)
+        if lease is None:
+            logger.info(f"Expurgo {job_id} ja em execucao ou finalizado")
+            return
+
+        job = db.get(ProjectPurge, job_id)
+        if not job.started_at:
+            job.started_at = datetime.utcnow()
+        if job.total_rows is None:
+            job.total_rows = count_project_requirements(db, job.project_id)
+        lease = renew_lease(job)
+        db.commit()
+        logger.info(f"Expurgo {job_id} iniciado: projeto {job.project_name} ({job.total_rows} requisitos)")
+
+        while True:
+            db.refresh(job)
+            if job.updated_at != lease:
+                logger.info(f"Expurgo {job_id} assumido por outro worker (lease vencido)")
+                return
+            if not _delete_batch(db, job, batch_size):
+                break
+            lease = job.updated_at
+            if throttle_seconds:
+                time.sleep(throttle_seconds)
+
+        delete_project_cascade(db, job.project_id)
+        job.status = PurgeStatus.CONCLUIDO
+        job.finished_at = datetime.utcnow()
+        db.commit()
+        logger.info(f"Expurgo {job_id} concluido: {job.deleted_rows} requisitos removidos")
+
+    except Exception as e:
+        logger.error(f"Erro no expurgo {job_id}: {e}")
+        db.rollback()
+        job = db.get(ProjectPurge, job_id)
+        if job:
+            job.status = PurgeStatus.FALHOU
+            job.error = str(e)
+            job.finished_at = datetime.utcnow()
+            db.commit()
+    finally:
+        db.close()
+
+register_job_type(ProjectPurge, PurgeStatus.EXECUTANDO, PurgeStatus.PENDENTE, run_project_purge)
@@ -0,0 +1,287 @@
+from dataclasses import dataclass, fields
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Type
+
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import Float, and_, case, cast, func, select
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy.sql import Select
+
+from app.models.enums import Complexity, Priority, ProjectStatus, RequirementStatus, RequirementType
+from app.models.project import Project
+from app.models.requirement import Requirement
+from app.models.user import User
+from app.services.pagination import NEXT_CURSOR_HEADER, parse_sort
+
+# Modelos de leitura das listagens, exportacoes e relatorios. Cada um e um
+# select() Core apenas com as colunas usadas (campos calculados resolvidos no
+# banco) e um registro leve: dataclass com __slots__, sem identity map,
+# instrumentacao ou leitura da coluna JSON dynamic_fields. O orjson serializa os
+# registros diretamente; os schemas Pydantic continuam documentando as respostas
+# no OpenAPI. As exportacoes montam o DataFrame direto das linhas do select.
+
+@dataclass(slots=True)
+class RequirementSummaryRecord:
+    """Linha de GET /requirements/ (formato de RequirementResponseSummary)"""
+    id: str
+    title: str
+    type: RequirementType
+    priority: Priority
+    status: RequirementStatus
+    complexity: Complexity
+    due_date: Optional[datetime]
+    is_overdue: bool
+    progress_percentage: float
+    created_at: datetime
+
+@dataclass(slots=True)
+class ProjectSummaryRecord:
+    """Linha de GET /projects/ (formato de ProjectResponseSummary)"""
+    id: str
+    name: str
+    description: Optional[str]
+    status: ProjectStatus
+    priority: Priority
+    client_name: Optional[str]
+    requirements_count: int
+    progress_percentage: float
+    created_at: datetime
+
+@dataclass(slots=True)
+class UserSafeRecord:
+    """Linha de GET /users/ (formato de UserResponseSafe)"""
+    id: str
+    username: str
+    email: str
+    first_name: Optional[str]
+    last_name: Optional[str]
+    role: str
+    is_active: bool
+    last_login: Optional[datetime]
+    created_at: datetime
+
+@dataclass(slots=True)
+class RequirementBreakdownRecord:
+    """Contagem de requisitos de um projeto por status, tipo, prioridade e atraso"""
+    status: RequirementStatus
+    type: RequirementType
+    priority: Priority
+    is_overdue: bool
+    count: int
+
+def _requirement_summary_columns() -> Dict[str, Any]:
+    return {
+        "id": Requirement.id,
+        "title": Requirement.title,
+        "type": Requirement.type,
+        "priority": Requirement.priority,
+        "status": Requirement.status,
+        "complexity": Requirement.complexity,
+        "due_date": Requirement.due_date,
+        # Avaliado a cada consulta (depende do horario atual)
+        "is_overdue": Requirement.is_overdue,
+        "progress_percentage": cast(Requirement.progress_percentage, Float),
+        "created_at": Requirement.created_at,
+    }
+
+def project_count_columns() -> Dict[str, Any]:
+    """Contagens de requisitos correlacionadas ao projeto da linha, sem carregar os requisitos"""
+    requirements_count = (
+        select(func.count(Requirement.id))
+        .where(Requirement.project_id == Project.id)
+        .correlate(Project)
+        .scalar_subquery()
+    )
+    completed_count = (
+        select(func.count(Requirement.id))
+        .where(Requirement.project_id == Project.id, Requirement.status == RequirementStatus.CONCLUIDO)
+        .correlate(Project)
+        .scalar_subquery()
+    )
+    return {"requirements_count": requirements_count, "completed_requirements_count": completed_count}
+
+def _project_summary_columns() -> Dict[str, Any]:
+    # Contagens correlacionadas: so as linhas da pagina sao contadas
+    return {
+        "id": Project.id,
+        "name": Project.name,
+        "description": Project.description,
+        "status": Project.status,
+        "priority": Project.priority,
+        "client_name": Project.client_name,
+        **project_count_columns(),
+        "created_at": Project.created_at,
+    }
+
+USER_SAFE_COLUMNS = {
+    "id": User.id,
+    "username": User.username,
+    "email": User.email,
+    "first_name": User.first_name,
+    "last_name": User.last_name,
+    "role": User.role,
+    "is_active": User.is_active,
+    "last_login": User.last_login,
+    "created_at": User.created_at,
+}
+
+def read_select(columns: Dict[str, Any], sort: Optional[str] = None, sort_fields=None) -> Select:
+    """select() das colunas rotuladas; a coluna de ordenacao entra no fim se nao fizer parte do registro"""
+    selected = [column.label(name) for name, column in columns.items()]
+    if sort:
+        field, _ = parse_sort(sort)
+        if field not in columns:
+            selected.append(sort_fields[field].label(field))
+    return select(*selected)
+
+def _pick(columns: Dict[str, Any], fields: Optional[List[str]]) -> Dict[str, Any]:
+    """Colunas dos campos pedidos em fields (todas sem o parametro)"""
+    return {name: columns[name] for name in fields} if fields else columns
+
+def requirement_summary_select(sort: str, sort_fields, fields: Optional[List[str]] = None) -> Select:
+    return read_select(_pick(_requirement_summary_columns(), fields), sort, sort_fields)
+
+def project_summary_select(sort: str, sort_fields, fields: Optional[List[str]] = None) -> Select:
+    if fields and "progress_percentage" in fields:
+        # Calculado a partir das duas contagens
+        fields = [name for name in fields if name != "progress_percentage"]
+        fields += [name for name in project_count_columns() if name not in fields]
+    return read_select(_pick(_project_summary_columns(), fields), sort, sort_fields)
+
+def user_safe_select(fields: Optional[List[str]] = None) -> Select:
+    return read_select(_pick(USER_SAFE_COLUMNS, fields))
+
+def to_records(rows, record: Type) -> List[Any]:
+    """Converte as linhas em registros pela posicao (colunas extras de ordenacao sao descartadas)"""
+    size = len(fields(record))
+    return [record(*row[:size]) for row in rows]
+
+def record_names(record: Type) -> List[str]:
+    """Nomes dos campos de um registro, na ordem das colunas"""
+    return [field.name for field in fields(record)]
+
+def rows_to_dicts(rows, names: List[str]) -> List[Dict[str, Any]]:
+    """Linhas de um select com campos esparsos em dicts (colunas extras de ordenacao sao descartadas)"""
+    return [dict(zip(names, row)) for row in rows]
+
+def progress(completed: int, total: int) -> float:
+    """Percentual de requisitos concluidos (0.0 sem requisitos), como Project.progress_percentage"""
+    return (completed / total) * 100 if total else 0.0
+
+def project_summary_records(rows, fields: Optional[List[str]] = None) -> List[Any]:
+    """Como to_records, calculando progress_percentage a partir das contagens (dicts com fields)"""
+    if fields:
+        return [
+            {
+                name: progress(row.completed_requirements_count, row.requirements_count)
+                if name == "progress_percentage" else getattr(row, name)
+                for name in fields
+            }
+            for row in rows
+        ]
+    return [
+        ProjectSummaryRecord(
+            row.id, row.name, row.description, row.status, row.priority, row.client_name,
+            row.requirements_count, progress(row.completed_requirements_count, row.requirements_count),
+            row.created_at
+        )
+        for row in rows
+    ]
+
+def list_response(
+    items: List[Any], next_cursor: Optional[str] = None, headers: Optional[Dict[str, str]] = None
+) -> ORJSONResponse:
+    """Resposta ja serializada com o cabecalho de cursor, quando houver proxima pagina"""
+    headers = dict(headers or {})
+    if next_cursor:
+        headers[NEXT_CURSOR_HEADER] = next_cursor
+    return ORJSONResponse(items, headers=headers or None)
+
+# Exportacoes: cabecalho da planilha -> expressao
+
+def _full_name(user) -> Any:
+    """Expressao de User.full_name ("" sem usuario)"""
+    return func.coalesce(
+        case(
+            (and_(user.first_name != "", user.last_name != ""), user.first_name + " " + user.last_name),
+            else_=user.username
+        ),
+        ""
+    )
+
+def requirement_export_select() -> Select:
+    project = aliased(Project)
+    assigned = aliased(User)
+    creator = aliased(User)
+    columns = {
+        "ID": Requirement.id,
+        "Titulo": Requirement.title,
+        "Descricao": Requirement.description,
+        "Tipo": Requirement.type,
+        "Prioridade": Requirement.priority,
+        "Status": Requirement.status,
+        "Complexidade": Requirement.complexity,
+        "Horas Estimadas": Requirement.estimated_hours,
+        "Horas Reais": Requirement.actual_hours,
+        "Data Vencimento": Requirement.due_date,
+        "Data Conclusao": Requirement.completion_date,
+        "Projeto": func.coalesce(project.name, ""),
+        "Atribuido Para": _full_name(assigned),
+        "Criado Por": _full_name(creator),
+        "Atrasado": Requirement.is_overdue,
+        "Progresso (%)": Requirement.progress_percentage,
+        "Data Criacao": Requirement.created_at,
+        "Data Atualizacao": Requirement.updated_at,
+    }
+    return (
+        read_select(columns)
+        .outerjoin(project, project.id == Requirement.project_id)
+        .outerjoin(assigned, assigned.id == Requirement.assigned_to)
+        .outerjoin(creator, creator.id == Requirement.created_by)
+    )
+
+def project_export_select() -> Select:
+    # Exportacao da tabela inteira: uma agregacao por projeto em vez de subconsultas por linha
+    counts = (
+        select(
+            Requirement.project_id,
+            func.count(Requirement.id).label("total"),
+            func.count(Requirement.id).filter(Requirement.status == RequirementStatus.CONCLUIDO).label("completed")
+        )
+        .group_by(Requirement.project_id)
+        .subquery()
+    )
+    total = func.coalesce(counts.c.total, 0)
+    creator = aliased(User)
+    columns = {
+        "ID": Project.id,
+        "Nome": Project.name,
+        "Descricao": Project.description,
+        "Status": Project.status,
+        "Prioridade": Project.priority,
+        "Cliente": Project.client_name,
+        "Orcamento": Project.budget,
+        "Data Inicio": Project.start_date,
+        "Data Fim": Project.end_date,
+        "Requisitos": total,
+        "Progresso (%)": case((total > 0, cast(counts.c.completed, Float) / total * 100), else_=0.0),
+        "Criado Por": _full_name(creator),
+        "Data Criacao": Project.created_at,
+        "Data Atualizacao": Project.updated_at,
+    }
+    return (
+        read_select(columns)
+        .outerjoin(counts, counts.c.project_id == Project.id)
+        .outerjoin(creator, creator.id == Project.created_by)
+    )
+
+def requirement_breakdown(db: Session, project_id: str) -> List[RequirementBreakdownRecord]:
+    """Requisitos do projeto agrupados no banco (uma linha por combinacao existente)"""
+    # Rotulo unico: a expressao de atraso carrega o horario atual como parametro
+    groups = (Requirement.status, Requirement.type, Requirement.priority, Requirement.is_overdue.label("is_overdue"))
+    stmt = (
+        select(*groups, func.count(Requirement.id))
+        .where(Requirement.project_id == project_id)
+        .group_by(*groups)
+    )
+    return to_records(db.execute(stmt), RequirementBreakdownRecord)
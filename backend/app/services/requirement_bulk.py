@@ -0,0 +1,209 @@
+from typing import Any, Dict, List, Optional, Set
+
+from pydantic import ValidationError
+from sqlalchemy import insert, update
+from sqlalchemy.orm import Session
+
+from app.core.database import canonical_id, generate_uuid
+from app.models.project import Project
+from app.models.requirement import Requirement
+from app.models.user import User
+from app.schemas.requirement import RequirementCreate, RequirementUpdate
+from app.services.change_feed import record_change
+from app.services.dynamic_field_schema import DynamicFieldValidationError, validate_dynamic_fields
+
+# Escrita em lote de requisitos: todos os itens sao validados antes de qualquer
+# escrita, as chaves estrangeiras sao conferidas com uma consulta IN por tabela e
+# os itens validos sao gravados com INSERT/UPDATE em lote numa unica transacao.
+
+class BulkItemError(ValueError):
+    """Item do lote rejeitado (mensagem retornada no resultado do item)"""
+
+def _normalize_id(value: Any, label: str) -> str:
+    try:
+        return canonical_id(value)
+    except ValueError:
+        raise BulkItemError(f"{label} invalido: {value}")
+
+def _format_validation_error(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in item['loc'])}: {item['msg']}" for item in error.errors()
+    )
+
+def _fetch_ids(db: Session, column, ids: Set[str]) -> Set[str]:
+    """Ids existentes entre os informados (uma consulta IN)"""
+    if not ids:
+        return set()
+    return {str(row_id) for (row_id,) in db.query(column).filter(column.in_(ids))}
+
+class _Item:
+    """Item do lote apos a validacao do schema"""
+    __slots__ = ("index", "id", "data", "values", "error", "status")
+
+    def __init__(self, index: int):
+        self.index = index
+        self.id: Optional[str] = None
+        self.data: Optional[Dict[str, Any]] = None
+        self.values: Dict[str, Any] = {}
+        self.error: Optional[str] = None
+        self.status: Optional[str] = None
+
+def _validate_values(item: _Item, data: Dict[str, Any], creating: bool) -> None:
+    """Valida o item com o schema de criacao ou de atualizacao e normaliza as chaves"""
+    try:
+        if creating:
+            item.values = RequirementCreate(**data).dict()
+            item.values["project_id"] = _normalize_id(data["project_id"], "project_id")
+        else:
+            item.values = RequirementUpdate(**data).dict(exclude_unset=True)
+            if data.get("project_id") is not None:
+                # Aceito apenas para conferir que o requisito e do projeto informado
+                item.values["project_id"] = _normalize_id(data["project_id"], "project_id")
+
+        if item.values.get("assigned_to"):
+            item.values["assigned_to"] = _normalize_id(item.values["assigned_to"], "assigned_to")
+    except ValidationError as e:
+        item.error = _format_validation_error(e)
+    except BulkItemError as e:
+        item.error = str(e)
+
+def _parse_item(index: int, raw: Dict[str, Any], mode: str) -> _Item:
+    item = _Item(index)
+    data = dict(raw)
+    raw_id = data.pop("id", None)
+    try:
+        if raw_id is not None:
+            item.id = _normalize_id(raw_id, "id")
+        elif mode == "update":
+            raise BulkItemError("id obrigatorio no modo update")
+    except BulkItemError as e:
+        item.error = str(e)
+        return item
+
+    if mode == "upsert" and item.id:
+        # O schema depende de o requisito existir: validado depois da consulta dos ids
+        item.data = data
+    else:
+        _validate_values(item, data, creating=mode != "update")
+    return item
+
+def _can_edit(row, current_user: User) -> bool:
+    return (
+        str(row.created_by) == str(current_user.id) or
+        str(row.assigned_to) == str(current_user.id) or
+        current_user.has_permission("requirement:admin")
+    )
+
+def bulk_write_requirements(
+    db: Session,
+    mode: str,
+    raw_items: List[Dict[str, Any]],
+    current_user: User,
+    atomic: bool = False
+) -> Dict[str, Any]:
+    """Cria/atualiza requisitos em lote e retorna o resultado por item (na ordem recebida)"""
+    items = [_parse_item(index, raw, mode) for index, raw in enumerate(raw_items)]
+    valid = [item for item in items if not item.error]
+
+    # Ids repetidos no lote
+    seen: Set[str] = set()
+    for item in valid:
+        if item.id in seen:
+            item.error = "id repetido no lote"
+        elif item.id:
+            seen.add(item.id)
+
+    # Requisitos existentes e chaves estrangeiras: uma consulta IN por tabela
+    valid = [item for item in items if not item.error]
+    existing = {}
+    ids = [item.id for item in valid if item.id]
+    if ids and mode != "create":
+        existing = {
+            str(row.id): row
+            for row in db.query(
+                Requirement.id, Requirement.project_id, Requirement.created_by, Requirement.assigned_to
+            ).filter(Requirement.id.in_(ids))
+        }
+
+    # Upsert: existentes aceitam atualizacao parcial; os demais exigem os campos de criacao
+    for item in valid:
+        if item.data is not None:
+            _validate_values(item, item.data, creating=item.id not in existing)
+
+    valid = [item for item in items if not item.error]
+    projects = _fetch_ids(db, Project.id, {item.values["project_id"] for item in valid if "project_id" in item.values})
+    users = _fetch_ids(db, User.id, {item.values["assigned_to"] for item in valid if item.values.get("assigned_to")})
+
+    inserts, updates, changes = [], [], []
+    for item in valid:
+        current = existing.get(item.id)
+        values = item.values
+        try:
+            if mode == "create" and item.id:
+                raise BulkItemError("id nao e aceito no modo create; use upsert")
+            if mode == "update" and current is None:
+                raise BulkItemError("Requisito nao encontrado")
+            if "project_id" in values and values["project_id"] not in projects:
+                raise BulkItemError("Projeto nao encontrado")
+            if values.get("assigned_to") and values["assigned_to"] not in users:
+                raise BulkItemError("Usuario atribuido nao encontrado")
+            if current is not None:
+                if not _can_edit(current, current_user):
+                    raise BulkItemError("Nao tem permissao para editar este requisito")
+                if values.pop("project_id", str(current.project_id)) != str(current.project_id):
+                    raise BulkItemError("Requisito pertence a outro projeto")
+            if "dynamic_fields" in values:
+                values["dynamic_fields"] = validate_dynamic_fields(db, values["dynamic_fields"])
+        except DynamicFieldValidationError as e:
+            item.error = str(e)
+            continue
+        except BulkItemError as e:
+            item.error = str(e)
+            continue
+
+        if current is not None:
+            if values:
+                updates.append({"id": item.id, **values})
+                changes.append(("updated", item.id, current.project_id))
+            item.status = "atualizado"
+        else:
+            item.id = item.id or generate_uuid()
+            inserts.append({"id": item.id, "created_by": current_user.id, **values})
+            changes.append(("created", item.id, values.get("project_id")))
+            item.status = "criado"
+
+    failed = [item for item in items if item.error]
+    if atomic and failed:
+        inserts, updates, changes = [], [], []
+        for item in items:
+            if not item.error:
+                item.status = "ignorado"
+
+    try:
+        if inserts:
+            # INSERT de varias linhas por instrucao (insertmanyvalues)
+            db.execute(insert(Requirement), inserts)
+        if updates:
+            # UPDATE por chave primaria agrupado pelas colunas alteradas (executemany)
+            db.execute(update(Requirement), updates)
+        for action, requirement_id, project_id in changes:
+            record_change(db, "requirement", action, requirement_id, project_id)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    return {
+        "created": len(inserts),
+        "updated": sum(1 for item in items if item.status == "atualizado"),
+        "failed": len(failed),
+        "results": [
+            {
+                "index": item.index,
+                "id": item.id,
+                "status": "erro" if item.error else item.status,
+                "error": item.error
+            }
+            for item in items
+        ]
+    }
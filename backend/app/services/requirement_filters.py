@@ -0,0 +1,52 @@
+from sqlalchemy.orm import Query, Session
+
+from app.models.requirement import Requirement
+from app.models.enums import REQUIREMENT_STATUS_PROGRESS
+from app.schemas.requirement import RequirementFilter
+from app.services.dynamic_fields import build_dynamic_field_filters
+
+def apply_requirement_filters(db: Session, query: Query, filters: RequirementFilter) -> Query:
+    """Aplica os filtros da listagem de requisitos a uma consulta sobre Requirement"""
+    if filters.search:
+        query = query.filter(
+            Requirement.title.contains(filters.search) |
+            Requirement.description.contains(filters.search)
+        )
+    
+    if filters.project_id:
+        query = query.filter(Requirement.project_id == filters.project_id)
+    
+    if filters.type:
+        query = query.filter(Requirement.type == filters.type)
+    
+    if filters.priority:
+        query = query.filter(Requirement.priority == filters.priority)
+    
+    if filters.status:
+        query = query.filter(Requirement.status == filters.status)
+    
+    if filters.complexity:
+        query = query.filter(Requirement.complexity == filters.complexity)
+    
+    if filters.assigned_to:
+        query = query.filter(Requirement.assigned_to == filters.assigned_to)
+    
+    if filters.created_by:
+        query = query.filter(Requirement.created_by == filters.created_by)
+    
+    if filters.is_overdue is not None:
+        query = query.filter(Requirement.is_overdue if filters.is_overdue else ~Requirement.is_overdue)
+    
+    if filters.min_progress is not None or filters.max_progress is not None:
+        # Progresso deriva do status: filtra pelos status correspondentes (usa o indice de status)
+        statuses = [
+            requirement_status for requirement_status, progress in REQUIREMENT_STATUS_PROGRESS.items()
+            if (filters.min_progress is None or progress >= filters.min_progress)
+            and (filters.max_progress is None or progress <= filters.max_progress)
+        ]
+        query = query.filter(Requirement.status.in_(statuses))
+    
+    for clause in build_dynamic_field_filters(db, filters.dynamic_fields):
+        query = query.filter(clause)
+    
+    return query
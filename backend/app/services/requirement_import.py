@@ -0,0 +1,423 @@
+from datetime import date, datetime, timedelta
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple
+import codecs
+import csv
+import io
+import itertools
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+
+from pydantic import ValidationError
+from sqlalchemy import insert, text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import generate_uuid
+from app.models.dynamic_field import DynamicFieldDefinition
+from app.models.project import Project
+from app.models.requirement import Requirement
+from app.models.user import User
+from app.schemas.requirement import RequirementCreate
+from app.services.dynamic_field_schema import DynamicFieldValidationError, validate_dynamic_fields
+from app.services.change_feed import record_change
+from app.services.dynamic_fields import DYNAMIC_FIELD_FILTER_PREFIX
+
+# Importacao de requisitos de planilhas (CSV ou XLSX). O arquivo e lido em fluxo,
+# validado em lotes de IMPORT_BATCH_SIZE linhas e as linhas validas sao carregadas
+# numa tabela temporaria via COPY (PostgreSQL); ao final um unico INSERT ... SELECT
+# move tudo para requirements. Outros bancos usam INSERT em lote (executemany).
+# Tudo ocorre em uma transacao: ou todas as linhas validas entram, ou nenhuma.
+# As linhas rejeitadas vao para um relatorio CSV em IMPORT_REPORT_DIR, com um
+# arquivo .json ao lado (autor e projeto da importacao) que restringe o download;
+# relatorios mais antigos que IMPORT_REPORT_RETENTION_HOURS sao removidos.
+
+logger = logging.getLogger(__name__)
+
+IMPORT_REPORT_DIR = os.path.join(settings.UPLOAD_DIR, "import_reports")
+
+# Cabecalho aceito -> campo (nomes dos campos ou rotulos do relatorio de exportacao)
+IMPORT_COLUMNS = {
+    "title": "title",
+    "titulo": "title",
+    "description": "description",
+    "descricao": "description",
+    "type": "type",
+    "tipo": "type",
+    "priority": "priority",
+    "prioridade": "priority",
+    "status": "status",
+    "complexity": "complexity",
+    "complexidade": "complexity",
+    "estimated_hours": "estimated_hours",
+    "horas estimadas": "estimated_hours",
+    "actual_hours": "actual_hours",
+    "horas reais": "actual_hours",
+    "due_date": "due_date",
+    "data vencimento": "due_date",
+    "completion_date": "completion_date",
+    "data conclusao": "completion_date",
+    "assigned_to": "assigned_to",
+    "atribuido para": "assigned_to",
+}
+
+_ENUM_FIELDS = ("type", "priority", "status", "complexity")
+_DATE_FIELDS = ("due_date", "completion_date")
+_DATE_FORMATS = ("%d/%m/%Y", "%d/%m/%Y %H:%M", "%d/%m/%Y %H:%M:%S")
+
+# Colunas gravadas pela carga (mesma ordem no COPY e no INSERT ... SELECT)
+_LOAD_COLUMNS = (
+    "id", "title", "description", "type", "priority", "status", "complexity",
+    "estimated_hours", "actual_hours", "due_date", "completion_date",
+    "dynamic_fields", "project_id", "assigned_to", "created_by",
+)
+
+_STAGING_TABLE = "requirement_import_staging"
+
+_CSV_DELIMITERS = (",", ";", "\t")
+
+class ImportFileError(ValueError):
+    """Arquivo ilegivel, formato nao suportado ou sem a coluna de titulo"""
+
+def _read_csv(stream: BinaryIO) -> Iterator[List[Any]]:
+    reader = codecs.getreader("utf-8-sig")(stream)
+    header = reader.readline()
+    # Separador pelo cabecalho (planilhas em portugues costumam exportar com ";")
+    delimiter = max(_CSV_DELIMITERS, key=header.count)
+    yield from csv.reader(itertools.chain([header], reader), delimiter=delimiter)
+
+def _read_xlsx(stream: BinaryIO) -> Iterator[List[Any]]:
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(stream, read_only=True, data_only=True)
+    try:
+        for row in workbook.active.iter_rows(values_only=True):
+            yield list(row)
+    finally:
+        workbook.close()
+
+def read_rows(stream: BinaryIO, filename: str) -> Iterator[List[Any]]:
+    """Linhas do arquivo como listas de valores (a primeira e o cabecalho)"""
+    extension = os.path.splitext(filename or "")[1].lower()
+    if extension == ".csv":
+        return _read_csv(stream)
+    if extension in (".xlsx", ".xlsm"):
+        return _read_xlsx(stream)
+    raise ImportFileError("Formato nao suportado: envie um arquivo .csv ou .xlsx")
+
+def _map_header(header: List[Any], dynamic_names: set) -> List[Optional[Tuple[str, str]]]:
+    """Para cada coluna: ("field", campo), ("dynamic", nome) ou None (coluna ignorada)"""
+    mapping = []
+    for cell in header:
+        name = str(cell or "").strip()
+        key = name.lower()
+        if key in IMPORT_COLUMNS:
+            mapping.append(("field", IMPORT_COLUMNS[key]))
+        elif name.startswith(DYNAMIC_FIELD_FILTER_PREFIX):
+            mapping.append(("dynamic", name[len(DYNAMIC_FIELD_FILTER_PREFIX):]))
+        elif name in dynamic_names:
+            mapping.append(("dynamic", name))
+        else:
+            mapping.append(None)
+    if ("field", "title") not in mapping:
+        raise ImportFileError("Coluna de titulo (title ou Titulo) nao encontrada no cabecalho")
+    return mapping
+
+def _parse_datetime(value: Any) -> Any:
+    if isinstance(value, datetime) or not isinstance(value, (str, date)):
+        return value
+    if isinstance(value, date):
+        return datetime(value.year, value.month, value.day)
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        pass
+    for date_format in _DATE_FORMATS:
+        try:
+            return datetime.strptime(value, date_format)
+        except ValueError:
+            continue
+    return value
+
+def _cell(value: Any) -> Any:
+    if isinstance(value, str):
+        value = value.strip()
+        return value or None
+    return value
+
+def _row_values(row: List[Any], mapping: List[Optional[Tuple[str, str]]]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    values, dynamic = {}, {}
+    for target, cell in zip(mapping, row):
+        cell = _cell(cell)
+        if target is None or cell is None:
+            continue
+        kind, name = target
+        if kind == "dynamic":
+            # Selecao multipla em uma celula: "ROI; Custo"
+            dynamic[name] = [item.strip() for item in cell.split(";")] if isinstance(cell, str) and ";" in cell else cell
+        elif name in _ENUM_FIELDS:
+            # Mesma normalizacao da migracao 0003 ("Nao Funcional" -> "nao_funcional")
+            values[name] = str(cell).lower().replace(" ", "_")
+        elif name in _DATE_FIELDS:
+            values[name] = _parse_datetime(cell)
+        else:
+            values[name] = cell
+    return values, dynamic
+
+class _ErrorReport:
+    """Arquivo CSV com as linhas rejeitadas, criado so quando ha erro"""
+
+    def __init__(self, import_id: str, header: List[Any], owner: Dict[str, Any]):
+        self.path = os.path.join(IMPORT_REPORT_DIR, f"{import_id}.csv")
+        self.header = header
+        self.owner = owner
+        self.count = 0
+        self._file = None
+        self._writer = None
+
+    def add(self, line: int, message: str, row: List[Any]) -> None:
+        if self._writer is None:
+            os.makedirs(IMPORT_REPORT_DIR, exist_ok=True)
+            self._file = open(self.path, "w", newline="", encoding="utf-8-sig")
+            self._writer = csv.writer(self._file)
+            self._writer.writerow(["linha", "erro"] + [str(cell or "") for cell in self.header])
+        self._writer.writerow([line, message] + ["" if cell is None else cell for cell in row])
+        self.count += 1
+
+    def close(self) -> Optional[str]:
+        if self._file:
+            self._file.close()
+            with open(_owner_path(self.path), "w", encoding="utf-8") as owner_file:
+                json.dump(self.owner, owner_file)
+            return self.path
+        return None
+
+def _owner_path(report_path: str) -> str:
+    return os.path.splitext(report_path)[0] + ".json"
+
+def _report_cutoff() -> float:
+    return time.time() - timedelta(hours=settings.IMPORT_REPORT_RETENTION_HOURS).total_seconds()
+
+def get_error_report(import_id: str) -> Optional[Dict[str, Any]]:
+    """Relatorio de erros de uma importacao: path, user_id e project_id (None se nao existir ou expirou)"""
+    try:
+        import_id = uuid.UUID(import_id).hex
+    except ValueError:
+        return None
+    path = os.path.join(IMPORT_REPORT_DIR, f"{import_id}.csv")
+    try:
+        if os.path.getmtime(path) < _report_cutoff():
+            return None
+        with open(_owner_path(path), encoding="utf-8") as owner_file:
+            owner = json.load(owner_file)
+    except (OSError, ValueError):
+        # Sem o arquivo do autor nao ha como verificar o acesso
+        return None
+    return {"path": path, **owner}
+
+_prune_lock = threading.Lock()
+_last_prune = 0.0
+
+def prune_import_reports() -> int:
+    """Remove relatorios de erros alem da retencao (no maximo uma vez por hora por processo)"""
+    global _last_prune
+    with _prune_lock:
+        if time.monotonic() - _last_prune < 3600:
+            return 0
+        _last_prune = time.monotonic()
+
+    cutoff = _report_cutoff()
+    removed = 0
+    try:
+        entries = list(os.scandir(IMPORT_REPORT_DIR))
+    except FileNotFoundError:
+        return 0
+    for entry in entries:
+        try:
+            if entry.is_file() and entry.stat().st_mtime < cutoff:
+                os.remove(entry.path)
+                removed += entry.name.endswith(".csv")
+        except OSError as e:
+            logger.error(f"Erro ao remover relatorio de importacao {entry.name}: {e}")
+    if removed:
+        logger.info(f"Relatorios de erros de importacao removidos: {removed}")
+    return removed
+
+class _CopyLoader:
+    """Carga via COPY numa tabela temporaria e INSERT ... SELECT no final"""
+
+    name = "copy"
+
+    def __init__(self, db: Session):
+        self.db = db
+        columns = ", ".join(_LOAD_COLUMNS)
+        db.execute(text(
+            f"CREATE TEMP TABLE {_STAGING_TABLE} ON COMMIT DROP AS "
+            f"SELECT {columns} FROM requirements WITH NO DATA"
+        ))
+        self.cursor = db.connection().connection.cursor()
+
+    def load(self, rows: List[Dict[str, Any]]) -> None:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in rows:
+            writer.writerow([
+                json.dumps(row[column]) if column == "dynamic_fields"
+                else ("" if row[column] is None else row[column])
+                for column in _LOAD_COLUMNS
+            ])
+        buffer.seek(0)
+        self.cursor.copy_expert(
+            f"COPY {_STAGING_TABLE} ({', '.join(_LOAD_COLUMNS)}) FROM STDIN WITH (FORMAT csv)",
+            buffer
+        )
+
+    def finish(self) -> None:
+        columns = ", ".join(_LOAD_COLUMNS)
+        self.db.execute(text(
+            f"INSERT INTO requirements ({columns}, created_at, updated_at) "
+            f"SELECT {columns}, now(), now() FROM {_STAGING_TABLE}"
+        ))
+        self.cursor.close()
+
+class _ExecutemanyLoader:
+    """Carga com INSERT em lote, para bancos sem COPY"""
+
+    name = "executemany"
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def load(self, rows: List[Dict[str, Any]]) -> None:
+        self.db.execute(insert(Requirement), rows)
+
+    def finish(self) -> None:
+        pass
+
+def import_requirements(
+    db: Session,
+    stream: BinaryIO,
+    filename: str,
+    project_id: str,
+    current_user: User,
+    batch_size: Optional[int] = None,
+    use_copy: Optional[bool] = None
+) -> Dict[str, Any]:
+    """Importa requisitos de um CSV/XLSX para o projeto e retorna contagens, vazao e relatorio de erros"""
+    started = time.perf_counter()
+    batch_size = batch_size or settings.IMPORT_BATCH_SIZE
+    if use_copy is None:
+        use_copy = db.get_bind().dialect.name == "postgresql"
+
+    if not db.query(Project.id).filter(Project.id == project_id).first():
+        raise ImportFileError("Projeto nao encontrado")
+
+    rows = read_rows(stream, filename)
+    try:
+        header = next(rows)
+    except StopIteration:
+        raise ImportFileError("Arquivo vazio")
+    except (UnicodeDecodeError, csv.Error) as e:
+        raise ImportFileError(f"Arquivo ilegivel: {e}")
+
+    dynamic_names = {
+        name for (name,) in db.query(DynamicFieldDefinition.field_name).filter(
+            DynamicFieldDefinition.applies_to == "requirement",
+            DynamicFieldDefinition.is_active == True
+        )
+    }
+    mapping = _map_header(header, dynamic_names)
+
+    import_id = uuid.uuid4().hex
+    report = _ErrorReport(import_id, header, {"user_id": str(current_user.id), "project_id": str(project_id)})
+    loader = _CopyLoader(db) if use_copy else _ExecutemanyLoader(db)
+    counts = {"read": 0, "imported": 0}
+
+    def flush(batch: List[Tuple[int, List[Any], Dict[str, Any]]]) -> None:
+        # Responsaveis do lote resolvidos por username ou email em uma consulta
+        logins = {values["assigned_to"] for _, _, values in batch if values.get("assigned_to")}
+        users = {}
+        if logins:
+            for user_id, username, email in db.query(User.id, User.username, User.email).filter(
+                (User.username.in_(logins)) | (User.email.in_(logins))
+            ):
+                users[username] = users[email] = user_id
+
+        valid = []
+        for line, raw, values in batch:
+            try:
+                login = values.pop("assigned_to", None)
+                if login:
+                    if login not in users:
+                        raise ValueError(f"Usuario atribuido nao encontrado: {login}")
+                    values["assigned_to"] = users[login]
+                requirement = RequirementCreate(project_id=project_id, **values)
+                dynamic_fields = validate_dynamic_fields(db, requirement.dynamic_fields)
+            except ValidationError as e:
+                report.add(line, "; ".join(
+                    f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in e.errors()
+                ), raw)
+                continue
+            except (DynamicFieldValidationError, ValueError) as e:
+                report.add(line, str(e), raw)
+                continue
+
+            valid.append({
+                **requirement.dict(exclude={"dynamic_fields"}),
+                "id": generate_uuid(),
+                "dynamic_fields": dynamic_fields,
+                "project_id": project_id,
+                "created_by": current_user.id,
+            })
+
+        if valid:
+            loader.load(valid)
+            counts["imported"] += len(valid)
+
+    try:
+        batch = []
+        for line, row in enumerate(rows, start=2):
+            if not any(_cell(cell) is not None for cell in row):
+                continue
+            counts["read"] += 1
+            values, dynamic = _row_values(row, mapping)
+            values["dynamic_fields"] = dynamic
+            batch.append((line, row, values))
+            if len(batch) >= batch_size:
+                flush(batch)
+                batch = []
+        if batch:
+            flush(batch)
+
+        loader.finish()
+        if counts["imported"]:
+            # Linhas carregadas por COPY/INSERT em lote, sem ids individuais: o
+            # cliente recarrega a listagem do projeto
+            record_change(db, "requirement", "imported", project_id=project_id)
+        db.commit()
+    except (UnicodeDecodeError, csv.Error) as e:
+        db.rollback()
+        raise ImportFileError(f"Arquivo ilegivel: {e}")
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        report_path = report.close()
+
+    elapsed = time.perf_counter() - started
+    logger.info(
+        f"Importacao {import_id}: {counts['imported']} de {counts['read']} linhas em {elapsed:.2f}s ({loader.name})"
+    )
+    return {
+        "import_id": import_id,
+        "rows_read": counts["read"],
+        "imported": counts["imported"],
+        "failed": report.count,
+        "loader": loader.name,
+        "elapsed_seconds": round(elapsed, 3),
+        "rows_per_second": round(counts["read"] / elapsed, 1) if elapsed else None,
+        "error_report": import_id if report_path else None
+    }
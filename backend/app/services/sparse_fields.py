@@ -0,0 +1,149 @@
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type
+
+from pydantic import BaseModel, create_model
+from sqlalchemy import inspect
+from sqlalchemy.orm import Session, joinedload, load_only
+
+from app.models.project import Project
+from app.models.requirement import Requirement
+from app.models.user import User
+from app.schemas.project import ProjectResponse
+from app.schemas.requirement import RequirementResponse
+from app.schemas.user import UserResponse
+from app.services.read_models import project_count_columns, progress
+
+# Campos esparsos (?fields=a,b,c). Os nomes sao validados contra o schema de
+# resposta do endpoint e levados ate o SQL: as listagens selecionam so as
+# colunas pedidas e os detalhes carregam o modelo com load_only, juntando apenas
+# os relacionamentos pedidos. O id vem sempre (e a chave do cursor).
+
+class SparseFieldsError(ValueError):
+    """Parametro fields com campos que o schema de resposta nao tem"""
+
+def parse_fields(value: Optional[str], schema: Type[BaseModel]) -> Optional[List[str]]:
+    """Campos pedidos em fields, na ordem informada (None sem o parametro)"""
+    if value is None:
+        return None
+
+    names = list(dict.fromkeys(name.strip() for name in value.split(",") if name.strip()))
+    if not names:
+        raise SparseFieldsError("fields deve listar ao menos um campo")
+
+    unknown = [name for name in names if name not in schema.model_fields]
+    if unknown:
+        raise SparseFieldsError(
+            f"Campos invalidos em fields: {', '.join(unknown)}. "
+            f"Disponiveis: {', '.join(schema.model_fields)}"
+        )
+
+    if "id" not in names:
+        names.insert(0, "id")
+    return names
+
+@lru_cache(maxsize=None)
+def _partial_schema(schema: Type[BaseModel]) -> Type[BaseModel]:
+    """Schema com todos os campos opcionais; herda os validadores (relacionamentos -> dict)"""
+    return create_model(
+        f"{schema.__name__}Parcial",
+        __base__=schema,
+        **{name: (Optional[field.annotation], None) for name, field in schema.model_fields.items()}
+    )
+
+def serialize_fields(schema: Type[BaseModel], values: Dict[str, Any]) -> Dict[str, Any]:
+    """Valida e serializa apenas os campos informados com as regras do schema de resposta"""
+    return _partial_schema(schema)(**values).model_dump(mode="json", include=set(values))
+
+class SparseSpec:
+    """Como carregar cada campo de um schema de resposta a partir do modelo"""
+    __slots__ = ("model", "schema", "columns", "relationships", "expressions", "derived")
+
+    def __init__(
+        self,
+        model,
+        schema: Type[BaseModel],
+        columns: Dict[str, Tuple[str, ...]] = None,
+        relationships: Dict[str, Any] = None,
+        expressions: Callable[[], Dict[str, Any]] = None,
+        derived: Dict[str, Tuple[Tuple[str, ...], Callable[..., Any]]] = None
+    ):
+        self.model = model
+        self.schema = schema
+        # Propriedades do modelo -> colunas de que dependem (os demais campos sao colunas)
+        self.columns = columns or {}
+        # Campos que sao relacionamentos (joinedload apenas quando pedidos)
+        self.relationships = relationships or {}
+        # Campos calculados no SELECT (ex.: contagens correlacionadas)
+        self.expressions = expressions
+        # Campos calculados em Python a partir de outros campos: (dependencias, funcao)
+        self.derived = derived or {}
+
+REQUIREMENT_FIELDS = SparseSpec(
+    Requirement,
+    RequirementResponse,
+    columns={
+        "is_overdue": ("due_date", "status"),
+        "days_until_due": ("due_date",),
+        "progress_percentage": ("status",),
+    },
+    relationships={
+        "project": Requirement.project,
+        "assigned_user": Requirement.assigned_user,
+        "created_by_user": Requirement.created_by_user,
+    }
+)
+
+PROJECT_FIELDS = SparseSpec(
+    Project,
+    ProjectResponse,
+    relationships={"created_by_user": Project.created_by_user},
+    expressions=project_count_columns,
+    derived={
+        "progress_percentage": (("completed_requirements_count", "requirements_count"), progress),
+    }
+)
+
+USER_FIELDS = SparseSpec(User, UserResponse)
+
+def load_sparse(db: Session, spec: SparseSpec, fields: List[str], *criteria) -> Optional[Dict[str, Any]]:
+    """Carrega uma linha apenas com os campos pedidos e a serializa com o schema (None se nao existir)"""
+    column_keys = {attr.key for attr in inspect(spec.model).column_attrs}
+    expressions = spec.expressions() if spec.expressions else {}
+    load_columns, joins, selected = set(), [], {}
+
+    def require(name: str) -> None:
+        if name in spec.derived:
+            for dependency in spec.derived[name][0]:
+                require(dependency)
+        elif name in expressions:
+            selected[name] = expressions[name].label(name)
+        elif name in spec.relationships:
+            joins.append(joinedload(spec.relationships[name]))
+        elif name in spec.columns:
+            load_columns.update(spec.columns[name])
+        elif name in column_keys:
+            load_columns.add(name)
+
+    for name in fields:
+        require(name)
+
+    options = [load_only(*[getattr(spec.model, key) for key in load_columns]), *joins]
+    row = db.query(spec.model, *selected.values()).options(*options).filter(*criteria).first()
+    if row is None:
+        return None
+
+    if selected:
+        obj, computed = row[0], row._mapping
+    else:
+        obj, computed = row, {}
+
+    values = {}
+    for name in fields:
+        if name in spec.derived:
+            dependencies, function = spec.derived[name]
+            values[name] = function(*[computed[dependency] for dependency in dependencies])
+        elif name in selected:
+            values[name] = computed[name]
+        else:
+            values[name] = getattr(obj, name)
+    return serialize_fields(spec.schema, values)
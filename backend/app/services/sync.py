@@ -0,0 +1,167 @@
+import base64
+import json
+import logging
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import Float, Numeric, cast, delete, exists, select, text, tuple_
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.change_tracking import CHANGE_SEQ_COUNTER, DeletedRecord
+from app.models.dynamic_field import DynamicFieldDefinition
+from app.models.project import Project
+from app.models.requirement import Requirement
+from app.models.table_version import TableVersion
+
+# Sincronizacao incremental (/sync/<recurso>?since=<token>). Cada linha tem
+# change_seq (indice (change_seq, id)) e as exclusoes ficam em deleted_records,
+# ambos gravados por triggers na transacao da escrita, entao valem tambem para
+# escritas em lote, COPY, cascades e SQL direto. Uma sincronizacao le apenas as
+# linhas com change_seq no intervalo [since, marca d'agua) em paginas por keyset:
+# custo proporcional ao numero de mudancas, nao ao tamanho da tabela.
+
+logger = logging.getLogger(__name__)
+
+SYNC_RESOURCES = {
+    "requirements": Requirement.__table__,
+    "projects": Project.__table__,
+    "dynamic-fields": DynamicFieldDefinition.__table__,
+}
+
+class SyncTokenError(ValueError):
+    """Token malformado ou gerado para outro recurso"""
+
+class SyncTokenExpiredError(SyncTokenError):
+    """Token anterior a retencao dos tombstones: o cliente deve refazer a carga completa"""
+
+def _row_columns(table) -> List[Any]:
+    # Colunas da tabela como estao no banco (NUMERIC como float para o orjson)
+    return [
+        (cast(column, Float) if isinstance(column.type, Numeric) else column).label(column.name)
+        for column in table.c
+        if column.name != "change_seq"
+    ]
+
+def encode_token(payload: Dict[str, Any]) -> str:
+    data = json.dumps(payload, separators=(",", ":"))
+    return base64.urlsafe_b64encode(data.encode()).decode().rstrip("=")
+
+def decode_token(token: str, resource: str) -> Dict[str, Any]:
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        payload["issued"] = int(payload["issued"])
+    except (ValueError, TypeError, KeyError) as e:
+        raise SyncTokenError("Token de sincronizacao invalido") from e
+
+    if not isinstance(payload, dict) or payload.get("resource") != resource:
+        raise SyncTokenError("Token de sincronizacao gerado para outro recurso")
+    retention = timedelta(days=settings.SYNC_TOMBSTONE_RETENTION_DAYS).total_seconds()
+    if time.time() - payload["issued"] > retention:
+        raise SyncTokenExpiredError("Token de sincronizacao expirado; refaca a sincronizacao completa")
+    return payload
+
+def current_watermark(db: Session) -> int:
+    """Menor change_seq que uma escrita ainda nao visivel pode ter (proximo since)"""
+    if db.get_bind().dialect.name == "postgresql":
+        return db.execute(text("SELECT pg_snapshot_xmin(pg_current_snapshot())::text::bigint")).scalar()
+    return db.execute(
+        select(TableVersion.version).where(TableVersion.table_name == CHANGE_SEQ_COUNTER, TableVersion.shard == 0)
+    ).scalar() + 1
+
+def _after(columns, position: Optional[List[Any]]) -> List[Any]:
+    return [tuple_(*columns) > tuple(position)] if position else []
+
+def sync_changes(db: Session, resource: str, token: Optional[str], limit: int) -> Dict[str, Any]:
+    """Uma pagina de mudancas do recurso desde o token (sem token: carga completa)
+
+    Retorna as linhas alteradas (items), os ids excluidos (deleted, apenas com
+    token) e next_token. Com has_more o next_token continua a mesma
+    sincronizacao; sem has_more e o since da proxima.
+    """
+    table = SYNC_RESOURCES[resource]
+    if token:
+        state = decode_token(token, resource)
+    else:
+        state = {"resource": resource, "since": None, "issued": int(time.time())}
+    if state.get("until") is None:
+        # Marca d'agua lida antes das linhas: escritas confirmadas depois dela ficam para o proximo token
+        state["until"] = current_watermark(db)
+
+    since = state["since"] or 0
+    until = state["until"]
+    rows = db.execute(
+        select(*_row_columns(table), table.c.change_seq)
+        .where(table.c.change_seq >= since, table.c.change_seq < until, *_after(
+            (table.c.change_seq, table.c.id), state.get("after")
+        ))
+        .order_by(table.c.change_seq, table.c.id)
+        .limit(limit + 1)
+    ).all()
+
+    tombstones = []
+    if state["since"] is not None:
+        deleted = DeletedRecord.__table__.c
+        tombstones = db.execute(
+            select(deleted.id, deleted.record_id, deleted.change_seq, deleted.deleted_at)
+            .where(
+                deleted.table_name == table.name,
+                deleted.change_seq >= since,
+                deleted.change_seq < until,
+                # Ids recriados depois da exclusao (upsert) voltam como linhas
+                ~exists().where(table.c.id == deleted.record_id),
+                *_after((deleted.change_seq, deleted.id), state.get("after_deleted"))
+            )
+            .order_by(deleted.change_seq, deleted.id)
+            .limit(limit + 1)
+        ).all()
+
+    has_more = len(rows) > limit or len(tombstones) > limit
+    rows, tombstones = rows[:limit], tombstones[:limit]
+    if has_more:
+        if rows:
+            state["after"] = [rows[-1].change_seq, rows[-1].id]
+        if tombstones:
+            state["after_deleted"] = [tombstones[-1].change_seq, tombstones[-1].id]
+        next_state = state
+    else:
+        next_state = {"resource": resource, "since": until, "issued": int(time.time())}
+
+    names = [column.name for column in table.c if column.name != "change_seq"]
+    return {
+        "items": [dict(zip(names, row)) for row in rows],
+        "deleted": [{"id": row.record_id, "deleted_at": row.deleted_at} for row in tombstones],
+        "next_token": encode_token(next_state),
+        "has_more": has_more,
+    }
+
+_prune_lock = threading.Lock()
+_last_prune = 0.0
+
+def prune_tombstones(session_factory=SessionLocal) -> int:
+    """Remove tombstones alem da retencao (no maximo uma vez por hora por processo)"""
+    global _last_prune
+    with _prune_lock:
+        if time.monotonic() - _last_prune < 3600:
+            return 0
+        _last_prune = time.monotonic()
+
+    # Um dia de folga sobre a validade dos tokens
+    cutoff = datetime.utcnow() - timedelta(days=settings.SYNC_TOMBSTONE_RETENTION_DAYS + 1)
+    db = session_factory()
+    try:
+        deleted = db.execute(delete(DeletedRecord).where(DeletedRecord.deleted_at < cutoff)).rowcount
+        db.commit()
+        if deleted:
+            logger.info(f"Tombstones de sincronizacao removidos: {deleted}")
+        return deleted
+    except Exception as e:
+        logger.error(f"Erro ao remover tombstones de sincronizacao: {e}")
+        db.rollback()
+        return 0
+    finally:
+        db.close()
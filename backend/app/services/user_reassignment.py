@@ -0,0 +1,140 @@
+from typing import Dict, Optional
+
+from sqlalchemy import case, func, literal, null, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.core.database import GUID
+from app.models.backfill import DynamicFieldBackfill
+from app.models.enums import OPEN_REQUIREMENT_STATUSES
+from app.models.project import Project
+from app.models.project_clone import ProjectClone
+from app.models.project_purge import ProjectPurge
+from app.models.requirement import Requirement
+from app.models.user import User
+from app.services.change_feed import record_change
+
+# Reatribuicao do trabalho de um usuario desativado ou removido: os requisitos
+# abertos atribuidos a ele passam para outro usuario (ou ficam sem responsavel) e
+# os projetos criados por ele passam para um novo dono, com um UPDATE por tabela
+# e um evento do feed de mudancas por projeto afetado.
+# Na exclusao as FKs obrigam a mover tambem os requisitos encerrados (ficam sem
+# responsavel) e a autoria (created_by) dos requisitos; nos jobs em background
+# (backfill, expurgo e clonagem) a autoria e opcional e fica nula.
+
+# Jobs cuja autoria (created_by, opcional) referencia users
+JOB_TABLES = (DynamicFieldBackfill.__table__, ProjectPurge.__table__, ProjectClone.__table__)
+
+class ReassignmentError(ValueError):
+    """Destino de reatribuicao invalido"""
+
+def resolve_reassignment_target(db: Session, user: User, reassign_to: Optional[str]) -> Optional[User]:
+    """Valida o usuario de destino (None = requisitos ficam sem responsavel)"""
+    if not reassign_to:
+        return None
+
+    target = db.query(User).filter(User.id == reassign_to).first()
+    if not target:
+        raise ReassignmentError("Usuario de destino nao encontrado")
+    if target.id == user.id:
+        raise ReassignmentError("O usuario de destino deve ser diferente do usuario reatribuido")
+    if not target.is_active:
+        raise ReassignmentError("Usuario de destino esta inativo")
+    return target
+
+def preview_reassignment(db: Session, user_id: str, deleting: bool = False) -> Dict[str, int]:
+    """Quantidade de registros que a reatribuicao alteraria (uma consulta)"""
+    is_open = Requirement.status.in_(OPEN_REQUIREMENT_STATUSES)
+    assigned = Requirement.assigned_to == user_id
+
+    requirements = (
+        select(
+            func.coalesce(func.sum(case((assigned & is_open, 1), else_=0)), 0).label("open_requirements"),
+            func.coalesce(func.sum(case((assigned & ~is_open, 1), else_=0)), 0).label("closed_requirements"),
+            func.coalesce(func.sum(case((Requirement.created_by == user_id, 1), else_=0)), 0).label("created_requirements"),
+        )
+        .where(or_(assigned, Requirement.created_by == user_id))
+        .subquery()
+    )
+    projects = select(func.count(Project.id)).where(Project.created_by == user_id).scalar_subquery()
+
+    row = db.execute(select(requirements, projects.label("projects"))).one()
+    return {
+        "open_requirements": row.open_requirements,
+        # Encerrados e autoria so mudam na exclusao
+        "closed_requirements": row.closed_requirements if deleting else 0,
+        "created_requirements": row.created_requirements if deleting else 0,
+        "projects": row.projects,
+    }
+
+def reassign_user_work(
+    db: Session,
+    user: User,
+    target: Optional[User],
+    owner: User,
+    deleting: bool = False
+) -> Dict[str, int]:
+    """Move requisitos e projetos do usuario (target: novo responsavel; owner: novo dono dos projetos)
+
+    Nao faz commit: roda na mesma transacao da desativacao/exclusao.
+    Retorna o numero de linhas alteradas por tabela.
+    """
+    requirements = Requirement.__table__
+    projects = Project.__table__
+    target_id = literal(target.id, GUID) if target else null()
+    is_open = requirements.c.status.in_(OPEN_REQUIREMENT_STATUSES)
+    is_assigned = requirements.c.assigned_to == user.id
+
+    if deleting:
+        condition = or_(is_assigned, requirements.c.created_by == user.id)
+        statement = (
+            update(requirements)
+            .where(condition)
+            .values(
+                assigned_to=case(
+                    (is_assigned & is_open, target_id),
+                    (is_assigned, null()),
+                    else_=requirements.c.assigned_to
+                ),
+                created_by=case(
+                    (requirements.c.created_by == user.id, literal(owner.id, GUID)),
+                    else_=requirements.c.created_by
+                ),
+                updated_at=func.now()
+            )
+        )
+    else:
+        condition = is_assigned & is_open
+        statement = (
+            update(requirements)
+            .where(condition)
+            .values(assigned_to=target_id, updated_at=func.now())
+        )
+
+    # Um evento por projeto afetado (sem id), em vez de um por requisito alterado
+    changed_projects = db.execute(
+        select(requirements.c.project_id).where(condition).group_by(requirements.c.project_id)
+    ).scalars().all()
+    owned_projects = db.execute(select(projects.c.id).where(projects.c.created_by == user.id)).scalars().all()
+
+    requirement_rows = db.execute(statement).rowcount
+    project_rows = db.execute(
+        update(projects)
+        .where(projects.c.created_by == user.id)
+        .values(created_by=owner.id, updated_at=func.now())
+    ).rowcount
+
+    for project_id in changed_projects:
+        record_change(db, "requirement", "reassigned", project_id=project_id)
+    for project_id in owned_projects:
+        record_change(db, "project", "updated", project_id, project_id)
+
+    if deleting:
+        for table in JOB_TABLES:
+            # updated_at e o lease do job (job_leases): mantido para nao interferir no worker
+            db.execute(
+                update(table)
+                .where(table.c.created_by == user.id)
+                .values(created_by=None, updated_at=table.c.updated_at)
+            )
+
+    return {"requirements": requirement_rows, "projects": project_rows}
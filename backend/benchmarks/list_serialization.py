@@ -0,0 +1,142 @@
+"""Benchmark das listagens resumidas: ORM + Pydantic + json vs modelos de leitura + orjson
+
+Para requisitos, projetos e usuarios monta uma pagina de N linhas como antes
+(objetos ORM validados com o schema de resposta e serializados com json, como o
+response_model fazia) e pelo caminho rapido (registros de app.services.read_models
+e ORJSONResponse). Mostra o tempo de CPU por resposta, incluindo a consulta.
+Os registros de teste sao criados no inicio e removidos ao final.
+
+Uso:
+    cd backend
+    python -m benchmarks.list_serialization --rows 1000 --repeat 20
+"""
+import argparse
+import json
+import time
+import uuid
+from typing import List
+
+from fastapi.responses import ORJSONResponse
+from pydantic import TypeAdapter
+from sqlalchemy import insert
+
+from app.core.database import SessionLocal
+from app.models.enums import RequirementStatus
+from app.models.project import Project
+from app.models.requirement import Requirement
+from app.models.user import User
+from app.schemas.project import ProjectResponseSummary
+from app.schemas.requirement import RequirementResponseSummary
+from app.schemas.user import UserResponseSafe
+from app.services.read_models import (
+    RequirementSummaryRecord, UserSafeRecord, project_summary_records, project_summary_select,
+    requirement_summary_select, to_records, user_safe_select
+)
+from app.services.pagination import paginate
+
+REQUIREMENT_SORT = {"created_at": Requirement.created_at}
+PROJECT_SORT = {"created_at": Project.created_at}
+
+def _seed(db, rows: int, tag: str) -> None:
+    owner = User(username=f"bench_{tag}_owner", email=f"bench_{tag}_owner@example.com", password_hash="x" * 60)
+    db.add(owner)
+    db.flush()
+    db.execute(insert(User), [
+        {"id": str(uuid.uuid4()), "username": f"bench_{tag}_{i}", "email": f"bench_{tag}_{i}@example.com",
+         "password_hash": "x" * 60}
+        for i in range(rows)
+    ])
+    projects = [
+        {"id": str(uuid.uuid4()), "name": f"Benchmark {tag} {i}", "created_by": owner.id}
+        for i in range(rows)
+    ]
+    db.execute(insert(Project), projects)
+    statuses = list(RequirementStatus)
+    db.execute(insert(Requirement), [
+        {"title": f"Benchmark {tag} {i}", "project_id": projects[i % 50]["id"], "created_by": owner.id,
+         "status": statuses[i % len(statuses)]}
+        for i in range(rows)
+    ])
+    db.commit()
+
+def _cleanup(db, tag: str) -> None:
+    db.query(Requirement).filter(Requirement.title.like(f"Benchmark {tag}%")).delete(synchronize_session=False)
+    db.query(Project).filter(Project.name.like(f"Benchmark {tag}%")).delete(synchronize_session=False)
+    db.query(User).filter(User.username.like(f"bench_{tag}%")).delete(synchronize_session=False)
+    db.commit()
+
+def _render_old(schema, objects) -> bytes:
+    # Caminho do response_model: validacao por linha, dump e json da stdlib
+    adapter = TypeAdapter(List[schema])
+    content = adapter.dump_python(adapter.validate_python(objects, from_attributes=True), mode="json")
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+def _scenarios(rows: int, tag: str):
+    def requirements_old(db):
+        query = db.query(Requirement).filter(Requirement.title.like(f"Benchmark {tag}%"))
+        items, _ = paginate(query, "-created_at", REQUIREMENT_SORT, Requirement.id, rows)
+        return _render_old(RequirementResponseSummary, items)
+
+    def requirements_new(db):
+        query = requirement_summary_select("-created_at", REQUIREMENT_SORT)
+        query = query.filter(Requirement.title.like(f"Benchmark {tag}%"))
+        items, _ = paginate(query, "-created_at", REQUIREMENT_SORT, Requirement.id, rows, db=db)
+        return ORJSONResponse(to_records(items, RequirementSummaryRecord)).body
+
+    def projects_old(db):
+        query = db.query(Project).filter(Project.name.like(f"Benchmark {tag}%"))
+        items, _ = paginate(query, "-created_at", PROJECT_SORT, Project.id, rows)
+        return _render_old(ProjectResponseSummary, items)
+
+    def projects_new(db):
+        query = project_summary_select("-created_at", PROJECT_SORT)
+        query = query.filter(Project.name.like(f"Benchmark {tag}%"))
+        items, _ = paginate(query, "-created_at", PROJECT_SORT, Project.id, rows, db=db)
+        return ORJSONResponse(project_summary_records(items)).body
+
+    def users_old(db):
+        query = db.query(User).filter(User.username.like(f"bench_{tag}_%")).order_by(User.username)
+        return _render_old(UserResponseSafe, query.limit(rows).all())
+
+    def users_new(db):
+        query = user_safe_select()
+        query = query.filter(User.username.like(f"bench_{tag}_%")).order_by(User.username)
+        return ORJSONResponse(to_records(db.execute(query.limit(rows)), UserSafeRecord)).body
+
+    return [
+        ("requisitos", requirements_old, requirements_new),
+        ("projetos", projects_old, projects_new),
+        ("usuarios", users_old, users_new),
+    ]
+
+def _cpu_ms(scenario, repeat: int) -> float:
+    # Sessao nova por resposta, como nas requisicoes (sem identity map aquecido)
+    total = 0.0
+    for _ in range(repeat):
+        db = SessionLocal()
+        started = time.process_time()
+        scenario(db)
+        total += time.process_time() - started
+        db.close()
+    return total / repeat * 1000
+
+def run(rows: int, repeat: int) -> None:
+    tag = uuid.uuid4().hex[:8]
+    db = SessionLocal()
+    _seed(db, rows, tag)
+    try:
+        print(f"{'listagem':<12} {'linhas':>7} {'antes ms CPU':>13} {'depois ms CPU':>14} {'ganho':>7}")
+        for name, old, new in _scenarios(rows, tag):
+            old_ms = _cpu_ms(old, repeat)
+            new_ms = _cpu_ms(new, repeat)
+            print(f"{name:<12} {rows:>7} {old_ms:>13.1f} {new_ms:>14.1f} {old_ms / new_ms:>6.1f}x")
+    finally:
+        _cleanup(db, tag)
+        db.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    run(args.rows, args.repeat)
@@ -0,0 +1,195 @@
+"""Benchmark dos modelos de leitura: instancias ORM vs select() Core + registros com __slots__
+
+Mede latencia e pico de memoria (tracemalloc) por requisicao em quatro caminhos:
+
+    lista       GET /requirements/?limit=N (resposta serializada)
+    exp. req.   GET /reports/requirements/export (CSV de N requisitos)
+    exp. proj.  GET /reports/projects/export (CSV dos projetos)
+    resumo      GET /reports/project/{id}/summary (projeto com N requisitos)
+
+"orm" reproduz o codigo anterior (modelo ORM completo, relacionamentos lazy e
+propriedades Python); "leitura" usa app.services.read_models. Os registros de
+teste sao criados no inicio e removidos ao final.
+
+Uso:
+    cd backend
+    python -m benchmarks.read_models --rows 1000 --repeat 10
+"""
+import argparse
+import io
+import json
+import time
+import tracemalloc
+import uuid
+from typing import List
+
+import orjson
+import pandas as pd
+from pydantic import TypeAdapter
+from sqlalchemy import insert
+
+from app.core.database import SessionLocal
+from app.models.enums import RequirementStatus
+from app.models.project import Project
+from app.models.requirement import Requirement
+from app.models.user import User
+from app.schemas.requirement import RequirementResponseSummary
+from app.services.read_models import (
+    RequirementSummaryRecord, requirement_breakdown, requirement_export_select, project_export_select,
+    requirement_summary_select, to_records
+)
+
+def _seed(db, rows: int, tag: str) -> str:
+    users = [
+        {"id": str(uuid.uuid4()), "username": f"bench_{tag}_{i}", "email": f"bench_{tag}_{i}@example.com",
+         "password_hash": "x" * 60, "first_name": "Usuario", "last_name": str(i)}
+        for i in range(20)
+    ]
+    db.execute(insert(User), users)
+    projects = [
+        {"id": str(uuid.uuid4()), "name": f"Benchmark {tag} {i}", "created_by": users[i % 20]["id"]}
+        for i in range(rows)
+    ]
+    db.execute(insert(Project), projects)
+    statuses = list(RequirementStatus)
+    # Todos os requisitos no primeiro projeto (resumo) e referenciando usuarios (exportacao)
+    db.execute(insert(Requirement), [
+        {"title": f"Benchmark {tag} {i}", "description": "Descricao " * 20, "project_id": projects[0]["id"],
+         "created_by": users[i % 20]["id"], "assigned_to": users[(i + 1) % 20]["id"],
+         "status": statuses[i % len(statuses)], "dynamic_fields": {"campo": i, "texto": "valor " * 10}}
+        for i in range(rows)
+    ])
+    db.commit()
+    return projects[0]["id"]
+
+def _cleanup(db, tag: str) -> None:
+    db.query(Requirement).filter(Requirement.title.like(f"Benchmark {tag}%")).delete(synchronize_session=False)
+    db.query(Project).filter(Project.name.like(f"Benchmark {tag}%")).delete(synchronize_session=False)
+    db.query(User).filter(User.username.like(f"bench_{tag}%")).delete(synchronize_session=False)
+    db.commit()
+
+def _csv(df: pd.DataFrame) -> bytes:
+    buffer = io.StringIO()
+    df.to_csv(buffer, index=False)
+    return buffer.getvalue().encode("utf-8-sig")
+
+def _frame(db, query) -> pd.DataFrame:
+    result = db.execute(query)
+    return pd.DataFrame(result.all(), columns=list(result.keys()))
+
+def _scenarios(rows: int, tag: str, project_id: str):
+    requirement_filter = Requirement.title.like(f"Benchmark {tag}%")
+    project_filter = Project.name.like(f"Benchmark {tag}%")
+
+    def list_orm(db):
+        items = db.query(Requirement).filter(requirement_filter).order_by(Requirement.created_at.desc()).limit(rows).all()
+        adapter = TypeAdapter(List[RequirementResponseSummary])
+        content = adapter.dump_python(adapter.validate_python(items, from_attributes=True), mode="json")
+        return json.dumps(content, separators=(",", ":")).encode("utf-8")
+
+    def list_read(db):
+        query = requirement_summary_select("-created_at", {}).filter(requirement_filter)
+        query = query.order_by(Requirement.created_at.desc()).limit(rows)
+        return orjson.dumps(to_records(db.execute(query), RequirementSummaryRecord))
+
+    def requirement_export_orm(db):
+        data = []
+        for req in db.query(Requirement).filter(requirement_filter).all():
+            data.append({
+                "ID": req.id, "Titulo": req.title, "Descricao": req.description, "Tipo": req.type,
+                "Prioridade": req.priority, "Status": req.status, "Complexidade": req.complexity,
+                "Horas Estimadas": req.estimated_hours, "Horas Reais": req.actual_hours,
+                "Data Vencimento": req.due_date, "Data Conclusao": req.completion_date,
+                "Projeto": req.project.name if req.project else "",
+                "Atribuido Para": req.assigned_user.full_name if req.assigned_user else "",
+                "Criado Por": req.created_by_user.full_name if req.created_by_user else "",
+                "Atrasado": req.is_overdue, "Progresso (%)": req.progress_percentage,
+                "Data Criacao": req.created_at, "Data Atualizacao": req.updated_at
+            })
+        return _csv(pd.DataFrame(data))
+
+    def requirement_export_read(db):
+        return _csv(_frame(db, requirement_export_select().filter(requirement_filter)))
+
+    def project_export_orm(db):
+        data = []
+        for project in db.query(Project).filter(project_filter).all():
+            data.append({
+                "ID": project.id, "Nome": project.name, "Descricao": project.description,
+                "Status": project.status, "Prioridade": project.priority, "Cliente": project.client_name,
+                "Orcamento": project.budget, "Data Inicio": project.start_date, "Data Fim": project.end_date,
+                "Requisitos": project.requirements_count, "Progresso (%)": project.progress_percentage,
+                "Criado Por": project.created_by_user.full_name if project.created_by_user else "",
+                "Data Criacao": project.created_at, "Data Atualizacao": project.updated_at
+            })
+        return _csv(pd.DataFrame(data))
+
+    def project_export_read(db):
+        return _csv(_frame(db, project_export_select().filter(project_filter)))
+
+    def summary_orm(db):
+        requirements = db.get(Project, project_id).requirements
+        counts = {}
+        for req in requirements:
+            for key in (req.status, req.type, req.priority, req.is_overdue):
+                counts[key] = counts.get(key, 0) + 1
+        return counts
+
+    def summary_read(db):
+        counts = {}
+        for group in requirement_breakdown(db, project_id):
+            for key in (group.status, group.type, group.priority, group.is_overdue):
+                counts[key] = counts.get(key, 0) + group.count
+        return counts
+
+    return [
+        ("lista", list_orm, list_read),
+        ("exp. req.", requirement_export_orm, requirement_export_read),
+        ("exp. proj.", project_export_orm, project_export_read),
+        ("resumo", summary_orm, summary_read),
+    ]
+
+def _measure(scenario, repeat: int):
+    """(ms por requisicao, pico de memoria em KB); sessao nova a cada requisicao"""
+    elapsed = 0.0
+    for _ in range(repeat):
+        db = SessionLocal()
+        started = time.perf_counter()
+        scenario(db)
+        elapsed += time.perf_counter() - started
+        db.close()
+
+    # Pico medido em uma execucao separada (tracemalloc distorce o tempo)
+    db = SessionLocal()
+    tracemalloc.start()
+    scenario(db)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    db.close()
+    return elapsed / repeat * 1000, peak / 1024
+
+def run(rows: int, repeat: int) -> None:
+    tag = uuid.uuid4().hex[:8]
+    db = SessionLocal()
+    project_id = _seed(db, rows, tag)
+    try:
+        print(f"{'caminho':<11} {'linhas':>7} {'orm ms':>8} {'leitura ms':>11} {'orm KB':>9} {'leitura KB':>11}")
+        for name, orm, read in _scenarios(rows, tag, project_id):
+            # Aquece o cache de compilacao das consultas antes de medir
+            for scenario in (orm, read):
+                warm = SessionLocal()
+                scenario(warm)
+                warm.close()
+            orm_ms, orm_kb = _measure(orm, repeat)
+            read_ms, read_kb = _measure(read, repeat)
+            print(f"{name:<11} {rows:>7} {orm_ms:>8.1f} {read_ms:>11.1f} {orm_kb:>9.0f} {read_kb:>11.0f}")
+    finally:
+        _cleanup(db, tag)
+        db.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+    run(args.rows, args.repeat)
@@ -0,0 +1,72 @@
+"""Benchmark da importacao de requisitos: COPY + INSERT ... SELECT vs INSERT em lote
+
+Gera um CSV sintetico, importa no mesmo projeto com cada estrategia de carga e
+mostra linhas/s. O projeto temporario e os requisitos importados sao removidos
+ao final.
+
+Uso:
+    cd backend
+    python -m benchmarks.requirement_import --rows 50000
+"""
+import argparse
+import csv
+import io
+
+from app.core.database import SessionLocal
+from app.models.project import Project
+from app.models.requirement import Requirement
+from app.models.user import User
+from app.services.requirement_import import import_requirements
+
+def _build_csv(rows: int) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, delimiter=";")
+    writer.writerow(["Titulo", "Descricao", "Tipo", "Prioridade", "Horas Estimadas", "Data Vencimento"])
+    for index in range(rows):
+        writer.writerow([
+            f"Requisito {index}",
+            "Descricao gerada para o benchmark",
+            "Nao Funcional" if index % 2 else "Funcional",
+            ("Baixa", "Media", "Alta")[index % 3],
+            f"{index % 40},5",
+            f"{index % 28 + 1:02d}/12/2026",
+        ])
+    return buffer.getvalue().encode("utf-8-sig")
+
+def run(rows: int, batch_size: int) -> None:
+    db = SessionLocal()
+    user = db.query(User).filter(User.is_superuser == True).first()
+    if not user:
+        raise SystemExit("Nenhum superusuario encontrado para registrar a importacao")
+
+    project = Project(name="Benchmark de importacao", created_by=user.id)
+    db.add(project)
+    db.commit()
+    content = _build_csv(rows)
+
+    strategies = [("executemany", False)]
+    if db.get_bind().dialect.name == "postgresql":
+        strategies.insert(0, ("copy", True))
+
+    try:
+        print(f"{'carga':<12} {'linhas':>8} {'segundos':>10} {'linhas/s':>10}")
+        for name, use_copy in strategies:
+            result = import_requirements(
+                db, io.BytesIO(content), "benchmark.csv", project.id, user,
+                batch_size=batch_size, use_copy=use_copy
+            )
+            print(f"{name:<12} {result['imported']:>8} {result['elapsed_seconds']:>10.2f} {result['rows_per_second']:>10.0f}")
+            db.query(Requirement).filter(Requirement.project_id == project.id).delete(synchronize_session=False)
+            db.commit()
+    finally:
+        db.query(Requirement).filter(Requirement.project_id == project.id).delete(synchronize_session=False)
+        db.delete(project)
+        db.commit()
+        db.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+    run(args.rows, args.batch_size)
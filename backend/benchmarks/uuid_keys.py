@@ -0,0 +1,86 @@
+"""Benchmark de chaves VARCHAR(36) vs UUID nativo no PostgreSQL
+
+Cria duas tabelas temporarias com o mesmo conteudo (id + project_id), uma com
+chaves em texto e outra com UUID nativo, e compara tamanho dos indices e tempo
+de buscas por chave primaria e por chave estrangeira.
+
+Uso:
+    cd backend
+    python -m benchmarks.uuid_keys --rows 200000 --lookups 2000
+"""
+import argparse
+import random
+import time
+import uuid
+
+from sqlalchemy import create_engine, text
+
+from app.core.config import settings
+
+VARIANTS = {
+    "varchar36": "VARCHAR(36)",
+    "uuid": "UUID",
+}
+
+def _setup(connection, table: str, column_type: str, rows: int, projects: int) -> None:
+    connection.execute(text(f"DROP TABLE IF EXISTS {table}"))
+    connection.execute(text(
+        f"CREATE TEMP TABLE {table} (id {column_type} PRIMARY KEY, project_id {column_type} NOT NULL)"
+    ))
+    connection.execute(text(f"""
+        INSERT INTO {table} (id, project_id)
+        SELECT md5(g::text)::uuid::text::{column_type},
+               md5((g % {projects})::text || 'p')::uuid::text::{column_type}
+        FROM generate_series(1, {rows}) AS g
+    """))
+    connection.execute(text(f"CREATE INDEX {table}_project_id_idx ON {table} (project_id)"))
+    connection.execute(text(f"ANALYZE {table}"))
+
+def _index_sizes(connection, table: str) -> dict:
+    return {
+        "pk_bytes": connection.execute(text(f"SELECT pg_relation_size('{table}_pkey')")).scalar(),
+        "fk_index_bytes": connection.execute(text(f"SELECT pg_relation_size('{table}_project_id_idx')")).scalar(),
+        "table_bytes": connection.execute(text(f"SELECT pg_relation_size('{table}')")).scalar(),
+    }
+
+def _time_lookups(connection, table: str, keys: list, column: str) -> float:
+    statement = text(f"SELECT count(*) FROM {table} WHERE {column} = :key")
+    start = time.perf_counter()
+    for key in keys:
+        connection.execute(statement, {"key": key}).scalar()
+    return time.perf_counter() - start
+
+def run(rows: int, lookups: int, projects: int) -> None:
+    engine = create_engine(settings.DATABASE_URL)
+    if engine.dialect.name != "postgresql":
+        raise SystemExit("Este benchmark requer PostgreSQL")
+
+    with engine.connect() as connection:
+        ids = [str(uuid.UUID(row[0])) for row in connection.execute(text(
+            f"SELECT md5(g::text)::uuid::text FROM generate_series(1, {rows}) AS g ORDER BY random() LIMIT {lookups}"
+        ))]
+        project_ids = [str(uuid.UUID(row[0])) for row in connection.execute(text(
+            f"SELECT md5((g % {projects})::text || 'p')::uuid::text FROM generate_series(1, {projects}) AS g"
+        ))]
+        project_keys = [random.choice(project_ids) for _ in range(lookups)]
+
+        print(f"{'variante':<10} {'pk (KB)':>10} {'fk idx (KB)':>12} {'tabela (KB)':>12} {'pk ms/op':>10} {'fk ms/op':>10}")
+        for name, column_type in VARIANTS.items():
+            table = f"bench_keys_{name}"
+            _setup(connection, table, column_type, rows, projects)
+            sizes = _index_sizes(connection, table)
+            pk_time = _time_lookups(connection, table, ids, "id")
+            fk_time = _time_lookups(connection, table, project_keys, "project_id")
+            print(
+                f"{name:<10} {sizes['pk_bytes'] / 1024:>10.0f} {sizes['fk_index_bytes'] / 1024:>12.0f} "
+                f"{sizes['table_bytes'] / 1024:>12.0f} {pk_time / lookups * 1000:>10.3f} {fk_time / lookups * 1000:>10.3f}"
+            )
+        connection.rollback()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--lookups", type=int, default=2000)
+    parser.add_argument("--projects", type=int, default=500)
+    args = parser.parse_args()
+    run(args.rows, args.lookups, args.projects)
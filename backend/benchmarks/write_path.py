@@ -0,0 +1,166 @@
+"""Benchmark do caminho de escrita: commit + refresh vs RETURNING com expire_on_commit=False
+
+Para cada entidade (usuario, projeto, requisito, campo dinamico) executa N
+criacoes e N atualizacoes como os endpoints fazem, serializando a resposta com o
+schema da API, em duas configuracoes de sessao:
+
+    refresh    expire_on_commit=True + db.refresh(obj) apos cada commit (antigo)
+    returning  expire_on_commit=False, valores gerados no banco via RETURNING
+
+Mostra escritas/s e instrucoes SQL por escrita. Os registros criados sao
+removidos ao final.
+
+Uso:
+    cd backend
+    python -m benchmarks.write_path --writes 500
+"""
+import argparse
+import time
+import uuid
+
+from sqlalchemy import event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.core.database import engine
+from app.models.dynamic_field import DynamicFieldDefinition
+from app.models.project import Project
+from app.models.requirement import Requirement
+from app.models.user import User
+from app.schemas.dynamic_field import DynamicFieldResponse
+from app.schemas.project import ProjectResponse
+from app.schemas.requirement import RequirementResponse
+from app.schemas.user import UserResponse
+
+MODES = {
+    "refresh": sessionmaker(autoflush=False, expire_on_commit=True, bind=engine),
+    "returning": sessionmaker(autoflush=False, expire_on_commit=False, bind=engine),
+}
+
+class _StatementCounter:
+    def __init__(self):
+        self.count = 0
+        event.listen(engine, "before_cursor_execute", self._count)
+
+    def _count(self, *args):
+        self.count += 1
+
+    def close(self):
+        event.remove(engine, "before_cursor_execute", self._count)
+
+def _write(db, obj, refresh: bool, schema):
+    db.commit()
+    if refresh:
+        db.refresh(obj)
+    schema.model_validate(obj)
+
+def _users(db, refresh, writes, tag, context):
+    for index in range(writes):
+        user = User(
+            username=f"bench_{tag}_{index}",
+            email=f"bench_{tag}_{index}@example.com",
+            password_hash="x" * 60
+        )
+        db.add(user)
+        _write(db, user, refresh, UserResponse)
+        user.first_name = "Benchmark"
+        _write(db, user, refresh, UserResponse)
+
+def _projects(db, refresh, writes, tag, context):
+    owner = db.get(User, context["user_id"])
+    for index in range(writes):
+        project = Project(name=f"Benchmark {tag} {index}", created_by=owner.id)
+        db.add(project)
+        if not refresh:
+            set_committed_value(project, "created_by_user", owner)
+            set_committed_value(project, "requirements", [])
+        _write(db, project, refresh, ProjectResponse)
+        project.description = "Atualizado"
+        _write(db, project, refresh, ProjectResponse)
+
+def _requirements(db, refresh, writes, tag, context):
+    owner = db.get(User, context["user_id"])
+    project = db.get(Project, context["project_id"])
+    for index in range(writes):
+        requirement = Requirement(
+            title=f"Benchmark {tag} {index}",
+            project_id=project.id,
+            created_by=owner.id
+        )
+        db.add(requirement)
+        if not refresh:
+            set_committed_value(requirement, "project", project)
+            set_committed_value(requirement, "assigned_user", None)
+            set_committed_value(requirement, "created_by_user", owner)
+        _write(db, requirement, refresh, RequirementResponse)
+        requirement.description = "Atualizado"
+        _write(db, requirement, refresh, RequirementResponse)
+
+def _dynamic_fields(db, refresh, writes, tag, context):
+    for index in range(writes):
+        definition = DynamicFieldDefinition(
+            field_name=f"bench_{tag}_{index}",
+            field_type="text",
+            field_label="Benchmark",
+            applies_to="project"
+        )
+        db.add(definition)
+        _write(db, definition, refresh, DynamicFieldResponse)
+        definition.field_label = "Atualizado"
+        _write(db, definition, refresh, DynamicFieldResponse)
+
+ENTITIES = [
+    ("usuario", _users),
+    ("projeto", _projects),
+    ("requisito", _requirements),
+    ("campo_dinamico", _dynamic_fields),
+]
+
+def _cleanup(db, tag: str) -> None:
+    db.query(Requirement).filter(Requirement.title.like(f"Benchmark {tag}%")).delete(synchronize_session=False)
+    db.query(Project).filter(Project.name.like(f"Benchmark {tag}%")).delete(synchronize_session=False)
+    db.query(User).filter(User.username.like(f"bench_{tag}%")).delete(synchronize_session=False)
+    db.query(DynamicFieldDefinition).filter(
+        DynamicFieldDefinition.field_name.like(f"bench_{tag}%")
+    ).delete(synchronize_session=False)
+    db.commit()
+
+def run(writes: int) -> None:
+    tag = uuid.uuid4().hex[:8]
+    db = MODES["returning"]()
+    owner = User(username=f"bench_{tag}_owner", email=f"bench_{tag}_owner@example.com", password_hash="x" * 60)
+    db.add(owner)
+    db.flush()
+    project = Project(name=f"Benchmark {tag} base", created_by=owner.id)
+    db.add(project)
+    db.commit()
+    context = {"user_id": owner.id, "project_id": project.id}
+
+    counter = _StatementCounter()
+    try:
+        print(f"{'entidade':<16} {'sessao':<10} {'escritas':>8} {'escritas/s':>11} {'sql/escrita':>12}")
+        for name, scenario in ENTITIES:
+            for mode, factory in MODES.items():
+                session = factory()
+                counter.count = 0
+                started = time.perf_counter()
+                try:
+                    scenario(session, mode == "refresh", writes, f"{tag}_{mode}", context)
+                finally:
+                    session.close()
+                elapsed = time.perf_counter() - started
+                total = writes * 2
+                print(
+                    f"{name:<16} {mode:<10} {total:>8} {total / elapsed:>11.0f} "
+                    f"{counter.count / total:>12.2f}"
+                )
+    finally:
+        counter.close()
+        _cleanup(db, tag)
+        db.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--writes", type=int, default=500)
+    args = parser.parse_args()
+    run(args.writes)
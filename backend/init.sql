@@ -4,6 +4,21 @@
 -- Criar extensoes necessarias
 CREATE EXTENSION IF NOT EXISTS "uuid-ossp";
 
+-- Criar tipos enum (valores definidos em app/models/enums.py)
+DO $$ BEGIN
+    CREATE TYPE requirement_type AS ENUM ('funcional', 'nao_funcional', 'regra_negocio');
+    CREATE TYPE requirement_status AS ENUM ('pendente', 'em_analise', 'aprovado', 'em_desenvolvimento', 'concluido', 'cancelado');
+    CREATE TYPE project_status AS ENUM ('em_andamento', 'concluido', 'cancelado', 'pausado');
+    CREATE TYPE priority_level AS ENUM ('baixa', 'media', 'alta', 'critica');
+    CREATE TYPE complexity_level AS ENUM ('baixa', 'media', 'alta');
+    CREATE TYPE backfill_operation AS ENUM ('renomear_campo', 'remover_opcoes', 'preencher_padrao');
+    CREATE TYPE backfill_status AS ENUM ('pendente', 'executando', 'pausado', 'concluido', 'falhou');
+    CREATE TYPE purge_status AS ENUM ('pendente', 'executando', 'concluido', 'falhou');
+    CREATE TYPE clone_status AS ENUM ('pendente', 'executando', 'concluido', 'falhou');
+EXCEPTION
+    WHEN duplicate_object THEN NULL;
+END $$;
+
 -- Criar tabela de usuarios
 CREATE TABLE IF NOT EXISTS users (
     id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
@@ -26,8 +41,8 @@ CREATE TABLE IF NOT EXISTS projects (
     id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
     name VARCHAR(255) NOT NULL,
     description TEXT,
-    status VARCHAR(50) NOT NULL DEFAULT 'em_andamento',
-    priority VARCHAR(50) NOT NULL DEFAULT 'media',
+    status project_status NOT NULL DEFAULT 'em_andamento',
+    priority priority_level NOT NULL DEFAULT 'media',
     start_date DATE,
     end_date DATE,
     budget VARCHAR(100),
@@ -35,7 +50,8 @@ CREATE TABLE IF NOT EXISTS projects (
     is_active BOOLEAN DEFAULT true,
     created_by UUID REFERENCES users(id),
     created_at TIMESTAMP DEFAULT NOW(),
-    updated_at TIMESTAMP DEFAULT NOW()
+    updated_at TIMESTAMP DEFAULT NOW(),
+    change_seq BIGINT NOT NULL DEFAULT 0
 );
 
 -- Criar tabela de definicoes de campos dinamicos
@@ -51,8 +67,10 @@ CREATE TABLE IF NOT EXISTS dynamic_field_definitions (
     applies_to VARCHAR(50) NOT NULL,
     order_index VARCHAR(10),
     validation_rules JSONB,
+    promoted_column VARCHAR(100),
     created_at TIMESTAMP DEFAULT NOW(),
     updated_at TIMESTAMP DEFAULT NOW(),
+    change_seq BIGINT NOT NULL DEFAULT 0,
     UNIQUE(field_name, applies_to)
 );
 
@@ -61,12 +79,12 @@ CREATE TABLE IF NOT EXISTS requirements (
     id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
     title VARCHAR(255) NOT NULL,
     description TEXT,
-    type VARCHAR(50) NOT NULL DEFAULT 'funcional',
-    priority VARCHAR(50) NOT NULL DEFAULT 'media',
-    status VARCHAR(50) NOT NULL DEFAULT 'pendente',
-    complexity VARCHAR(50),
-    estimated_hours VARCHAR(10),
-    actual_hours VARCHAR(10),
+    type requirement_type NOT NULL DEFAULT 'funcional',
+    priority priority_level NOT NULL DEFAULT 'media',
+    status requirement_status NOT NULL DEFAULT 'pendente',
+    complexity complexity_level,
+    estimated_hours NUMERIC(10, 2),
+    actual_hours NUMERIC(10, 2),
     due_date DATE,
     completion_date DATE,
     dynamic_fields JSONB DEFAULT '{}',
@@ -74,6 +92,59 @@ CREATE TABLE IF NOT EXISTS requirements (
     assigned_to UUID REFERENCES users(id),
     created_by UUID REFERENCES users(id),
     created_at TIMESTAMP DEFAULT NOW(),
+    updated_at TIMESTAMP DEFAULT NOW(),
+    change_seq BIGINT NOT NULL DEFAULT 0
+);
+
+-- Criar tabela de jobs de backfill de campos dinamicos
+CREATE TABLE IF NOT EXISTS dynamic_field_backfills (
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    field_id UUID REFERENCES dynamic_field_definitions(id) ON DELETE SET NULL,
+    operation backfill_operation NOT NULL,
+    params JSON NOT NULL,
+    status backfill_status NOT NULL DEFAULT 'pendente',
+    last_id UUID,
+    total_rows INTEGER,
+    processed_rows INTEGER NOT NULL DEFAULT 0,
+    updated_rows INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    created_by UUID REFERENCES users(id),
+    started_at TIMESTAMP,
+    finished_at TIMESTAMP,
+    created_at TIMESTAMP DEFAULT NOW(),
+    updated_at TIMESTAMP DEFAULT NOW()
+);
+
+-- Criar tabela de jobs de expurgo de projetos (sem FK: o registro sobrevive ao projeto)
+CREATE TABLE IF NOT EXISTS project_purges (
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    project_id UUID NOT NULL,
+    project_name VARCHAR(200) NOT NULL,
+    status purge_status NOT NULL DEFAULT 'pendente',
+    total_rows INTEGER,
+    deleted_rows INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    created_by UUID REFERENCES users(id),
+    started_at TIMESTAMP,
+    finished_at TIMESTAMP,
+    created_at TIMESTAMP DEFAULT NOW(),
+    updated_at TIMESTAMP DEFAULT NOW()
+);
+
+-- Criar tabela de jobs de clonagem de projetos
+CREATE TABLE IF NOT EXISTS project_clones (
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    source_project_id UUID REFERENCES projects(id) ON DELETE SET NULL,
+    project_id UUID NOT NULL REFERENCES projects(id) ON DELETE CASCADE,
+    options JSON NOT NULL,
+    status clone_status NOT NULL DEFAULT 'pendente',
+    total_rows INTEGER,
+    copied_rows INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    created_by UUID REFERENCES users(id),
+    started_at TIMESTAMP,
+    finished_at TIMESTAMP,
+    created_at TIMESTAMP DEFAULT NOW(),
     updated_at TIMESTAMP DEFAULT NOW()
 );
 
@@ -83,9 +154,118 @@ CREATE INDEX IF NOT EXISTS idx_users_email ON users(email);
 CREATE INDEX IF NOT EXISTS idx_projects_status ON projects(status);
 CREATE INDEX IF NOT EXISTS idx_projects_created_by ON projects(created_by);
 CREATE INDEX IF NOT EXISTS idx_requirements_project_id ON requirements(project_id);
+CREATE INDEX IF NOT EXISTS ix_project_purges_project_id ON project_purges(project_id);
+CREATE INDEX IF NOT EXISTS ix_project_clones_project_id ON project_clones(project_id);
 CREATE INDEX IF NOT EXISTS idx_requirements_status ON requirements(status);
 CREATE INDEX IF NOT EXISTS idx_requirements_assigned_to ON requirements(assigned_to);
+CREATE INDEX IF NOT EXISTS idx_requirements_open_due_date ON requirements(due_date) WHERE status NOT IN ('concluido', 'cancelado');
+CREATE INDEX IF NOT EXISTS idx_projects_sort_created_at ON projects(created_at, id);
+CREATE INDEX IF NOT EXISTS idx_projects_sort_updated_at ON projects(updated_at, id);
+CREATE INDEX IF NOT EXISTS idx_projects_sort_name ON projects(name, id);
+CREATE INDEX IF NOT EXISTS idx_projects_sort_status ON projects(status, id);
+CREATE INDEX IF NOT EXISTS idx_projects_sort_priority ON projects(priority, id);
+CREATE INDEX IF NOT EXISTS idx_projects_sort_start_date ON projects(start_date, id);
+CREATE INDEX IF NOT EXISTS idx_projects_sort_end_date ON projects(end_date, id);
+CREATE INDEX IF NOT EXISTS idx_requirements_sort_created_at ON requirements(created_at, id);
+CREATE INDEX IF NOT EXISTS idx_requirements_sort_updated_at ON requirements(updated_at, id);
+CREATE INDEX IF NOT EXISTS idx_requirements_sort_due_date ON requirements(due_date, id);
+CREATE INDEX IF NOT EXISTS idx_requirements_sort_priority ON requirements(priority, id);
+CREATE INDEX IF NOT EXISTS idx_requirements_sort_status ON requirements(status, id);
+CREATE INDEX IF NOT EXISTS idx_requirements_sort_title ON requirements(title, id);
+CREATE INDEX IF NOT EXISTS idx_requirements_project_sort_created_at ON requirements(project_id, created_at, id);
+CREATE INDEX IF NOT EXISTS idx_requirements_project_sort_updated_at ON requirements(project_id, updated_at, id);
+CREATE INDEX IF NOT EXISTS idx_requirements_project_sort_due_date ON requirements(project_id, due_date, id);
+CREATE INDEX IF NOT EXISTS idx_requirements_project_sort_priority ON requirements(project_id, priority, id);
+CREATE INDEX IF NOT EXISTS idx_requirements_project_sort_status ON requirements(project_id, status, id);
+CREATE INDEX IF NOT EXISTS idx_requirements_project_sort_title ON requirements(project_id, title, id);
+CREATE INDEX IF NOT EXISTS idx_requirements_dynamic_fields ON requirements USING GIN (dynamic_fields jsonb_path_ops);
 CREATE INDEX IF NOT EXISTS idx_dynamic_fields_applies_to ON dynamic_field_definitions(applies_to);
+CREATE INDEX IF NOT EXISTS idx_projects_change_seq ON projects(change_seq, id);
+CREATE INDEX IF NOT EXISTS idx_requirements_change_seq ON requirements(change_seq, id);
+CREATE INDEX IF NOT EXISTS idx_dynamic_field_definitions_change_seq ON dynamic_field_definitions(change_seq, id);
+
+-- Contadores de escrita por tabela (ETags das listagens e relatorios).
+-- Cada conexao incrementa a sua linha (pid % 8); a versao da tabela e a soma
+CREATE TABLE IF NOT EXISTS table_versions (
+    table_name VARCHAR(64) NOT NULL,
+    shard SMALLINT NOT NULL DEFAULT 0,
+    version BIGINT NOT NULL DEFAULT 0,
+    PRIMARY KEY (table_name, shard)
+);
+
+INSERT INTO table_versions (table_name, shard, version)
+SELECT t.table_name, s.shard, 0
+FROM (VALUES ('users'), ('projects'), ('requirements'), ('dynamic_field_definitions')) AS t(table_name)
+CROSS JOIN generate_series(0, 7) AS s(shard)
+ON CONFLICT DO NOTHING;
+
+CREATE OR REPLACE FUNCTION bump_table_version() RETURNS trigger AS $$
+BEGIN
+    UPDATE table_versions SET version = version + 1
+    WHERE table_name = TG_TABLE_NAME AND shard = mod(pg_backend_pid(), 8);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS users_table_version ON users;
+CREATE TRIGGER users_table_version AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON users
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version();
+DROP TRIGGER IF EXISTS projects_table_version ON projects;
+CREATE TRIGGER projects_table_version AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON projects
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version();
+DROP TRIGGER IF EXISTS requirements_table_version ON requirements;
+CREATE TRIGGER requirements_table_version AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON requirements
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version();
+DROP TRIGGER IF EXISTS dynamic_field_definitions_table_version ON dynamic_field_definitions;
+CREATE TRIGGER dynamic_field_definitions_table_version AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON dynamic_field_definitions
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version();
+
+-- Sincronizacao incremental (/sync): change_seq recebe o id da transacao que
+-- gravou a linha e as exclusoes viram tombstones em deleted_records
+CREATE TABLE IF NOT EXISTS deleted_records (
+    id BIGSERIAL PRIMARY KEY,
+    table_name VARCHAR(64) NOT NULL,
+    record_id UUID NOT NULL,
+    change_seq BIGINT NOT NULL,
+    deleted_at TIMESTAMP NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_deleted_records_table_seq ON deleted_records(table_name, change_seq, id);
+CREATE INDEX IF NOT EXISTS ix_deleted_records_deleted_at ON deleted_records(deleted_at);
+
+CREATE OR REPLACE FUNCTION set_change_seq() RETURNS trigger AS $$
+BEGIN
+    NEW.change_seq := pg_current_xact_id()::text::bigint;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION record_deletion() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO deleted_records (table_name, record_id, change_seq, deleted_at)
+    VALUES (TG_TABLE_NAME, OLD.id, pg_current_xact_id()::text::bigint, now());
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS projects_change_seq ON projects;
+CREATE TRIGGER projects_change_seq BEFORE INSERT OR UPDATE ON projects
+    FOR EACH ROW EXECUTE FUNCTION set_change_seq();
+DROP TRIGGER IF EXISTS projects_tombstone ON projects;
+CREATE TRIGGER projects_tombstone AFTER DELETE ON projects
+    FOR EACH ROW EXECUTE FUNCTION record_deletion();
+DROP TRIGGER IF EXISTS requirements_change_seq ON requirements;
+CREATE TRIGGER requirements_change_seq BEFORE INSERT OR UPDATE ON requirements
+    FOR EACH ROW EXECUTE FUNCTION set_change_seq();
+DROP TRIGGER IF EXISTS requirements_tombstone ON requirements;
+CREATE TRIGGER requirements_tombstone AFTER DELETE ON requirements
+    FOR EACH ROW EXECUTE FUNCTION record_deletion();
+DROP TRIGGER IF EXISTS dynamic_field_definitions_change_seq ON dynamic_field_definitions;
+CREATE TRIGGER dynamic_field_definitions_change_seq BEFORE INSERT OR UPDATE ON dynamic_field_definitions
+    FOR EACH ROW EXECUTE FUNCTION set_change_seq();
+DROP TRIGGER IF EXISTS dynamic_field_definitions_tombstone ON dynamic_field_definitions;
+CREATE TRIGGER dynamic_field_definitions_tombstone AFTER DELETE ON dynamic_field_definitions
+    FOR EACH ROW EXECUTE FUNCTION record_deletion();
 
 -- Criar usuario administrador padrao
 -- Senha: admin123 (hash bcrypt)
@@ -162,7 +342,7 @@ VALUES
         'alta',
         'em_desenvolvimento',
         'media',
-        '40',
+        40,
         NOW() + INTERVAL '30 days',
         '{"fonte_dados": "Sistema ERP", "kpis_envolvidos": ["Vendas", "Lucratividade"], "complexidade": "Media", "observacoes": "Integrar com sistema de vendas"}',
         (SELECT id FROM projects WHERE name = 'Projeto BI Vendas' LIMIT 1),
@@ -179,7 +359,7 @@ VALUES
         'media',
         'pendente',
         'baixa',
-        '20',
+        20,
         NOW() + INTERVAL '45 days',
         '{"fonte_dados": "Sistema CRM", "kpis_envolvidos": ["ROI", "Produtividade"], "complexidade": "Baixa", "observacoes": "Relatorios semanais"}',
         (SELECT id FROM projects WHERE name = 'Projeto BI Vendas' LIMIT 1),
@@ -196,7 +376,7 @@ VALUES
         'critica',
         'em_analise',
         'alta',
-        '60',
+        60,
         NOW() + INTERVAL '60 days',
         '{"fonte_dados": "Sistema de Seguranca", "kpis_envolvidos": ["Custo"], "complexidade": "Alta", "observacoes": "Conformidade LGPD"}',
         (SELECT id FROM projects WHERE name = 'Projeto BI Vendas' LIMIT 1),
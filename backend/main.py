@@ -1,5 +1,6 @@
-from fastapi import FastAPI, Depends, HTTPException, status
+from fastapi import FastAPI, Depends, HTTPException, Request, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from fastapi.security import HTTPBearer
 from contextlib import asynccontextmanager
@@ -10,9 +11,12 @@ from typing import List
 
 from app.core.config import settings
 from app.core.database import engine, Base
+from app.core.entity_cache import ENTITY_CACHE_HEADER
 from app.core.security import get_current_user
 from app.api.v1.api import api_router
 from app.core.logging import setup_logging
+from app.services.change_feed import start_change_feed
+from app.services.job_leases import requeue_stale_jobs
 
 # Configurar logging
 setup_logging()
@@ -22,9 +26,14 @@ setup_logging()
 async def lifespan(app: FastAPI):
     # Startup
     Base.metadata.create_all(bind=engine)
+    change_feed_listener = start_change_feed()
+    # Jobs em background que perderam o worker (reinicio no meio da execucao)
+    requeue_stale_jobs()
     logging.info("Aplicacao iniciada com sucesso")
     yield
     # Shutdown
+    if change_feed_listener:
+        change_feed_listener.stop()
     logging.info("Aplicacao finalizada")
 
 # Criar instancia do FastAPI
@@ -34,6 +43,8 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    # Respostas serializadas com orjson (datetime, UUID e enums nativos)
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
@@ -44,8 +55,19 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Missing-Ids", "ETag", ENTITY_CACHE_HEADER],
 )
 
+# Cabecalho de depuracao com os acertos do cache de entidades da requisicao
+if settings.DEBUG_HEADERS:
+    @app.middleware("http")
+    async def entity_cache_header(request: Request, call_next):
+        response = await call_next(request)
+        cache = getattr(request.state, "entity_cache", None)
+        if cache is not None:
+            response.headers[ENTITY_CACHE_HEADER] = f"hits={cache.hits}; misses={cache.misses}"
+        return response
+
 # Configurar middleware de hosts confiaveis
 app.add_middleware(
     TrustedHostMiddleware,
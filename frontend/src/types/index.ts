@@ -91,8 +91,8 @@ export interface Requirement {
   priority: string;
   status: string;
   complexity?: string;
-  estimated_hours?: string;
-  actual_hours?: string;
+  estimated_hours?: number;
+  actual_hours?: number;
   due_date?: string;
   completion_date?: string;
   dynamic_fields: Record<string, any>;
@@ -116,8 +116,8 @@ export interface RequirementCreate {
   priority: string;
   status: string;
   complexity?: string;
-  estimated_hours?: string;
-  actual_hours?: string;
+  estimated_hours?: number;
+  actual_hours?: number;
   due_date?: string;
   completion_date?: string;
   dynamic_fields: Record<string, any>;
@@ -132,8 +132,8 @@ export interface RequirementUpdate {
   priority?: string;
   status?: string;
   complexity?: string;
-  estimated_hours?: string;
-  actual_hours?: string;
+  estimated_hours?: number;
+  actual_hours?: number;
   due_date?: string;
   completion_date?: string;
   assigned_to?: string;